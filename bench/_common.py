@@ -0,0 +1,14 @@
+#bench/_common.py
+# 벤치마크 스크립트 공용 도우미
+import subprocess
+
+def git_rev(repo):
+    """측정한 트리의 커밋. 커밋 안 된 변경이 있으면 -dirty를 붙인다(결과가 어느 코드의 것인지 분명히)"""
+    try:
+        rev = subprocess.run(["git", "-C", repo, "rev-parse", "--short", "HEAD"],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "-C", repo, "status", "--porcelain", "--untracked-files=no"],
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return rev + "-dirty" if dirty else rev
+    except Exception:
+        return None
@@ -0,0 +1,79 @@
+#bench/startup_bench.py
+# 워커 시작 비용 측정(캐시 전용 모드): import 시간, 첫 응답까지 시간, RSS
+#
+#   python bench/startup_bench.py                       # 현재 트리
+#   python bench/startup_bench.py --repo /path/to/checkout --out bench/results/startup_before.json
+#
+# 매 회 새 파이썬 프로세스에서 hour_back을 import → 테스트 클라이언트로 /hour 1회 요청.
+# CACHE_DIR은 미리 한 번 데워 둔(씨드 복사 끝난) 임시 디렉터리를 공유한다.
+import os, sys, json, time, argparse, subprocess, statistics, tempfile, platform
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+from _common import git_rev
+
+CHILD = r'''
+import os, sys, time, json, resource
+t0 = time.perf_counter()
+sys.path.insert(0, os.environ["BENCH_REPO"])
+import hour_back
+t1 = time.perf_counter()
+r = hour_back.app.test_client().get("/hour?myteam=LG")
+t2 = time.perf_counter()
+rss_kb = 0
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith("VmRSS:"):
+            rss_kb = int(line.split()[1])
+print(json.dumps({
+    "import_s": t1 - t0,
+    "first_response_s": t2 - t0,
+    "status": r.status_code,
+    "rss_mb": rss_kb / 1024,
+    "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": sorted(m for m in ("pandas", "numpy", "selenium", "bs4", "requests") if m in sys.modules),
+}))
+'''
+
+def run(repo, runs):
+    cache_dir = tempfile.mkdtemp(prefix="hour-bench-")
+    env = dict(os.environ, BENCH_REPO=repo, CACHE_DIR=cache_dir, USE_CACHE_ONLY="1", PYTHONDONTWRITEBYTECODE="0")
+    subprocess.run([sys.executable, "-c", CHILD], env=env, check=True, capture_output=True)   # 캐시 데우기 + .pyc
+
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", CHILD], env=env, check=True, capture_output=True, text=True)
+        sample = json.loads(out.stdout.strip().splitlines()[-1])
+        sample["process_s"] = time.perf_counter() - t0    # 인터프리터 기동 포함
+        samples.append(sample)
+
+    keys = ["import_s", "first_response_s", "process_s", "rss_mb", "maxrss_mb"]
+    return {
+        "bench": "startup",
+        "repo_rev": git_rev(repo),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "median": {k: round(statistics.median(s[k] for s in samples), 4) for k in keys},
+        "min": {k: round(min(s[k] for s in samples), 4) for k in keys},
+        "heavy_modules": samples[-1]["heavy_modules"],
+        "samples": samples,
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="hour_back 워커 시작 비용 벤치마크")
+    ap.add_argument("--repo", default=REPO_DIR)
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--out", help="결과 JSON 경로(생략 시 표준 출력)")
+    args = ap.parse_args(argv)
+    res = run(os.path.abspath(args.repo), args.runs)
+    text = json.dumps(res, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    print(json.dumps({"median": res["median"], "heavy_modules": res["heavy_modules"]}, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
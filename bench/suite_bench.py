@@ -0,0 +1,197 @@
+#bench/suite_bench.py
+# 규모별 회귀 벤치마크(캐시 전용 모드, 합성 데이터)
+#
+#   python bench/suite_bench.py                                  # 1, 5, 20 시즌
+#   python bench/suite_bench.py --seasons 1,20 --threads 16 --out bench/results/suite.json
+#
+# 규모(시즌 수)마다 bench/synth.py로 씨드를 만들고, 새 파이썬 프로세스에서 측정한다.
+#   cold_start     : 빈 CACHE_DIR에서 import(씨드 로드 + 스냅샷 저장) → 첫 /hour
+#   warm_start     : 스냅샷이 있는 CACHE_DIR에서 import → 첫 /hour
+#   collect        : 팀별 collect_history_avg_runtime 지연(전 시즌 구간, 상대 전체)
+#   hour           : 테스트 클라이언트 /hour 처리량(스레드 동시), 응답 캐시 사용/미사용
+#   runtime_write  : set_runtime_cache 1회 비용(저널 append + 주기적 압축 포함)
+#   export         : /cache/export 스트리밍 소비 중 tracemalloc 최대 메모리
+# 결과는 JSON(--out) — 같은 옵션으로 돌린 두 결과 파일을 그대로 비교할 수 있다.
+import os, sys, json, time, argparse, subprocess, statistics, tempfile, platform, shutil
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+import synth
+from _common import git_rev
+
+CHILD = r'''
+import os, sys, time, json, threading, statistics, tracemalloc
+t0 = time.perf_counter()
+sys.path.insert(0, os.environ["BENCH_REPO"])
+import hour_back as hb
+t1 = time.perf_counter()
+ref = os.environ["BENCH_ASOF"]
+c = hb.app.test_client()
+first = c.get(f"/hour?myteam=LG&asof={ref}")
+t2 = time.perf_counter()
+out = {"import_s": t1 - t0, "first_response_s": t2 - t0, "status": first.status_code,
+       "runtimes": len(hb.RUNTIME_MEM), "dates": len(hb.SCHEDULE_MEM)}
+
+def pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(p / 100 * (len(xs) - 1))))]
+
+def summary_ms(xs):
+    return {"mean_ms": statistics.fmean(xs) * 1000, "p50_ms": pct(xs, 50) * 1000,
+            "p95_ms": pct(xs, 95) * 1000, "max_ms": max(xs) * 1000, "n": len(xs)}
+
+if os.environ["BENCH_PHASE"] == "full":
+    teams = hb.TEAMS[:10]
+    reps = int(os.environ["BENCH_COLLECT_REPS"])
+
+    # --- collect_history_avg_runtime ---
+    collect = {}
+    for team in teams:
+        xs, games = [], 0
+        for _ in range(reps):
+            s = time.perf_counter()
+            _, rts = hb.collect_history_avg_runtime(team, None, asof=ref)
+            xs.append(time.perf_counter() - s)
+            games = len(rts)
+        collect[team] = dict(summary_ms(xs), games=games)
+    out["collect"] = collect
+
+    # --- /hour 처리량 ---
+    asofs = sorted(hb.SCHEDULE_MEM)[-60::3]
+    reqs = [(t, d) for d in asofs for t in teams]
+    threads, total = int(os.environ["BENCH_THREADS"]), int(os.environ["BENCH_REQUESTS"])
+    def hour_run(label):
+        lat, errors = [], []
+        barrier = threading.Barrier(threads + 1)
+        def worker(k):
+            cl = hb.app.test_client()
+            mine = []
+            barrier.wait()
+            for i in range(k, total, threads):
+                team, d = reqs[i % len(reqs)]
+                s = time.perf_counter()
+                r = cl.get(f"/hour?myteam={team}&asof={d}")
+                mine.append(time.perf_counter() - s)
+                if r.status_code != 200:
+                    errors.append(r.status_code)
+            lat.extend(mine)
+        ths = [threading.Thread(target=worker, args=(k,)) for k in range(threads)]
+        for th in ths: th.start()
+        barrier.wait()
+        s = time.perf_counter()
+        for th in ths: th.join()
+        wall = time.perf_counter() - s
+        return dict(summary_ms(lat), label=label, threads=threads, requests=total,
+                    wall_s=wall, rps=total / wall, errors=len(errors))
+    hour = [hour_run("response_cache")]
+    hb.RESPONSE_CACHE_SIZE = 0
+    hb._RESP_CACHE.clear()
+    hour.append(hour_run("uncached"))
+    out["hour"] = hour
+
+    # --- set_runtime_cache ---
+    writes = int(os.environ["BENCH_WRITES"])
+    xs = []
+    for i in range(writes):
+        s = time.perf_counter()
+        hb.set_runtime_cache(f"BENCH{i:06d}0_{ref}", 180 + i % 40)
+        xs.append(time.perf_counter() - s)
+    out["runtime_write"] = dict(summary_ms(xs), compact_every=hb.JOURNAL_COMPACT_EVERY,
+                                fsync=hb.JOURNAL.fsync, snapshot_format=hb.SNAPSHOT_FORMAT)
+
+    # --- /cache/export 최대 메모리 ---
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    s = time.perf_counter()
+    r = c.get("/cache/export", buffered=False)
+    size = sum(len(chunk) for chunk in r.response)
+    r.close()
+    wall = time.perf_counter() - s
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    out["export"] = {"bytes": size, "seconds": wall, "peak_mb": (peak - base) / 2**20}
+
+print(json.dumps(out))
+'''
+
+def _child(env, phase):
+    t0 = time.perf_counter()
+    p = subprocess.run([sys.executable, "-c", CHILD], env=dict(env, BENCH_PHASE=phase),
+                       capture_output=True, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"bench child failed ({phase}):\n{p.stderr}")
+    res = json.loads(p.stdout.strip().splitlines()[-1])
+    res["process_s"] = time.perf_counter() - t0
+    return res
+
+def run_scale(repo, seasons, args):
+    work = tempfile.mkdtemp(prefix=f"hour-suite-{seasons}-")
+    try:
+        seed_dir = os.path.join(work, "seed")
+        first, last, games = synth.write_seed(seed_dir, seasons, args.games_per_season)
+        asof = (synth.date(int(last[:4]), int(last[4:6]), int(last[6:])) + synth.timedelta(days=1)).strftime("%Y%m%d")
+        env = dict(os.environ, BENCH_REPO=repo, DATA_DIR=seed_dir, USE_CACHE_ONLY="1", FORCE_ASOF="",
+                   START_DATE=first, BENCH_ASOF=asof, METRICS_DIR=os.path.join(work, "metrics"),
+                   BENCH_THREADS=str(args.threads), BENCH_REQUESTS=str(args.requests),
+                   BENCH_WRITES=str(args.writes), BENCH_COLLECT_REPS=str(args.collect_reps))
+
+        cache = os.path.join(work, "cache_cold")
+        cold = _child(dict(env, CACHE_DIR=cache), "cold")
+        warm = _child(dict(env, CACHE_DIR=cache), "cold")
+        full = _child(dict(env, CACHE_DIR=os.path.join(work, "cache_full")), "full")
+
+        collect = full.pop("collect")
+        return {
+            "seasons": seasons, "games": games, "first_date": first, "asof": asof,
+            "cold_start": {k: cold[k] for k in ("import_s", "first_response_s", "process_s")},
+            "warm_start": {k: warm[k] for k in ("import_s", "first_response_s", "process_s")},
+            "collect": {
+                "per_team": collect,
+                "p50_ms_median": statistics.median(v["p50_ms"] for v in collect.values()),
+                "p95_ms_max": max(v["p95_ms"] for v in collect.values()),
+            },
+            "hour": full["hour"],
+            "runtime_write": full["runtime_write"],
+            "export": full["export"],
+        }
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="hour_back 규모별 회귀 벤치마크")
+    ap.add_argument("--repo", default=REPO_DIR)
+    ap.add_argument("--seasons", default="1,5,20", help="쉼표로 구분한 시즌 수 목록")
+    ap.add_argument("--games-per-season", type=int, default=720)
+    ap.add_argument("--threads", type=int, default=8)
+    ap.add_argument("--requests", type=int, default=800)
+    ap.add_argument("--writes", type=int, default=300)
+    ap.add_argument("--collect-reps", type=int, default=20)
+    ap.add_argument("--out", help="결과 JSON 경로(생략 시 표준 출력)")
+    args = ap.parse_args(argv)
+
+    repo = os.path.abspath(args.repo)
+    res = {
+        "bench": "suite",
+        "repo_rev": git_rev(repo),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {k: getattr(args, k) for k in ("games_per_season", "threads", "requests", "writes", "collect_reps")},
+        "scales": [run_scale(repo, int(s), args) for s in args.seasons.split(",") if s.strip()],
+    }
+    text = json.dumps(res, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    for sc in res["scales"]:
+        print(json.dumps({
+            "seasons": sc["seasons"], "cold_s": round(sc["cold_start"]["first_response_s"], 3),
+            "warm_s": round(sc["warm_start"]["first_response_s"], 3),
+            "collect_p50_ms": round(sc["collect"]["p50_ms_median"], 3),
+            "hour_rps": [round(h["rps"]) for h in sc["hour"]],
+            "write_p50_ms": round(sc["runtime_write"]["p50_ms"], 3),
+            "export_peak_mb": round(sc["export"]["peak_mb"], 2),
+        }, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
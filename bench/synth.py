@@ -0,0 +1,60 @@
+#bench/synth.py
+# 벤치마크용 가짜 KBO 데이터: schedule_index.json / runtime_cache.json과 같은 모양
+#
+#   python bench/synth.py --seasons 5 --out-dir /tmp/hour-seed-5
+#
+# 시즌마다 10개 팀이 하루 5경기씩(월요일 휴식) games_per_season 경기를 치른다.
+# g_id는 실제와 같은 YYYYMMDD + 원정 코드 + 홈 코드 + 순번, 런타임은 평균 183분 근처.
+# 같은 (seasons, games_per_season, seed)면 항상 같은 데이터.
+import os, json, random, argparse
+from datetime import date, timedelta
+
+TEAM_CODES = [('SK', 'SSG'), ('HT', 'KIA'), ('HH', '한화'), ('LT', '롯데'), ('OB', '두산'),
+              ('LG', 'LG'), ('SS', '삼성'), ('KT', 'KT'), ('NC', 'NC'), ('WO', '키움')]
+GAMES_PER_DAY = len(TEAM_CODES) // 2
+
+def generate(seasons=1, games_per_season=720, last_year=2025, seed=7):
+    """(schedule, runtime) dict — 마지막 시즌이 last_year"""
+    rng = random.Random(seed)
+    schedule, runtime = {}, {}
+    for year in range(last_year - seasons + 1, last_year + 1):
+        day, left = date(year, 3, 22), games_per_season
+        while left > 0:
+            if day.weekday() != 0:          # 월요일 휴식
+                d = day.strftime("%Y%m%d")
+                teams = TEAM_CODES[:]
+                rng.shuffle(teams)
+                games = []
+                for i in range(min(GAMES_PER_DAY, left)):
+                    (ac, an), (hc, hn) = teams[2 * i], teams[2 * i + 1]
+                    g_id = f"{d}{ac}{hc}0"
+                    games.append({"home": hn, "away": an, "g_id": g_id, "g_dt": d})
+                    runtime[f"{g_id}_{d}"] = {"runtime_min": max(120, min(300, int(rng.gauss(183, 18))))}
+                schedule[d] = games
+                left -= len(games)
+            day += timedelta(days=1)
+    return schedule, runtime
+
+def write_seed(out_dir, seasons=1, games_per_season=720, last_year=2025, seed=7):
+    """out_dir에 씨드 JSON 두 개를 쓰고 (첫 날짜, 마지막 날짜, 경기 수)를 돌려준다"""
+    schedule, runtime = generate(seasons, games_per_season, last_year, seed)
+    os.makedirs(out_dir, exist_ok=True)
+    for name, obj in (("schedule_index.json", schedule), ("runtime_cache.json", runtime)):
+        with open(os.path.join(out_dir, name), "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+    dates = sorted(schedule)
+    return dates[0], dates[-1], len(runtime)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="벤치마크용 합성 스케줄/런타임 씨드 생성")
+    ap.add_argument("--seasons", type=int, default=1)
+    ap.add_argument("--games-per-season", type=int, default=720)
+    ap.add_argument("--last-year", type=int, default=2025)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out-dir", required=True)
+    args = ap.parse_args(argv)
+    first, last, n = write_seed(args.out_dir, args.seasons, args.games_per_season, args.last_year, args.seed)
+    print(json.dumps({"out_dir": args.out_dir, "first_date": first, "last_date": last, "games": n}))
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,34 @@
 #hour_back.py
-from flask import Flask, request, render_template, jsonify, make_response
-import os, json, time, re, io, zipfile
+from flask import Flask, Response, g, request, render_template, jsonify, make_response
+import os, json, time, re, io, zipfile, threading, hashlib, itertools, copy
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from bisect import bisect_left, bisect_right, insort
 from datetime import datetime, timedelta
-import pandas as pd
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
+# 크롤러(requests/bs4/selenium)는 실제로 크롤링할 때 처음 import → 캐시 전용 워커는 가볍게 뜸
+import hour_columnar
+from hour_jobs import RefreshQueue, Scheduler
+from hour_metrics import METRICS
+from hour_partition import MISC, PartitionStore
+from hour_publish import PageStore
+from hour_stats import StatsEngine
+from hour_store import Journal, SingleFlight, StoreLock, atomic_json_save
 
 app = Flask(__name__)
 
 # ====== 기준값 / 설정 ======
+# 고정 기준값: 데이터가 LIVE_THRESHOLDS_MIN_GAMES 경기보다 적거나 LIVE_THRESHOLDS=0일 때 사용
 top30   = 168
 avg_ref = 182.7
 bottom70= 194
 
+# 실제 데이터(리그 전체 경기시간)의 30/70 분위수와 평균을 기준값으로 사용
+LIVE_THRESHOLDS           = os.environ.get("LIVE_THRESHOLDS", "1") == "1"
+LIVE_THRESHOLDS_MIN_GAMES = int(os.environ.get("LIVE_THRESHOLDS_MIN_GAMES", "100"))
+STATS_HALFLIFE_DAYS       = float(os.environ.get("STATS_HALFLIFE_DAYS", "30"))   # 최근 가중 평균 반감기(일)
+
 # 평균 집계 시작일(문자열: YYYY-MM-DD 또는 YYYYMMDD)
 START_DATE = os.environ.get("START_DATE", "2025-03-22")
 
@@ -31,9 +42,34 @@ HISTORY_DAYS  = int(os.environ.get("HISTORY_DAYS", "45"))
 # 한 요청에서 리뷰 탭을 최대 몇 경기까지 열지(안전장치)
 MAX_REVIEW_PER_REQUEST = int(os.environ.get("MAX_REVIEW_PER_REQUEST", "60"))
 
+# 캐시 항목 상태별 만료(초): final(지난 경기, 만료 없음) / provisional(오늘·앞으로) / negative(수집 실패·경기 없음)
+PROVISIONAL_TTL_SEC   = int(os.environ.get("PROVISIONAL_TTL_SEC", "600"))       # 오늘 스케줄/런타임
+SCHEDULE_AHEAD_TTL_SEC = int(os.environ.get("SCHEDULE_AHEAD_TTL_SEC", "21600"))  # 내일 이후 스케줄
+NEGATIVE_TTL_SEC      = int(os.environ.get("NEGATIVE_TTL_SEC", "900"))          # 첫 실패 후 재시도까지(실패마다 2배)
+NEGATIVE_TTL_MAX_SEC  = int(os.environ.get("NEGATIVE_TTL_MAX_SEC", str(3 * 86400)))
+# 오늘보다 이만큼 지난 날짜가 "경기 없음"으로 확인되면 final(휴식일, 다시 확인하지 않음)
+EMPTY_FINAL_AFTER_DAYS = int(os.environ.get("EMPTY_FINAL_AFTER_DAYS", "2"))
+
+# /api/hour 한 번에 조회할 수 있는 as-of 최대 일수
+API_MAX_DAYS = int(os.environ.get("API_MAX_DAYS", "400"))
+
+# /hour 응답 캐시 크기(렌더링된 페이지 개수, 0이면 끔)
+RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", "256"))
+
+# 팀별 /hour 페이지 미리 렌더링: 데이터 세대나 as-of가 바뀌면 10개 팀 페이지를 gzip/brotli 압축본과 함께
+# CACHE_DIR/published에 써 두고, 정식 파라미터 요청은 그 바이트로 바로 응답
+PUBLISH_PAGES        = os.environ.get("PUBLISH_PAGES", "0") == "1"
+PUBLISH_DEBOUNCE_SEC = float(os.environ.get("PUBLISH_DEBOUNCE_SEC", "2"))   # 연속 쓰기를 한 번의 게시로
+
 # ✅ 캐시만 사용 스위치(기본 ON: 절대 크롤링하지 않음)
 USE_CACHE_ONLY = os.environ.get("USE_CACHE_ONLY", "1") == "1"
 
+# 백그라운드 갱신(USE_CACHE_ONLY=0일 때만): 요청은 캐시로 즉시 응답하고, 부족분은 큐에 넣는다
+REFRESH_WORKERS     = int(os.environ.get("REFRESH_WORKERS", "1"))
+NIGHTLY_BACKFILL_AT = os.environ.get("NIGHTLY_BACKFILL_AT", "04:00")   # 전날 경기 런타임 채우기(HH:MM)
+PREFETCH_DAYS       = int(os.environ.get("PREFETCH_DAYS", "3"))         # 오늘 포함 앞으로 며칠 스케줄 미리 받기
+PREFETCH_EVERY_SEC  = int(os.environ.get("PREFETCH_EVERY_SEC", "3600"))
+
 # ====== 팀 별칭 → 정규화 매핑 ======
 def _norm_key(s: str) -> str:
     return re.sub(r'[\s\-_\/]+', '', (s or '').strip().lower())
@@ -56,6 +92,58 @@ def canon_team(s: str) -> str | None:
     if not s: return None
     return ALIAS_TO_CANON.get(_norm_key(s), s.strip())
 
+# ====== 팀 ID (캐시 안에서는 정수로만 비교) ======
+# 스케줄은 캐시에 들어올 때(크롤러/씨드/import) 한 번만 정규화하고, 요청 경로에서는
+# 정수 ID만 비교한다. 별칭 해석(canon_team)은 사용자 입력을 읽을 때만.
+TEAMS = list(_ALIAS)                              # ID → 정식 팀 이름 (모르는 이름은 뒤에 추가)
+TEAM_ID = {name: i for i, name in enumerate(TEAMS)}
+# g_id(YYYYMMDD + 원정 2자 + 홈 2자 + 순번)에 들어 있는 KBO 팀 코드
+GID_TEAM_CODES = {
+    'SK': 'SSG', 'HT': 'KIA', 'HH': '한화', 'LT': '롯데', 'OB': '두산',
+    'LG': 'LG', 'SS': '삼성', 'KT': 'KT', 'NC': 'NC', 'WO': '키움',
+}
+_TEAM_LOCK = threading.Lock()
+
+def team_id(canon: str | None) -> int | None:
+    """정식 이름 → ID (처음 보는 이름은 새 ID 발급; 올스타 '나눔'/'드림' 등)"""
+    if not canon:
+        return None
+    tid = TEAM_ID.get(canon)
+    if tid is None:
+        with _TEAM_LOCK:
+            tid = TEAM_ID.get(canon)
+            if tid is None:
+                tid = TEAM_ID[canon] = len(TEAMS)
+                TEAMS.append(canon)
+    return tid
+
+def parse_team(s) -> int | None:
+    """사용자 입력(별칭 포함) 또는 이미 ID인 값 → ID. 캐시에 없는 팀이면 None"""
+    if isinstance(s, int) or s is None:
+        return s
+    return TEAM_ID.get(canon_team(s))
+
+def team_name(tid: int | None) -> str | None:
+    return TEAMS[tid] if tid is not None else None
+
+def _game_teams(g):
+    """경기 → (홈 ID, 원정 ID). g_id의 팀 코드를 우선 쓰고, 모르는 코드면 팀 이름으로"""
+    gid = g.get("g_id") or ""
+    away, home = GID_TEAM_CODES.get(gid[8:10]), GID_TEAM_CODES.get(gid[10:12])
+    if home is None or away is None:
+        home, away = canon_team(g.get("home")), canon_team(g.get("away"))
+    return team_id(home), team_id(away)
+
+def normalize_games(games):
+    """캐시에 넣기 전 경기 목록의 home/away를 정식 이름으로(이미 정식이면 그대로)"""
+    out = []
+    for g in games:
+        h, a = _game_teams(g)
+        if (h is not None and g.get("home") != TEAMS[h]) or (a is not None and g.get("away") != TEAMS[a]):
+            g = dict(g, home=team_name(h) or g.get("home"), away=team_name(a) or g.get("away"))
+        out.append(g)
+    return out
+
 # ====== 경로 ======
 BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR   = os.environ.get("DATA_DIR", os.path.join(BASE_DIR, "data", "seed"))
@@ -63,9 +151,34 @@ CACHE_DIR  = os.environ.get("CACHE_DIR", os.path.join(BASE_DIR, "data", "runtime
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(CACHE_DIR, exist_ok=True)
 
-# 런타임 캐시 파일(실제 읽고/쓰기)
+# 예전 통짜 스냅샷(있으면 첫 부팅 때 파티션으로 옮기고 지움)
 RUNTIME_CACHE_FILE   = os.path.join(CACHE_DIR, "runtime_cache.json")
 SCHEDULE_CACHE_FILE  = os.path.join(CACHE_DIR, "schedule_index.json")
+COLUMNAR_CACHE_FILE  = os.path.join(CACHE_DIR, "cache_snapshot.hrc")
+# 파티션 스냅샷 + 증분 저널
+PARTITION_DIR        = os.path.join(CACHE_DIR, "partitions")          # <시즌 또는 월>.hrc|.json
+PUBLISH_DIR          = os.path.join(CACHE_DIR, "published")           # 미리 렌더링한 팀 페이지
+JOURNAL_FILE         = os.path.join(CACHE_DIR, "cache_journal.jsonl")
+CACHE_META_FILE      = os.path.join(CACHE_DIR, "cache_meta.json")     # 스냅샷 시점의 세대 번호
+CACHE_LOCK_FILE      = os.path.join(CACHE_DIR, "cache.lock")          # 워커 간 쓰기 잠금
+
+# 스냅샷 포맷: columnar(.hrc, mmap 로드) | json(runtime_cache.json + schedule_index.json)
+SNAPSHOT_FORMAT = os.environ.get("SNAPSHOT_FORMAT", "columnar")
+
+# 파티션 단위: season(연도) | month. 필요한 파티션만 메모리에 올리고, 로드된 수가
+# PARTITION_MAX_LOADED를 넘으면 오래 안 쓴 것부터 내린다(START_DATE~오늘 구간과 압축 전 파티션은 항상 유지)
+PARTITION_BY         = os.environ.get("PARTITION_BY", "season")
+PARTITION_MAX_LOADED = int(os.environ.get("PARTITION_MAX_LOADED", "8"))
+PARTS = PartitionStore(PARTITION_DIR, PARTITION_BY, SNAPSHOT_FORMAT)
+
+# 저널 레코드가 이만큼 쌓이면 스냅샷으로 압축
+JOURNAL_COMPACT_EVERY = int(os.environ.get("JOURNAL_COMPACT_EVERY", "500"))
+JOURNAL = Journal(JOURNAL_FILE, fsync=os.environ.get("JOURNAL_FSYNC", "1") == "1")
+STORE_LOCK = StoreLock(CACHE_LOCK_FILE)
+# 압축/초기화끼리만 직렬화(파티션 파일을 쓰는 동안 쓰기/읽기는 STORE_LOCK으로 계속 진행)
+COMPACT_LOCK = StoreLock(os.path.join(CACHE_DIR, "compact.lock"))
+# 같은 날짜/경기의 동시 크롤링을 1회로 합침(스레드 + 워커 간, CACHE_DIR/locks)
+SINGLE_FLIGHT = SingleFlight(os.path.join(CACHE_DIR, "locks"))
 
 # 씨드 후보(둘 다 지원; 스크린샷처럼 .json만 있어도 OK)
 SEED_RUNTIME_CANDIDATES  = [
@@ -76,6 +189,10 @@ SEED_SCHEDULE_CANDIDATES = [
     os.path.join(DATA_DIR, "schedule_index.json"),
     os.path.join(DATA_DIR, "schedule_index.seed.json"),
 ]
+# 컬럼형 씨드가 있으면 JSON 씨드보다 먼저 사용(python hour_columnar.py pack ... -o data/seed/cache_seed.hrc)
+SEED_COLUMNAR_CANDIDATES = [
+    os.path.join(DATA_DIR, "cache_seed.hrc"),
+]
 
 # ====== JSON 유틸 ======
 def _safe_json_load(path, default):
@@ -87,11 +204,17 @@ def _safe_json_load(path, default):
             return default
     return default
 
-def _safe_json_save(path, obj):
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
-    os.replace(tmp, path)
+def _safe_json_save(path, obj, indent=2):
+    atomic_json_save(path, obj, indent=indent)
+
+def _safe_columnar_load(path):
+    """.hrc → (런타임 dict, 스케줄 dict). 없거나 깨졌으면 (None, None)"""
+    if path and os.path.exists(path):
+        try:
+            return hour_columnar.load(path)
+        except Exception:
+            return None, None
+    return None, None
 
 def _first_existing(paths):
     for p in paths:
@@ -122,278 +245,1026 @@ def _asof_or_today(asof: str | None = None) -> str:
         return x
     return datetime.today().strftime("%Y%m%d")
 
-# ====== 메모리 캐시(부팅 시 1회 로드) ======
-RUNTIME_MEM = None
-SCHEDULE_MEM = None
+def make_runtime_key(game_id: str, game_date: str) -> str:
+    return f"{game_id}_{game_date}"
 
-def _warm_cache_from_seed_if_empty():
-    """런타임 파일이 있으면 우선 사용, 없으면 seed에서 로드 → 파일로 써두고 메모리에 유지"""
-    global RUNTIME_MEM, SCHEDULE_MEM
+# ====== 메모리 캐시: 불변 스냅샷 + copy-on-write 쓰기 ======
+# 요청 스레드는 SNAP을 한 번 읽어(잠금 없음) 그 스냅샷만 본다 — 교체된 뒤에도 옛 스냅샷은 바뀌지 않는다.
+# 쓰기(저널 반영, 파티션 로드/내림)는 _MEM_LOCK 하에서 _CowTxn으로 바뀌는 컨테이너만 복사해
+# 새 스냅샷을 만들고 SNAP 참조를 한 번에 교체한다. 압축(파일 저장)은 PERSIST 큐에서 교체된 스냅샷으로.
+DATA_GENERATION = 0            # 캐시 내용의 세대 번호(모든 워커 공통, 값이 바뀌는 쓰기마다 +1) — SNAP 교체 뒤에 올림
+DATA_UPDATED_AT = 0            # 마지막 쓰기 시각(epoch) — 화면의 '데이터 기준' 표시용
+CLEAR_GEN = 0                  # 마지막 /cache/clear 세대(이보다 오래된 since는 전체 export로)
+_MEM_LOCK = threading.RLock()  # 같은 워커 안의 쓰기 스레드끼리만 직렬화(읽기는 잠그지 않음)
+# 파티션 상태(쓰기 쪽 장부, _MEM_LOCK 하에서만 변경). 스냅샷에는 로드된 파티션의 항목만 있음
+_PART_KEYS = {}       # 로드된 파티션 → (런타임키 set, 날짜 set)
+_PART_USED = {}       # 파티션 → 마지막 사용 순번(LRU)
+_PART_DIRTY = set()   # 마지막 압축 이후 저널로 바뀐 파티션(압축 전까지 내리지 않음)
+_PART_ON_DISK = {}    # 디스크의 파티션 → 파일 크기
+_PART_TICK = itertools.count(1)
+# 통계는 항상 로드돼 있는 START_DATE 이후만 → 콜드 파티션을 올리고 내려도 기준값이 흔들리지 않음
+_STATS_FROM = START_DATE.replace("-", "")
+
+# ====== 매치업 인덱스: (팀, 상대) → 날짜순 런타임 + 누적합 ======
+# 부팅 시 1회 구축, set_schedule_cache_for_date / set_runtime_cache 에서 증분 갱신
+# → 임의 as-of 평균 = bisect 2회 + 누적합 차(O(1))
+class _MatchupSeries:
+    __slots__ = ("dates", "runtimes", "prefix")
+
+    def __init__(self):
+        self.dates = []       # 스케줄 날짜(YYYYMMDD), 정렬 유지
+        self.runtimes = []    # dates와 같은 순서의 런타임(분)
+        self.prefix = [0]     # prefix[i] = sum(runtimes[:i])
+
+    def __copy__(self):
+        new = _MatchupSeries.__new__(_MatchupSeries)
+        new.dates, new.runtimes, new.prefix = list(self.dates), list(self.runtimes), list(self.prefix)
+        return new
+
+    def _refill_prefix(self, i):
+        del self.prefix[i+1:]
+        acc = self.prefix[i]
+        for rt in self.runtimes[i:]:
+            acc += rt
+            self.prefix.append(acc)
+
+    def insert(self, date_str, runtime_min):
+        i = bisect_right(self.dates, date_str)
+        self.dates.insert(i, date_str)
+        self.runtimes.insert(i, runtime_min)
+        if i == len(self.dates) - 1:   # 대부분은 최신 날짜 → 끝에 추가
+            self.prefix.append(self.prefix[-1] + runtime_min)
+        else:
+            self._refill_prefix(i)
+
+    def remove(self, date_str, runtime_min):
+        lo, hi = bisect_left(self.dates, date_str), bisect_right(self.dates, date_str)
+        for i in range(lo, hi):
+            if self.runtimes[i] == runtime_min:
+                del self.dates[i]; del self.runtimes[i]
+                self._refill_prefix(i)
+                return
+
+    def span(self, start, end):
+        """[start, end] 구간의 (lo, hi) 위치"""
+        return bisect_left(self.dates, start), bisect_right(self.dates, end)
+
+class _IdxGame:
+    """스케줄에 나온 경기 1건: 홈/원정 ID, 경기, {스케줄 날짜: 등장 횟수}"""
+    __slots__ = ("home", "away", "game", "dates")
+
+    def __init__(self, home, away, game, dates=None):
+        self.home, self.away, self.game = home, away, game
+        self.dates = dates if dates is not None else {}
+
+    def __copy__(self):
+        return _IdxGame(self.home, self.away, self.game, dict(self.dates))
+
+class _BucketMap(MutableMapping):
+    """스냅샷의 큰 키→값 맵. 키 해시로 나눈 작은 dict 묶음으로 들고 있어서
+    copy.copy는 묶음 목록만 복사하고(O(묶음 수)), 쓰기는 처음 건드리는 묶음만 복사한다
+    → 캐시가 커져도 쓰기 1건의 복사 비용은 묶음 1~2개 크기"""
+    __slots__ = ("_b", "_mine", "_n")
+    _NB = 256   # 묶음 수(2의 거듭제곱)
+
+    def __init__(self, items=()):
+        self._b = [{} for _ in range(self._NB)]
+        self._mine = bytearray(b"\x01" * self._NB)   # 이 객체만 가진(고쳐도 되는) 묶음
+        self._n = 0
+        self.update(items)
+
+    def __copy__(self):
+        new = _BucketMap.__new__(_BucketMap)
+        new._b, new._mine, new._n = list(self._b), bytearray(self._NB), self._n
+        self._mine = bytearray(self._NB)   # 이제 원본과 사본이 묶음을 공유 → 둘 다 고칠 때 복사
+        return new
+
+    def _wb(self, key):
+        i = hash(key) & (self._NB - 1)
+        if not self._mine[i]:
+            self._b[i] = dict(self._b[i])
+            self._mine[i] = 1
+        return self._b[i]
+
+    def __getitem__(self, key):
+        return self._b[hash(key) & (self._NB - 1)][key]
+
+    def get(self, key, default=None):
+        return self._b[hash(key) & (self._NB - 1)].get(key, default)
+
+    def __contains__(self, key):
+        return key in self._b[hash(key) & (self._NB - 1)]
+
+    def __setitem__(self, key, value):
+        b = self._wb(key)
+        if key not in b:
+            self._n += 1
+        b[key] = value
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        del self._wb(key)[key]
+        self._n -= 1
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self._b)
+
+    def __len__(self):
+        return self._n
+
+    def __repr__(self):
+        return f"_BucketMap({dict(self)!r})"
+
+class _Snapshot:
+    """캐시 한 세대의 전체 상태. SNAP으로 게시된 뒤에는 읽기 전용"""
+    __slots__ = ("runtime", "schedule", "dates", "teams", "idx", "pending", "games", "idx_rt",
+                 "stats", "stamps", "states")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields[name])
+
+    @classmethod
+    def empty(cls):
+        # 키가 캐시 크기만큼 늘어나는 맵은 _BucketMap(쓰기 때 건드린 묶음만 복사)
+        return cls(
+            runtime=_BucketMap(),    # 런타임키 → {"runtime_min": 분}
+            schedule=_BucketMap(),   # 날짜 → 경기 목록
+            dates=[],                # schedule 키(정렬)
+            teams=_BucketMap(),      # 날짜 → [(홈 ID, 원정 ID, 경기)]  (schedule과 같은 순서)
+            idx={},                  # 팀 → {상대: _MatchupSeries}
+            pending={},              # 팀 → {상대: {런타임키: 경기}}  (스케줄은 있으나 런타임 없음)
+            games=_BucketMap(),      # 런타임키 → _IdxGame
+            idx_rt=_BucketMap(),     # 런타임키 → 인덱스에 반영된 런타임
+            stats=StatsEngine(STATS_HALFLIFE_DAYS),   # 리그/팀/매치업/홈/원정 누적 통계
+            # 항목별 마지막 쓰기 (세대, 시각): 증분 export(since=)와 재수집 합치기에 사용. 씨드 항목은 없음(=0)
+            stamps={"rt": _BucketMap(), "sc": _BucketMap()},
+            # final이 아닌 항목의 상태: 키 → (상태, 만료 epoch, 연속 실패 수). 없으면 final
+            states={"rt": _BucketMap(), "sc": _BucketMap()},
+        )
 
-    # 런타임(실측 시간 캐시)
-    RUNTIME_MEM = _safe_json_load(RUNTIME_CACHE_FILE, None)
-    # ✅ 빈 dict도 씨드로 대체
-    if not isinstance(RUNTIME_MEM, dict) or not RUNTIME_MEM:
-        seedp = _first_existing(SEED_RUNTIME_CANDIDATES)
-        RUNTIME_MEM = _safe_json_load(seedp, {})
-        _safe_json_save(RUNTIME_CACHE_FILE, RUNTIME_MEM)
+    def clone(self):
+        return _Snapshot(**{name: getattr(self, name) for name in self.__slots__})
+
+class _CowTxn:
+    """쓰기 1건(또는 묶음)의 새 스냅샷. 원본 컨테이너는 처음 바꿀 때 한 번만 복사하고 이후엔 사본을 고친다"""
+
+    def __init__(self, base):
+        self.s = base.clone()
+        self._owned = {}   # id → 이번 트랜잭션이 만든 객체(참조를 쥐고 있어 id가 재사용되지 않음)
+
+    def _own(self, obj):
+        self._owned[id(obj)] = obj
+        return obj
+
+    def put(self, name, obj):
+        """스냅샷 필드를 새 객체로 바꾼다(이미 이 트랜잭션 소유)"""
+        setattr(self.s, name, self._own(obj))
+        return obj
+
+    def mut(self, name):
+        """스냅샷 필드의 쓰기용 사본"""
+        obj = getattr(self.s, name)
+        if id(obj) in self._owned:
+            return obj
+        return self.put(name, copy.copy(obj))
+
+    def mut_in(self, parent, key, factory=None):
+        """parent(쓰기용)[key]의 쓰기용 사본. 없으면 factory()로 만든다(factory가 없으면 None)"""
+        obj = parent.get(key)
+        if obj is None:
+            if factory is None:
+                return None
+            obj = factory()
+        elif id(obj) in self._owned:
+            return obj
+        else:
+            obj = copy.copy(obj)
+        parent[key] = self._own(obj)
+        return obj
+
+SNAP = _Snapshot.empty()
+# 편의용 별칭: 최신 스냅샷의 런타임/스케줄(여러 필드를 같이 볼 땐 SNAP을 한 번 읽어 쓴다)
+RUNTIME_MEM = SNAP.runtime
+SCHEDULE_MEM = SNAP.schedule
+
+def _commit(t):
+    """새 스냅샷 게시: 참조 대입 1번 → 읽는 쪽은 옛 스냅샷이나 새 스냅샷 중 하나를 통째로 본다"""
+    global SNAP, RUNTIME_MEM, SCHEDULE_MEM
+    SNAP = t.s
+    RUNTIME_MEM, SCHEDULE_MEM = SNAP.runtime, SNAP.schedule
+
+def _idx_pairs(h, a):
+    return ((h, a), (a, h)) if h is not None and a is not None and h != a else ()
+
+def _idx_apply(t, key, runtime_min, sign, only_date=None):
+    """key 경기의 등장(날짜×횟수, only_date면 그 날짜 1회)을 시리즈에 넣거나(+1) 뺀다(-1)"""
+    e = t.s.games[key]
+    occ = {only_date: 1} if only_date else e.dates
+    if _idx_pairs(e.home, e.away):
+        idx = t.mut("idx")
+    for me, opp in _idx_pairs(e.home, e.away):
+        series = t.mut_in(t.mut_in(idx, me, dict), opp, _MatchupSeries)
+        for d, n in occ.items():
+            for _ in range(n):
+                if sign > 0: series.insert(d, runtime_min)
+                else:        series.remove(d, runtime_min)
+    for d, n in occ.items():
+        if d >= _STATS_FROM:
+            t.mut("stats").add_game(e.home, e.away, d, runtime_min, sign * n)
+
+def _idx_set_pending(t, key, on):
+    e = t.s.games[key]
+    for me, opp in _idx_pairs(e.home, e.away):
+        if on:
+            t.mut_in(t.mut_in(t.mut("pending"), me, dict), opp, dict)[key] = e.game
+        elif key in t.s.pending.get(me, {}).get(opp, ()):
+            t.mut_in(t.mut_in(t.mut("pending"), me), opp).pop(key)
+
+def _index_runtime(t, key, runtime_min):
+    if key not in t.s.games:
+        return  # 스케줄이 들어올 때 반영됨
+    old = t.s.idx_rt.get(key)
+    if old == runtime_min:
+        return
+    if old is None:
+        _idx_set_pending(t, key, False)
+    else:
+        _idx_apply(t, key, old, -1)
+    _idx_apply(t, key, runtime_min, +1)
+    t.mut("idx_rt")[key] = runtime_min
+
+def _index_game(t, date_str, h, a, g, sign=+1):
+    """스케줄의 경기 1건 등장을 인덱스에 반영(sign=-1이면 제거). h/a는 팀 ID"""
+    key = make_runtime_key(g["g_id"], g["g_dt"])
+    if key not in t.s.games:
+        if sign < 0:
+            return
+        t.mut_in(t.mut("games"), key, lambda: _IdxGame(h, a, g))
+        hit = t.s.runtime.get(key)
+        if hit and "runtime_min" in hit:
+            t.mut("idx_rt")[key] = hit["runtime_min"]
+    elif sign < 0 and date_str not in t.s.games[key].dates:
+        return
+
+    rt = t.s.idx_rt.get(key)
+    if rt is not None:
+        _idx_apply(t, key, rt, sign, only_date=date_str)
+    dates = t.mut_in(t.mut("games"), key).dates
+    dates[date_str] = dates.get(date_str, 0) + sign
+    if not dates[date_str]:
+        del dates[date_str]
+
+    if not dates:
+        _idx_set_pending(t, key, False)
+        del t.s.games[key]
+        if key in t.s.idx_rt:
+            del t.mut("idx_rt")[key]
+    elif rt is None:
+        _idx_set_pending(t, key, True)
+
+def _index_schedule_date(t, date_str, games):
+    # 같은 날짜를 다시 쓰는 경우(우천취소 등) 이전 목록을 빼고 새 목록을 넣는다
+    for h, a, g in t.s.teams.get(date_str, ()):
+        _index_game(t, date_str, h, a, g, -1)
+    row = t.mut("teams")[date_str] = [(*_game_teams(g), g) for g in games]
+    for h, a, g in row:
+        _index_game(t, date_str, h, a, g)
+
+def _has_schedule_between(start, end, s=None):
+    dates = (s or SNAP).dates
+    i = bisect_left(dates, start)
+    return i < len(dates) and dates[i] <= end
+
+# ====== 파티션 로드/내림 (시즌·월 단위, LRU) ======
+def _hot_parts():
+    """항상 메모리에 두는 파티션: START_DATE ~ 오늘(고정 as-of가 더 뒤면 거기까지) + misc"""
+    end = max(datetime.today().strftime("%Y%m%d"), FORCE_ASOF or "")
+    return PARTS.parts_between(_STATS_FROM, end) + [MISC]
+
+def _load_partition_locked(t, part):
+    """(잠금 하) 파티션 파일 1개를 캐시 + 매치업 인덱스에 더한다(없으면 빈 파티션으로 등록)"""
+    rt, sc = PARTS.load(part)
+    _PART_KEYS[part] = (set(rt), set(sc))
+    _PART_USED[part] = next(_PART_TICK)
+    if rt:
+        t.mut("runtime").update(rt)
+    for k, v in rt.items():
+        if k in t.s.games and isinstance(v, dict) and "runtime_min" in v:   # 다른 파티션 스케줄의 경기
+            _index_runtime(t, k, v["runtime_min"])
+    for d in sorted(sc):
+        games = t.mut("schedule")[d] = normalize_games(sc[d])
+        _index_schedule_date(t, d, games)
+    if sc:
+        t.put("dates", sorted(set(t.s.dates).union(sc)))
+
+def _unload_partition_locked(t, part):
+    """(잠금 하) 파티션 항목을 캐시와 인덱스에서 뺀다(파일은 그대로)"""
+    rt_keys, dates = _PART_KEYS.pop(part)
+    _PART_USED.pop(part, None)
+    for d in dates:
+        _index_schedule_date(t, d, [])
+        t.mut("teams").pop(d, None); t.mut("schedule").pop(d, None)
+    if dates:
+        t.put("dates", [d for d in t.s.dates if d not in dates])
+    for k in rt_keys:
+        t.mut("runtime").pop(k, None)
+        old = t.mut("idx_rt").pop(k, None)
+        if old is not None:   # 다른 파티션 스케줄에 남은 경기 → 런타임 없음으로
+            _idx_apply(t, k, old, -1)
+            _idx_set_pending(t, k, True)
+
+def _evict_locked(t, keep=()):
+    """(잠금 하) 로드된 파티션이 예산을 넘으면 오래 안 쓴 것부터 내린다(핫 구간/압축 전/keep 제외)"""
+    over = len(_PART_KEYS) - PARTITION_MAX_LOADED
+    if over <= 0:
+        return
+    pinned = set(_hot_parts()) | _PART_DIRTY | set(keep)
+    cold = sorted((p for p in _PART_KEYS if p not in pinned), key=lambda p: _PART_USED.get(p, 0))
+    for p in cold[:over]:
+        _unload_partition_locked(t, p)
+
+def _ensure_part_locked(t, part):
+    if part not in _PART_KEYS:
+        _load_partition_locked(t, part)
+
+def ensure_partitions(parts=None):
+    """파티션들을 메모리에 올린다(None이면 디스크의 전부). 이미 있으면 LRU 순번만 갱신.
+    다 로드돼 있으면 잠금 없이 끝내고, 아니면 _MEM_LOCK 하에서 장부(_PART_ON_DISK 등)를 본다
+    — 압축이 장부를 다시 채우는 중에 읽지 않도록. 잠금 안(저널 반영 중)에서는 _ensure_part_locked를 쓴다."""
+    tick = next(_PART_TICK)
+    if parts is not None and all(p in _PART_KEYS for p in parts):
+        for p in parts:
+            _PART_USED[p] = tick
+        return
+    with _MEM_LOCK:
+        parts = sorted(_PART_ON_DISK) if parts is None else parts
+        need = []
+        for p in parts:
+            if p in _PART_KEYS:
+                _PART_USED[p] = tick
+            elif p in _PART_ON_DISK:
+                need.append(p)
+        if need:
+            with STORE_LOCK.shared():
+                t = _CowTxn(SNAP)
+                for p in need:
+                    _ensure_part_locked(t, p)
+                _evict_locked(t, keep=parts)
+                _commit(t)
+
+def ensure_dates(start, end=None):
+    """[start, end] 날짜 구간(YYYYMMDD)의 파티션을 메모리에"""
+    ensure_partitions(PARTS.parts_between(start, end or start))
+
+def _seed_partitions_locked():
+    """(STORE_LOCK 하) 파티션이 하나도 없을 때: 예전 통짜 스냅샷(.hrc → JSON), 비었으면 씨드를
+    파티션으로 나눠 저장하고 통짜 스냅샷은 지운다. 가져온 파일들의 수정 시각(데이터 기준 시각) 반환"""
+    rt, sc = _safe_columnar_load(COLUMNAR_CACHE_FILE)
+    srcs = [COLUMNAR_CACHE_FILE]
+    if rt is None:
+        rt = _safe_json_load(RUNTIME_CACHE_FILE, None)
+        sc = _safe_json_load(SCHEDULE_CACHE_FILE, None)
+        srcs = [RUNTIME_CACHE_FILE, SCHEDULE_CACHE_FILE]
 
-    # 스케줄(일자→경기 목록)
-    SCHEDULE_MEM = _safe_json_load(SCHEDULE_CACHE_FILE, None)
     # ✅ 빈 dict도 씨드로 대체
-    if not isinstance(SCHEDULE_MEM, dict) or not SCHEDULE_MEM:
-        seedp = _first_existing(SEED_SCHEDULE_CANDIDATES)
-        SCHEDULE_MEM = _safe_json_load(seedp, {})
-        _safe_json_save(SCHEDULE_CACHE_FILE, SCHEDULE_MEM)
+    seed_rt = seed_sc = None
+    if not isinstance(rt, dict) or not rt or not isinstance(sc, dict) or not sc:
+        srcs.append(_first_existing(SEED_COLUMNAR_CANDIDATES))
+        seed_rt, seed_sc = _safe_columnar_load(srcs[-1])
+    # 런타임(실측 시간 캐시)
+    if not isinstance(rt, dict) or not rt:
+        if not seed_rt:
+            srcs.append(_first_existing(SEED_RUNTIME_CANDIDATES))
+        rt = seed_rt or _safe_json_load(_first_existing(SEED_RUNTIME_CANDIDATES), {})
+    # 스케줄(일자→경기 목록) — 씨드/예전 스냅샷의 팀 이름도 여기서 한 번 정규화
+    if not isinstance(sc, dict) or not sc:
+        if not seed_sc:
+            srcs.append(_first_existing(SEED_SCHEDULE_CANDIDATES))
+        sc = seed_sc or _safe_json_load(_first_existing(SEED_SCHEDULE_CANDIDATES), {})
+    # 파티션을 쓰기 전에(지우기 전에) 원본 시각을 잰다 — 파티션 파일 시각은 '지금'일 뿐
+    seeded_at = max((int(os.path.getmtime(p)) for p in srcs if p and os.path.exists(p)), default=0)
+    sc = {d: normalize_games(games) for d, games in sc.items()}
+
+    with METRICS.timer("hour_save_seconds", kind=SNAPSHOT_FORMAT):
+        for part, (p_rt, p_sc) in PARTS.split(rt, sc).items():
+            PARTS.save(part, dict(sorted(p_rt.items())), dict(sorted(p_sc.items())))
+    for p in (COLUMNAR_CACHE_FILE, RUNTIME_CACHE_FILE, SCHEDULE_CACHE_FILE):
+        if os.path.exists(p):
+            os.remove(p)
+    _PART_ON_DISK.update(PARTS.on_disk())
+    return seeded_at
+
+def _load_cache_locked(truncate_torn=True):
+    """(STORE_LOCK 하) 빈 스냅샷에서 핫 구간 파티션 로드 + 저널 재생 후 한 번에 게시"""
+    global DATA_GENERATION, DATA_UPDATED_AT, CLEAR_GEN
+    t = _CowTxn(_Snapshot.empty())
+    _PART_KEYS.clear(); _PART_USED.clear(); _PART_DIRTY.clear()
+    _PART_ON_DISK.clear(); _PART_ON_DISK.update(PARTS.on_disk())
+    meta = _safe_json_load(CACHE_META_FILE, {})
+    if not _PART_ON_DISK:
+        seeded_at = _seed_partitions_locked()
+        if seeded_at and not meta.get("updated_at"):
+            # 다음 시작 때도 씨드 시각이 보이도록(압축 전에 재시작해도) 메타에 남긴다
+            meta["updated_at"] = seeded_at
+            _safe_json_save(CACHE_META_FILE, meta, indent=None)
+
+    gen = int(meta.get("generation", 0))
+    DATA_UPDATED_AT = meta.get("updated_at") or 0   # 모르면 '데이터 기준' 시각을 표시하지 않는다
+    CLEAR_GEN = int(meta.get("clear_generation", 0))
+    for field, src in (("stamps", meta.get("stamps", {})), ("states", meta.get("states", {}))):
+        t.put(field, {kind: _BucketMap((k, tuple(v)) for k, v in src.get(kind, {}).items()) for kind in ("rt", "sc")})
+
+    for part in _hot_parts():
+        if part in _PART_ON_DISK:
+            _load_partition_locked(t, part)
+
+    # 저널 재생(크래시로 잘린 마지막 줄은 버려짐). 레코드가 건드린 파티션은 로드 + 압축 전까지 유지
+    for rec in JOURNAL.replay(truncate_torn=truncate_torn):
+        if rec.get("op") == "sc":
+            rec["games"] = normalize_games(rec["games"])   # 예전 저널의 팀 이름
+        _apply_to_mem(t, rec)
+        gen = max(gen, rec.get("g", gen))
+    _commit(t)
+    DATA_GENERATION = gen
 
-_warm_cache_from_seed_if_empty()
+def _warm_cache_from_seed_if_empty():
+    """런타임 파일이 있으면 우선 사용, 없으면 seed에서 로드 → 파일로 써두고 메모리에 유지
+    (스냅샷 로드 후 저널을 재생해 마지막 압축 이후의 쓰기를 복구)"""
+    with _MEM_LOCK, STORE_LOCK.exclusive():
+        _load_cache_locked()
+
+def _stamp(t, rec):
+    """stamps(세대, 시각) + 상태 반영. 상태만 바꾸는 st 레코드는 stamps를 건드리지 않는다(증분 export 대상 아님)"""
+    op = rec.get("op")
+    if op == "st":
+        kind, k = rec["kind"], rec["k"]
+    elif op in ("rt", "sc"):
+        kind, k = op, rec["k"] if op == "rt" else rec["d"]
+        t.mut_in(t.mut("stamps"), kind)[k] = (rec.get("g", 0), rec.get("ts", 0))
+    else:
+        return
+    if rec.get("st"):
+        t.mut_in(t.mut("states"), kind)[k] = (rec["st"], rec.get("exp", 0), rec.get("n", 0))
+    elif k in t.s.states[kind]:
+        del t.mut_in(t.mut("states"), kind)[k]
+
+def _apply_to_mem(t, rec):
+    """저널 레코드 1건을 트랜잭션 t의 캐시 + 매치업 인덱스에 반영(해당 파티션을 먼저 로드)"""
+    global DATA_UPDATED_AT
+    _stamp(t, rec)
+    if rec.get("op") not in ("rt", "sc"):
+        return
+    DATA_UPDATED_AT = max(DATA_UPDATED_AT, rec.get("ts", 0))
+    part = PARTS.part_of_key(rec["k"]) if rec["op"] == "rt" else PARTS.part_of_date(rec["d"])
+    _ensure_part_locked(t, part)
+    _PART_DIRTY.add(part)
+    if rec["op"] == "rt":
+        if rec["v"] is not None:     # negative(값 없음) 기록은 상태만 남긴다
+            t.mut("runtime")[rec["k"]] = {"runtime_min": rec["v"]}
+            _PART_KEYS[part][0].add(rec["k"])
+            _index_runtime(t, rec["k"], rec["v"])
+    else:
+        date_str, games = rec["d"], rec["games"]
+        _PART_KEYS[part][1].add(date_str)
+        _index_schedule_date(t, date_str, games)
+        if date_str not in t.s.schedule:
+            t.put("dates", list(t.s.dates))
+            insort(t.s.dates, date_str)
+        t.mut("schedule")[date_str] = games
+
+def _unchanged(t, rec):
+    """새 쓰기 레코드의 값이 트랜잭션 t의 값과 같은지(값 없는 negative 런타임 포함) → 상태만 기록하면 됨"""
+    if rec["op"] == "rt":
+        if rec["v"] is None:
+            return True
+        _ensure_part_locked(t, PARTS.part_of_key(rec["k"]))
+        hit = t.s.runtime.get(rec["k"])
+        return hit is not None and hit.get("runtime_min") == rec["v"]
+    _ensure_part_locked(t, PARTS.part_of_date(rec["d"]))
+    return t.s.schedule.get(rec["d"]) == rec["games"]
+
+def _state_only(rec):
+    """값은 그대로 두고 상태/만료만 바꾸는 레코드(세대를 올리지 않음 → 응답 캐시/게시 페이지 유지)"""
+    out = {"op": "st", "kind": rec["op"], "k": rec["k"] if rec["op"] == "rt" else rec["d"], "ts": rec["ts"]}
+    out.update((f, rec[f]) for f in ("st", "exp", "n") if f in rec)
+    return out
 
-# === 메모리 캐시에 접근 ===
-def get_runtime_cache():   return RUNTIME_MEM
-def get_schedule_cache():  return SCHEDULE_MEM
+def _apply_many_locked(recs, write=None):
+    """(_MEM_LOCK 하) 레코드들을 새 스냅샷 하나로 반영해 게시.
+    write가 있으면 새 쓰기: 값이 그대로인 레코드는 st 레코드로 바꿔 지금 세대를, 나머지는 다음 세대
+    번호를 붙여 반영하고, 다 성공하면 게시 직전에 write(레코드 목록)로 저널에 남긴다.
+    반영 중 예외가 나면 파티션 장부까지 디스크 기준으로 되돌린다."""
+    global DATA_GENERATION
+    t, gen, out = _CowTxn(SNAP), DATA_GENERATION, []
+    try:
+        for rec in recs:
+            if write is not None:
+                if _unchanged(t, rec):
+                    rec = _state_only(rec)
+                else:
+                    gen += 1
+                rec["g"] = gen
+            _apply_to_mem(t, rec)
+            out.append(rec)
+    except Exception:
+        _load_cache_locked()
+        raise
+    if write is not None:
+        write(out)
+    _commit(t)
+    DATA_GENERATION = out[-1]["g"]
+
+def _sync_locked(truncate_torn=True):
+    """(STORE_LOCK 하) 다른 워커가 저널에 쓴 뒷부분만 반영. 저널이 교체됐으면 전체 재로드."""
+    recs = JOURNAL.read_new()
+    # 다음 레코드는 다음 세대(값 변경)거나 지금 세대(st: 상태만)여야 한다 — 아니면 놓친 레코드가 있음
+    if recs is None or (recs and recs[0].get("g", -1) - DATA_GENERATION not in (0, 1)):
+        _load_cache_locked(truncate_torn)
+        return
+    if recs:
+        _apply_many_locked(recs)
+
+def sync_shared_cache():
+    """요청마다 호출: 저널 stat 1회로 변화 확인 → 바뀐 경우에만 증분 반영"""
+    if JOURNAL.changed():
+        with _MEM_LOCK, STORE_LOCK.shared():
+            if JOURNAL.changed():
+                _sync_locked(truncate_torn=False)
+    return DATA_GENERATION
+
+def _meta_of(s):
+    """(_MEM_LOCK 하) 스냅샷 s 시점의 메타(세대 번호 등은 지금 전역값 — s가 최신일 때만 맞음)"""
+    return {
+        "generation": DATA_GENERATION, "updated_at": DATA_UPDATED_AT, "clear_generation": CLEAR_GEN,
+        "stamps": {kind: dict(m) for kind, m in s.stamps.items()},
+        "states": {kind: dict(m) for kind, m in s.states.items()},
+    }
 
-def set_runtime_cache(key, runtime_min):
-    RUNTIME_MEM[key] = {"runtime_min": runtime_min}
-    _safe_json_save(RUNTIME_CACHE_FILE, RUNTIME_MEM)
+@METRICS.timed("hour_save_seconds", kind="meta")
+def _save_meta(meta):
+    _safe_json_save(CACHE_META_FILE, meta, indent=None)
+
+def _save_snapshot(s, parts):
+    """스냅샷 s의 파티션들을 SNAPSHOT_FORMAT으로 저장. parts: 파티션 → (런타임키 set, 날짜 set).
+    s는 바뀌지 않으므로 잠금 없이 호출한다."""
+    with METRICS.timer("hour_save_seconds", kind=SNAPSHOT_FORMAT):
+        for p in sorted(parts):
+            rt_keys, dates = parts[p]
+            PARTS.save(p, {k: s.runtime[k] for k in sorted(rt_keys)},
+                       {d: s.schedule[d] for d in sorted(dates)})
+
+def _prune_meta_locked():
+    """(_MEM_LOCK 하) 메타(stamps/states)에서 더는 쓸 데 없는 항목을 뺀 스냅샷 게시(세대는 그대로)
+    - 로드된 파티션에 값이 없는 런타임 키의 stamp: 증분 export에 나갈 값이 없음(negative만 남은 경기 등)
+    - 만료된 지 NEGATIVE_TTL_MAX_SEC가 지난 negative 상태: 연속 실패 수만 초기화되고 재수집 판단은 같다
+    내려간 파티션의 키는 파일에 값이 있으므로 그대로 둔다. → 삭제한 항목 수"""
+    s, cutoff = SNAP, time.time() - NEGATIVE_TTL_MAX_SEC
+    dead_rt = [k for k in s.stamps["rt"]
+               if k not in s.runtime and PARTS.part_of_key(k) in _PART_KEYS]
+    dead_st = {kind: [k for k, (st, exp, _) in states.items() if st == "negative" and exp < cutoff]
+               for kind, states in s.states.items()}
+    if not dead_rt and not any(dead_st.values()):
+        return 0
+    t = _CowTxn(s)
+    if dead_rt:
+        stamps = t.mut_in(t.mut("stamps"), "rt")
+        for k in dead_rt:
+            del stamps[k]
+    for kind, keys in dead_st.items():
+        if keys:
+            states = t.mut_in(t.mut("states"), kind)
+            for k in keys:
+                del states[k]
+    _commit(t)
+    return len(dead_rt) + sum(map(len, dead_st.values()))
+
+def _part_of_rec(rec):
+    op = rec.get("op")
+    return PARTS.part_of_key(rec["k"]) if op == "rt" else PARTS.part_of_date(rec["d"]) if op == "sc" else None
+
+def _compact_cache(min_records=1):
+    """저널을 파티션 스냅샷으로 접어 넣는다(저널 레코드가 min_records개 이상일 때). 압축한 경우 True
+    1) 잠금 하: 따라잡고 메타 정리 → 불변 스냅샷, 저널 위치, 바뀐 파티션의 키 목록, 메타를 잡아 둔다
+    2) 잠금 없이: 파티션 직렬화/파일 쓰기, 메타 저장 — 그동안 쓰기/동기화는 평소대로 진행
+    3) 잠금 하: 잡아 둔 위치 앞의 레코드(스냅샷에 들어간 부분)만 버린 저널로 교체
+    2에서 죽으면 저널이 그대로라 재생으로 복구된다(레코드는 값 덮어쓰기라 두 번 반영해도 같음)."""
+    with COMPACT_LOCK.exclusive():
+        with _MEM_LOCK, STORE_LOCK.exclusive():
+            _sync_locked()
+            if JOURNAL.records < max(1, min_records):   # 그사이 다른 워커가 압축했으면 건너뜀
+                return False
+            _prune_meta_locked()
+            s, ino, offset = SNAP, JOURNAL.ino, JOURNAL.offset
+            parts = {p: (set(_PART_KEYS[p][0]), set(_PART_KEYS[p][1])) for p in _PART_DIRTY}
+            meta = _meta_of(s)
+
+        _save_snapshot(s, parts)
+        _save_meta(meta)
+
+        with _MEM_LOCK, STORE_LOCK.exclusive():
+            _sync_locked()
+            if JOURNAL.ino != ino:   # 압축/초기화는 COMPACT_LOCK으로 막혀 있어 여기 올 일은 없다
+                return False
+            tail = JOURNAL.drop_before(offset)
+            # 스냅샷 뒤에 들어온 레코드가 건드린 파티션만 다음 압축 전까지 내리지 않는다
+            _PART_DIRTY.clear()
+            _PART_DIRTY.update(p for p in map(_part_of_rec, tail) if p is not None)
+            _PART_ON_DISK.clear(); _PART_ON_DISK.update(PARTS.on_disk())
+    return True
+
+def _compact_job():
+    """백그라운드 압축: 쓰기 요청은 저널 기록 + 스냅샷 교체까지만 하고 직렬화/파일 쓰기는 여기서"""
+    _compact_cache(JOURNAL_COMPACT_EVERY)
+
+PERSIST = RefreshQueue(1, name="persist")
+
+# 일괄 수집용 묶음 쓰기: batched_writes() 안에서는 set_*_cache가 바로 기록하지 않고 모았다가 한 번에
+_WRITE_BATCH = None
+
+class _WriteBatch:
+    def __init__(self, size):
+        self.size = max(1, size)
+        self.recs = []
+        self.lock = threading.Lock()
+
+    def add(self, rec):
+        with self.lock:
+            self.recs.append(rec)
+            full = len(self.recs) >= self.size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """모인 레코드를 기록(잠금 1번 + fsync 1번). 기록한 개수 반환"""
+        with self.lock:
+            recs, self.recs = self.recs, []
+        _journal_write_many(recs)
+        return len(recs)
+
+@contextmanager
+def batched_writes(size):
+    """with 안의 캐시 쓰기를 size개씩 묶어 기록하고, 끝날 때 남은 것도 기록한다.
+    묶음이 기록되기 전까지는 메모리/다른 워커에 보이지 않으므로 일괄 수집(hour_backfill)에서만 쓴다."""
+    global _WRITE_BATCH
+    _WRITE_BATCH = batch = _WriteBatch(size)
+    try:
+        yield batch
+    finally:
+        _WRITE_BATCH = None
+        batch.flush()
+
+def _journal_write(rec):
+    """다른 워커 변경분을 따라잡은 뒤 다음 세대 번호로 기록하고 메모리에 반영"""
+    batch = _WRITE_BATCH
+    if batch is not None:
+        batch.add(rec)
+        return
+    _journal_write_many([rec])
 
-def set_schedule_cache_for_date(date_str, games_minimal_list):
-    SCHEDULE_MEM[date_str] = games_minimal_list
-    _safe_json_save(SCHEDULE_CACHE_FILE, SCHEDULE_MEM)
+def _journal_write_many(recs):
+    """여러 레코드를 잠금 1번 + fsync 1번으로 기록(세대 번호는 값이 바뀌는 레코드마다 +1), 스냅샷 1번 교체"""
+    if not recs:
+        return
+    with _MEM_LOCK, STORE_LOCK.exclusive():
+        _sync_locked()
+        JOURNAL.truncate_torn()
+        gen0 = DATA_GENERATION
+        now = int(time.time())
+        for rec in recs:
+            rec["ts"] = now
+        # 메모리에 먼저 반영해 보고 성공한 레코드만 저널에 → 깨진 레코드가 모든 워커의 재생을 막지 않게
+        _apply_many_locked(recs, write=JOURNAL.append_many)
+        compact = JOURNAL.records >= JOURNAL_COMPACT_EVERY
+        changed = DATA_GENERATION != gen0
+    if compact:
+        PERSIST.submit(("compact",), _compact_job)
+    if changed:
+        request_publish()
 
-def make_runtime_key(game_id: str, game_date: str) -> str:
-    return f"{game_id}_{game_date}"
+_warm_cache_from_seed_if_empty()
+
+# === 메모리 캐시에 접근 ===
+def get_runtime_cache():   return SNAP.runtime
+def get_schedule_cache():  return SNAP.schedule
+
+def set_runtime_cache(key, runtime_min, state="final", ttl=None):
+    _journal_write({"op": "rt", "k": key, "v": runtime_min, **_state_fields("rt", key, state, ttl)})
+
+def set_schedule_cache_for_date(date_str, games_minimal_list, state="final", ttl=None):
+    games = normalize_games(games_minimal_list)
+    # 경기 없는 날의 final은 상태를 남겨야 상태 없는 예전 빈 스케줄(다시 확인 대상)과 구분된다
+    fields = {"st": "final"} if state == "final" and not games else _state_fields("sc", date_str, state, ttl)
+    _journal_write({"op": "sc", "d": date_str, "games": games, **fields})
+
+# === 항목 상태(final / provisional / negative) ===
+def _state_fields(kind, k, state, ttl=None):
+    """저널 레코드에 붙일 상태 필드. negative는 연속 실패마다 만료를 2배로(최대 NEGATIVE_TTL_MAX_SEC)"""
+    if state == "final":
+        return {}
+    now = int(time.time())
+    if state == "negative":
+        prev = SNAP.states[kind].get(k)
+        n = prev[2] + 1 if prev and prev[0] == "negative" else 1
+        ttl = min(NEGATIVE_TTL_SEC * 2 ** (n - 1), NEGATIVE_TTL_MAX_SEC)
+        return {"st": "negative", "exp": now + ttl, "n": n}
+    return {"st": state, "exp": now + (ttl if ttl is not None else PROVISIONAL_TTL_SEC)}
+
+def _entry_state(kind, k, s=None):
+    """(상태, 만료, 실패 수). 상태 없는 예전 빈 스케줄([])은 만료된 negative로 본다(다시 확인 대상).
+    경기 없음이 확인된 지난 날짜는 ("final", 0, 0) 상태가 따로 남아 있다."""
+    s = s or SNAP
+    st = s.states[kind].get(k)
+    if st is not None:
+        return st
+    if kind == "sc" and s.schedule.get(k) == []:
+        return ("negative", 0, 0)
+    return ("final", 0, 0)
+
+def _is_fresh(kind, k):
+    """다시 수집할 필요 없이 캐시 값(없으면 '없음')을 그대로 써도 되는지"""
+    ensure_partitions([PARTS.part_of_key(k) if kind == "rt" else PARTS.part_of_date(k)])
+    s = SNAP
+    state, exp, _ = _entry_state(kind, k, s)
+    if state == "final":
+        return k in (s.runtime if kind == "rt" else s.schedule)
+    return time.time() < exp
+
+def _schedule_state_for(date_str, games):
+    """수집 성공한 스케줄의 상태: 경기 없음 → negative(EMPTY_FINAL_AFTER_DAYS 넘게 지난 날이면 final),
+    오늘 이후 → provisional, 지난 날 → final"""
+    today = datetime.today().strftime("%Y%m%d")
+    if not games:
+        settled = (datetime.today() - timedelta(days=EMPTY_FINAL_AFTER_DAYS)).strftime("%Y%m%d")
+        return ("final" if date_str <= settled else "negative"), None
+    if date_str == today:
+        return "provisional", PROVISIONAL_TTL_SEC
+    if date_str > today:
+        return "provisional", SCHEDULE_AHEAD_TTL_SEC
+    return "final", None
+
+# ====== 크롤러 (캐시 전용 모드에선 만들지도 않음) ======
+# 드라이버 풀/HTTP 세션은 프로세스당 1개를 만들어 재사용
+_CRAWLER = None
+_CRAWLER_LOCK = threading.Lock()
+
+def get_crawler():
+    global _CRAWLER
+    with _CRAWLER_LOCK:
+        if _CRAWLER is None:
+            from hour_crawler import Crawler
+            _CRAWLER = Crawler()
+        return _CRAWLER
 
-# ====== Selenium (캐시 전용 모드에선 호출되지 않음) ======
 def make_driver():
-    options = Options()
-    options.binary_location = os.environ.get("CHROME_BIN", "/usr/bin/google-chrome")
-    options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1280,1200")
-    options.add_argument("--lang=ko-KR")
-    options.add_argument("--user-agent=Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36")
-    options.page_load_strategy = "eager"
-    return webdriver.Chrome(options=options)
+    from hour_crawler import make_driver as _make_driver
+    return _make_driver()
 
 # ====== 날짜 스케줄(캐시→미스만 보충) ======
-def _extract_match_info_from_card(li):
-    home_nm = li.get("home_nm"); away_nm = li.get("away_nm")
-    g_id = li.get("g_id"); g_dt = li.get("g_dt")
-
-    if not (home_nm and away_nm):
-        home_alt = li.select_one(".team.home .emb img")
-        away_alt = li.select_one(".team.away .emb img")
-        if away_alt and not away_nm: away_nm = (away_alt.get("alt") or "").strip() or None
-        if home_alt and not home_nm: home_nm = (home_alt.get("alt") or "").strip() or None
-
-    if not (g_id and g_dt):
-        a = li.select_one("a[href*='GameCenter/Main.aspx'][href*='gameId='][href*='gameDate=']")
-        if a and a.has_attr("href"):
-            href = a["href"]
-            gm = re.search(r"gameId=([A-Z0-9]+)", href)
-            dm = re.search(r"gameDate=(\d{8})", href)
-            if gm: g_id = g_id or gm.group(1)
-            if dm: g_dt = g_dt or dm.group(1)
-
-    return {"home": home_nm, "away": away_nm, "g_id": g_id, "g_dt": g_dt}
-
-def get_games_for_date(driver, date_str):
-    # 캐시에 있으면 바로 반환
-    if date_str in SCHEDULE_MEM:
-        return SCHEDULE_MEM[date_str]
-
-    # ✅ 캐시 전용 모드면 절대 크롤링 안 하고, 빈 리스트로 기록/반환
+@METRICS.timed("hour_stage_seconds", stage="get_games")
+def get_games_for_date(driver, date_str, force=False):
+    ensure_dates(date_str)
+    # 캐시가 유효하면(final, 만료 전 provisional/negative) 바로 반환(force면 다시 받아 덮어씀)
+    if not force and _is_fresh("sc", date_str):
+        METRICS.inc("hour_cache_lookups_total", cache="schedule", result="hit")
+        return SNAP.schedule.get(date_str, [])
+    METRICS.inc("hour_cache_lookups_total", cache="schedule",
+                result="refresh" if force else ("stale" if date_str in SNAP.schedule else "miss"))
+
+    # ✅ 캐시 전용 모드면 절대 크롤링 안 함(있는 값 그대로, 없으면 빈 리스트 — 기록하지 않음)
     if USE_CACHE_ONLY:
-        set_schedule_cache_for_date(date_str, [])
-        return []
-
-    wait = WebDriverWait(driver, 8)
-    url = f"https://www.koreabaseball.com/Schedule/GameCenter/Main.aspx?gameDate={date_str}"
-    driver.get(url)
-    try:
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div#contents")))
-    except Exception:
-        set_schedule_cache_for_date(date_str, [])
-        return []
-
-    time.sleep(0.2)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    cards = soup.select("li.game-cont") or soup.select("li[class*='game-cont']")
-
-    out = []
-    for li in cards:
-        info = _extract_match_info_from_card(li)
-        if all([info.get("home"), info.get("away"), info.get("g_id"), info.get("g_dt")]):
-            out.append(info)
-
-    set_schedule_cache_for_date(date_str, out)
-    return out
+        return SNAP.schedule.get(date_str, [])
+
+    # 동시에 같은 날짜를 찾는 요청/워커는 1번만 수집하고 결과를 나눠 씀
+    gen0 = DATA_GENERATION
+    def recheck():
+        sync_shared_cache()
+        if SNAP.stamps["sc"].get(date_str, (0, 0))[0] > gen0 or (not force and _is_fresh("sc", date_str)):
+            return True, SNAP.schedule.get(date_str, [])
+        return False, None
+
+    def fetch():
+        # driver가 None이면 크롤러의 드라이버 풀/HTTP 경로 사용
+        out = get_crawler().fetch_schedule(date_str, driver=driver)
+        if out is None:
+            # 수집 실패: 기존 목록은 유지하고 negative(백오프 후 재시도)로만 표시
+            prev = SNAP.schedule.get(date_str, [])
+            set_schedule_cache_for_date(date_str, prev, state="negative")
+            return prev
+        state, ttl = _schedule_state_for(date_str, out)
+        set_schedule_cache_for_date(date_str, out, state=state, ttl=ttl)
+        return out
+
+    return SINGLE_FLIGHT.do(("sc", date_str), fetch, recheck)
 
 def ensure_schedule_for_dates(dates):
     # ✅ 캐시 전용 모드면 스킵
     if USE_CACHE_ONLY:
         return
-    miss = [d for d in dates if d not in SCHEDULE_MEM]
+    miss = [d for d in dates if not _is_fresh("sc", d)]
     if not miss:
         return
-    d = make_driver()
-    try:
-        for dt in miss:
-            get_games_for_date(d, dt)
-    finally:
-        try: d.quit()
-        except: pass
+    get_crawler().map(lambda dt: get_games_for_date(None, dt), miss)
 
 # ====== 오늘(또는 as-of) 매치업: 캐시에서만 조회 ======
+@METRICS.timed("hour_stage_seconds", stage="schedule_lookup")
 def find_today_matches_for_team_from_cache(my_team, date_str: str | None = None):
-    my_can = canon_team(my_team)
+    my_id = parse_team(my_team)
     today = _asof_or_today(date_str)
-    games = SCHEDULE_MEM.get(today, [])
     results = []
-    for g in games:
-        h_can, a_can = canon_team(g["home"]), canon_team(g["away"])
-        if my_can in {h_can, a_can}:
-            rival = h_can if a_can == my_can else a_can
-            info = dict(g); info["rival"] = rival
+    if my_id is None:
+        return results
+    ensure_dates(today)
+    for h, a, g in SNAP.teams.get(today, ()):
+        if my_id == h or my_id == a:
+            rival = h if a == my_id else a
+            info = dict(g); info["rival"] = team_name(rival); info["rival_id"] = rival
             results.append(info)
     return results
 
 # ====== 리뷰 런타임 ======
+@METRICS.timed("hour_stage_seconds", stage="review_runtime")
 def open_review_and_get_runtime(driver, game_id, game_date):
-    today_str = datetime.today().strftime("%Y%m%d")
     key = make_runtime_key(game_id, game_date)
 
-    # 오늘 경기가 아니면 캐시 우선
-    if game_date != today_str:
-        hit = RUNTIME_MEM.get(key)
-        if hit and "runtime_min" in hit:
-            return hit["runtime_min"]
+    # 캐시가 유효하면 바로(final, 만료 전 오늘 경기 provisional, 백오프 중인 negative)
+    if _is_fresh("rt", key):
+        METRICS.inc("hour_cache_lookups_total", cache="runtime", result="hit")
+        hit = SNAP.runtime.get(key)
+        return hit["runtime_min"] if hit and "runtime_min" in hit else None
+    METRICS.inc("hour_cache_lookups_total", cache="runtime", result="stale" if key in SNAP.runtime else "miss")
 
-    # ✅ 캐시 전용 모드면 크롤링 금지
+    # ✅ 캐시 전용 모드면 크롤링 금지(만료된 값이라도 있으면 그대로)
     if USE_CACHE_ONLY:
-        return None
+        hit = SNAP.runtime.get(key)
+        return hit["runtime_min"] if hit and "runtime_min" in hit else None
+
+    def recheck():
+        sync_shared_cache()
+        if not _is_fresh("rt", key):
+            return False, None
+        hit = SNAP.runtime.get(key)
+        return True, (hit["runtime_min"] if hit and "runtime_min" in hit else None)
+
+    def fetch():
+        run_time_min = get_crawler().fetch_runtime(game_id, game_date, driver=driver)
+        today_str = datetime.today().strftime("%Y%m%d")
+        if run_time_min is None:
+            # 수집 실패(아직 안 끝난 경기 포함): 값 없이 negative로 백오프
+            set_runtime_cache(key, None, state="negative")
+        elif game_date >= today_str:
+            set_runtime_cache(key, run_time_min, state="provisional")   # 진행/정정 가능성 → 짧게
+        else:
+            set_runtime_cache(key, run_time_min)
+        return run_time_min
 
-    wait = WebDriverWait(driver, 8)
-    base = f"https://www.koreabaseball.com/Schedule/GameCenter/Main.aspx?gameId={game_id}&gameDate={game_date}"
-    driver.get(base)
-    try:
-        tab = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), '리뷰')]")))
-        tab.click()
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.record-etc")))
-    except Exception:
-        driver.get(base + "&section=REVIEW")
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.record-etc")))
-        except Exception:
-            pass
-
-    time.sleep(0.2)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    run_time_min = None
-    box = soup.select_one("div.record-etc")
-    if box:
-        span = box.select_one("span#txtRunTime")
-        if span:
-            txt = span.get_text(strip=True)
-            m = re.search(r"(\d{1,2})\s*[:：]\s*(\d{2})", txt)
-            if m:
-                h, mn = int(m.group(1)), int(m.group(2))
-                run_time_min = h * 60 + mn
-
-    if (game_date != today_str) and (run_time_min is not None):
-        set_runtime_cache(key, run_time_min)
-    return run_time_min
+    return SINGLE_FLIGHT.do(("rt", key), fetch, recheck)
 
 # ====== 날짜 리스트 유틸 ======
+def _days_between(start_dt, end_dt):
+    return [(start_dt + timedelta(days=i)).strftime("%Y%m%d") for i in range((end_dt - start_dt).days + 1)]
+
 def _daterange_list(start_date: str, end_date: str):
     if "-" in start_date:
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
     else:
         start_dt = datetime.strptime(start_date, "%Y%m%d")
     end_dt = datetime.strptime(end_date, "%Y%m%d")
-    return [dt.strftime("%Y%m%d") for dt in pd.date_range(start=start_dt, end=end_dt)]
+    return _days_between(start_dt, end_dt)
 
 def _last_n_days_list(n: int, end_date_yyyymmdd: str | None = None):
     end_str = end_date_yyyymmdd or (datetime.today() - timedelta(days=1)).strftime("%Y%m%d")
     end_dt = datetime.strptime(end_str, "%Y%m%d")
     start_dt = end_dt - timedelta(days=n-1)
-    return [dt.strftime("%Y%m%d") for dt in pd.date_range(start=start_dt, end=end_dt)]
+    return _days_between(start_dt, end_dt)
 
 # ====== 평균 계산 (캐시 우선, 부족분은 건너뛰기) ======
+@METRICS.timed("hour_stage_seconds", stage="collect")
 def collect_history_avg_runtime(my_team, rival_set, start_date=START_DATE, asof: str | None = None):
-    my_can = canon_team(my_team)
+    """my_team/rival_set은 팀 ID 또는 팀 이름(별칭 포함)"""
+    my_id = parse_team(my_team)
     ref = _asof_or_today(asof)
     # as-of의 전날까지 평균을 계산
     ref_yesterday_dt = datetime.strptime(ref, "%Y%m%d") - timedelta(days=1)
     yesterday = ref_yesterday_dt.strftime("%Y%m%d")
 
-    # 날짜 풀 만들기 (as-of에 맞춰)
-    if SCHEDULE_MEM:
-        date_pool = set(_daterange_list(start_date, yesterday))
-        dates = sorted(list(date_pool.intersection(set(SCHEDULE_MEM.keys()))))
-        if not dates:
-            dates = _last_n_days_list(HISTORY_DAYS, yesterday)
-            if not USE_CACHE_ONLY:
-                ensure_schedule_for_dates(dates)
-    else:
+    # 집계 구간 [start, yesterday] (as-of에 맞춰)
+    start = start_date.replace("-", "")
+    ensure_dates(start, yesterday)
+    if not _has_schedule_between(start, yesterday):
         dates = _last_n_days_list(HISTORY_DAYS, yesterday)
-        if not USE_CACHE_ONLY:
-            ensure_schedule_for_dates(dates)
-
-    # 1) 대상 경기 수집
-    targets = []
-    rival_norm_set = {canon_team(x) for x in (rival_set or [])} if rival_set else None
-    for d in dates:
-        for g in SCHEDULE_MEM.get(d, []):
-            h_can, a_can = canon_team(g["home"]), canon_team(g["away"])
-            if my_can not in {h_can, a_can}:
-                continue
-            opp_can = h_can if a_can == my_can else a_can
-            if rival_norm_set and opp_can not in rival_norm_set:
-                continue
-            targets.append(g)
-
-    # 2) 런타임 캐시 우선
-    run_times, missing = [], []
-    for g in targets:
-        key = make_runtime_key(g["g_id"], g["g_dt"])
-        hit = RUNTIME_MEM.get(key)
-        if hit and "runtime_min" in hit:
-            run_times.append(hit["runtime_min"])
-        else:
-            missing.append(g)
-
-    # 3) 부족분 처리
-    if missing:
-        # ✅ 캐시 전용 모드면 보충하지 않고 건너뜀
-        if USE_CACHE_ONLY:
-            return (round(sum(run_times)/len(run_times), 1), run_times) if run_times else (None, [])
-        # (크롤링 허용일 때만) 보충
-        if len(missing) > MAX_REVIEW_PER_REQUEST:
-            missing = missing[:MAX_REVIEW_PER_REQUEST]
-        d = make_driver()
-        try:
-            need_dates = sorted({g["g_dt"] for g in missing if g.get("g_dt")})
-            ensure_schedule_for_dates(need_dates)
-            for g in missing:
-                rt = open_review_and_get_runtime(d, g["g_id"], g["g_dt"])
-                if rt is not None:
-                    run_times.append(rt)
-        finally:
-            try: d.quit()
-            except: pass
+        ensure_dates(dates[0], yesterday)
+        enqueue_schedule_refresh(dates)
+        start = dates[0]
+
+    # 1) 매치업 인덱스에서 구간합 (런타임 캐시 히트분) — 스냅샷 하나로 끝까지
+    s = SNAP
+    rivals = s.idx.get(my_id, {})
+    pending = s.pending.get(my_id, {})
+    wanted = {parse_team(x) for x in rival_set} if rival_set else set(rivals) | set(pending)
+    total, run_times, missing = 0, [], []
+    for opp in wanted:
+        series = rivals.get(opp)
+        if series is not None:
+            lo, hi = series.span(start, yesterday)
+            total += series.prefix[hi] - series.prefix[lo]
+            run_times.extend(series.runtimes[lo:hi])
+        # 2) 스케줄은 있으나 런타임이 없는 경기
+        for key, g in pending.get(opp, {}).items():
+            n = sum(c for d, c in s.games[key].dates.items() if start <= d <= yesterday)
+            if n:
+                missing.append((g, n))   # 스케줄 중복 등장도 캐시 히트와 같은 가중치로
+
+    METRICS.inc("hour_cache_lookups_total", len(run_times), cache="matchup_games", result="hit")
+    METRICS.inc("hour_cache_lookups_total", sum(n for _, n in missing), cache="matchup_games", result="miss")
+
+    # 3) 부족분은 백그라운드 갱신 큐로(요청은 캐시 값으로 바로 응답, 캐시 전용 모드면 건너뜀)
+    #    최근에 실패한 경기(negative, 백오프 중)는 건너뜀
+    if missing and not USE_CACHE_ONLY:
+        missing = [m for m in missing if not _is_fresh("rt", make_runtime_key(m[0]["g_id"], m[0]["g_dt"]))]
+        missing.sort(key=lambda m: m[0]["g_dt"])
+        enqueue_runtime_refresh([g for g, _ in missing[:MAX_REVIEW_PER_REQUEST]])
 
     if run_times:
-        return round(sum(run_times) / len(run_times), 1), run_times
+        return round(total / len(run_times), 1), run_times
     return None, []
 
+# ====== 백그라운드 갱신 (크롤링은 여기서만) ======
+REFRESH = RefreshQueue(REFRESH_WORKERS)
+SCHEDULER = Scheduler(os.path.join(CACHE_DIR, "scheduler.lock"))
+
+def enqueue_schedule_refresh(dates, force=False):
+    """캐시에 없는(force면 전부) 날짜의 스케줄 수집을 큐에 넣는다"""
+    if USE_CACHE_ONLY:
+        return 0
+    return sum(REFRESH.submit(("sc", d), get_games_for_date, None, d, force)
+               for d in dates if force or not _is_fresh("sc", d))
+
+def enqueue_runtime_refresh(games):
+    if USE_CACHE_ONLY:
+        return 0
+    keys = ((make_runtime_key(g["g_id"], g["g_dt"]), g) for g in games)
+    return sum(REFRESH.submit(("rt", key), open_review_and_get_runtime, None, g["g_id"], g["g_dt"])
+               for key, g in keys if not _is_fresh("rt", key))
+
+def backfill_day(date_str):
+    """그 날 스케줄을 다시 받고 모든 경기의 런타임을 채운다(야간 작업 / 수동 갱신)"""
+    games = get_games_for_date(None, date_str, force=True)
+    get_crawler().map(lambda g: open_review_and_get_runtime(None, g["g_id"], g["g_dt"]), games)
+
+def nightly_backfill():
+    backfill_day((datetime.today() - timedelta(days=1)).strftime("%Y%m%d"))
+
+def prefetch_schedules():
+    """오늘 스케줄은 다시 받고, 앞으로 PREFETCH_DAYS일 중 없는 날짜를 채운다"""
+    today = datetime.today()
+    get_games_for_date(None, today.strftime("%Y%m%d"), force=True)
+    ensure_schedule_for_dates([(today + timedelta(days=i)).strftime("%Y%m%d")
+                               for i in range(1, PREFETCH_DAYS + 1)])
+
+def _freshness():
+    """화면용 신선도 표시: 마지막 데이터 갱신 시각 + 갱신 작업 진행 여부"""
+    return dict(
+        updated_at=time.strftime("%Y-%m-%d %H:%M", time.localtime(DATA_UPDATED_AT)) if DATA_UPDATED_AT else None,
+        refreshing=REFRESH.busy(),
+    )
+
 # ====== 공통 처리 ======
+_THRESHOLDS = [None, None]   # [세대, 기준값] — 데이터가 바뀔 때만 다시 계산
+
+def _thresholds():
+    """분류 기준값 {top30, avg_ref, bottom70}. 리그 전체 누적 통계의 30/70 분위수와 평균(세대별 캐시)."""
+    gen, cached = _THRESHOLDS
+    if cached is not None and gen == DATA_GENERATION:
+        return cached
+    gen, league = DATA_GENERATION, SNAP.stats.get("league")   # 세대는 스냅샷 교체 뒤에 오르므로 먼저 읽음
+    if LIVE_THRESHOLDS and league.count >= LIVE_THRESHOLDS_MIN_GAMES:
+        th = dict(top30=round(league.quantile(0.3), 1), avg_ref=round(league.mean(), 1),
+                  bottom70=round(league.quantile(0.7), 1), source="live", games=league.count)
+    else:
+        th = dict(top30=top30, avg_ref=avg_ref, bottom70=bottom70, source="fixed", games=league.count)
+    _THRESHOLDS[:] = [gen, th]
+    return th
+
+def _threshold_ctx():
+    th = _thresholds()
+    return dict(top30=th["top30"], avg_ref=th["avg_ref"], bottom70=th["bottom70"])
+
+def _classify(avg_time):
+    """평균 경기시간 → (css_class, 안내 문구)"""
+    th = _thresholds()
+    if avg_time is None:            return "", ""
+    if avg_time < th["top30"]:      return "fast", "빠르게 끝나는 경기입니다"
+    if avg_time < th["avg_ref"]:    return "normal", "일반적인 경기 소요 시간입니다"
+    if avg_time < th["bottom70"]:   return "bit-long", "조금 긴 편이에요"
+    return "long", "시간 오래 걸리는 매치업입니다"
+
+@METRICS.timed("hour_stage_seconds", stage="compute")
 def compute_for_team(team_name, asof: str | None = None):
     if not team_name:
         return dict(result="팀을 선택해주세요.", avg_time=None, css_class="", msg="",
-                    selected_team=None, top30=top30, avg_ref=avg_ref, bottom70=bottom70)
+                    selected_team=None, **_threshold_ctx(), **_freshness())
 
     selected_can = canon_team(team_name)
     ref = _asof_or_today(asof)
@@ -405,39 +1276,225 @@ def compute_for_team(team_name, asof: str | None = None):
     today_matches = find_today_matches_for_team_from_cache(selected_can, ref)
 
     if not today_matches:
-        # 캐시 전용이 아니고, 캐시에 ref가 없으면 보충 시도
-        if not USE_CACHE_ONLY:
-            ensure_schedule_for_dates([ref])
-            today_matches = find_today_matches_for_team_from_cache(selected_can, ref)
+        # 캐시 전용이 아니고, 캐시에 ref가 없으면 백그라운드로 보충(이번 응답은 캐시 기준)
+        enqueue_schedule_refresh([ref])
 
     if not today_matches:
         return dict(result=no_game_text,
                     avg_time=None, css_class="", msg="",
-                    selected_team=selected_can, top30=top30, avg_ref=avg_ref, bottom70=bottom70)
+                    selected_team=selected_can, **_threshold_ctx(),
+                    **_freshness())
 
     rivals_today = {m["rival"] for m in today_matches if m.get("rival")}
     rivals_str = ", ".join(sorted(rivals_today)) if rivals_today else ""
+    rival_ids = {m["rival_id"] for m in today_matches if m.get("rival")}
 
     try:
-        avg_time, _ = collect_history_avg_runtime(selected_can, rivals_today, start_date=START_DATE, asof=ref)
+        avg_time, _ = collect_history_avg_runtime(TEAM_ID[selected_can], rival_ids, start_date=START_DATE, asof=ref)
     except Exception:
         avg_time = None
 
-    css_class = ""; msg = ""
+    css_class, msg = _classify(avg_time)
     if avg_time is not None:
-        if avg_time < top30:        css_class, msg = "fast", "빠르게 끝나는 경기입니다"
-        elif avg_time < avg_ref:    css_class, msg = "normal", "일반적인 경기 소요 시간입니다"
-        elif avg_time < bottom70:   css_class, msg = "bit-long", "조금 긴 편이에요"
-        else:                       css_class, msg = "long", "시간 오래 걸리는 매치업입니다"
         result = f"{ref} {selected_can}의 상대팀은 {rivals_str}입니다.<br>과거 {selected_can} vs {rivals_str} 평균 경기시간: {avg_time}분"
     else:
         # 평균이 없으면 문구 통일
         result = no_game_text
 
     return dict(result=result, avg_time=avg_time, css_class=css_class, msg=msg,
-                selected_team=selected_can, top30=top30, avg_ref=avg_ref, bottom70=bottom70)
+                selected_team=selected_can, **_threshold_ctx(),
+                **_freshness())
+
+# ====== 배치 집계 (JSON API) ======
+def _sweep_positions(dates, bounds, order, right):
+    """정렬된 dates에서 bounds 각각의 bisect 위치를 병합 스캔 한 번으로 구한다
+    (order: bounds를 오름차순으로 훑는 인덱스 순서)"""
+    out = [0] * len(bounds)
+    j, n = 0, len(dates)
+    for i in order:
+        b = bounds[i]
+        if right:
+            while j < n and dates[j] <= b: j += 1
+        else:
+            while j < n and dates[j] < b: j += 1
+        out[i] = j
+    return out
+
+def _rivals_on(date_str, s):
+    """그 날짜 스케줄의 팀 ID → 상대팀 ID 집합"""
+    rivals = {}
+    for h, a, _ in s.teams.get(date_str, ()):
+        rivals.setdefault(h, set()).add(a if h != a else h)
+        rivals.setdefault(a, set()).add(h)
+    return rivals
+
+def batch_team_averages(teams, asofs, start_date=START_DATE):
+    """(팀 × as-of) 전체를 한 번에 집계 — compute_for_team과 같은 규칙(as-of 상대팀, 전날까지 평균).
+    매치업 시리즈마다 모든 as-of 경계를 한 번 훑어 누적합 위치를 구하므로 O(경기 + as-of)."""
+    asofs = sorted(set(asofs))
+    start = start_date.replace("-", "")
+    ensure_dates(min(start, _last_n_days_list(HISTORY_DAYS, asofs[0])[0]), asofs[-1])
+    s = SNAP
+    los, his = [], []
+    for ref in asofs:
+        y = (datetime.strptime(ref, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+        los.append(start if _has_schedule_between(start, y, s) else _last_n_days_list(HISTORY_DAYS, y)[0])
+        his.append(y)
+    lo_order = sorted(range(len(los)), key=los.__getitem__)
+    hi_order = range(len(his))   # asofs가 정렬돼 있으므로 이미 오름차순
+    day_rivals = [_rivals_on(ref, s) for ref in asofs]
+
+    out = []
+    for team in teams:
+        tid = parse_team(team)
+        series_map = s.idx.get(tid, {})
+        spans = {opp: (_sweep_positions(sr.dates, los, lo_order, False),
+                       _sweep_positions(sr.dates, his, hi_order, True))
+                 for opp, sr in series_map.items()}
+        for i, ref in enumerate(asofs):
+            rival_ids = day_rivals[i].get(tid, ()) if tid is not None else ()
+            total = count = 0
+            for opp in rival_ids:
+                if opp in spans:
+                    lo, hi = spans[opp][0][i], spans[opp][1][i]
+                    total += series_map[opp].prefix[hi] - series_map[opp].prefix[lo]
+                    count += hi - lo
+            avg_time = round(total / count, 1) if count else None
+            css_class, msg = _classify(avg_time)
+            rivals = sorted(team_name(r) for r in rival_ids if r is not None)
+            out.append(dict(team=team, asof=ref, rivals=rivals, avg_time=avg_time,
+                            count=count, css_class=css_class, msg=msg))
+    return out
+
+def _parse_yyyymmdd(s):
+    x = s.strip().replace("-", "")
+    # 0001~0999년은 strptime은 통과해도 strftime이 네 자리로 돌려주지 않아(키 형식이 깨짐) 거절
+    if datetime.strptime(x, "%Y%m%d").strftime("%Y%m%d") != x:
+        raise ValueError(f"date out of range: {x}")
+    return x
+
+# ====== /hour 응답 캐시 (팀, as-of, 데이터 세대) → 렌더링 결과 ======
+# 세대가 바뀌면(런타임/스케줄 쓰기) 통째로 비움. ETag는 본문 해시(strong).
+_RESP_CACHE = OrderedDict()
+_RESP_CACHE_GEN = None
+_RESP_LOCK = threading.Lock()
+
+def _response_cache_key(team, asof):
+    ref = _asof_or_today(asof)
+    is_today = ref == datetime.today().strftime("%Y%m%d")
+    # 템플릿이 select 표시에 원래 myteam 값을 쓰므로 함께 키에 넣는다(갱신 중 표시도)
+    return (canon_team(team) if team else "", ref, is_today, request.args.get("myteam"), REFRESH.busy())
+
+def _response_cache_get(key, gen):
+    global _RESP_CACHE_GEN
+    with _RESP_LOCK:
+        if _RESP_CACHE_GEN != gen:   # 데이터가 바뀜 → 전부 버리고 미스
+            _RESP_CACHE.clear()
+            _RESP_CACHE_GEN = gen
+        hit = _RESP_CACHE.get(key)
+        if hit is not None:
+            _RESP_CACHE.move_to_end(key)
+    METRICS.inc("hour_response_cache_total", result="hit" if hit is not None else "miss")
+    return hit
+
+def _response_cache_put(key, gen, entry):
+    if RESPONSE_CACHE_SIZE <= 0:
+        return
+    with _RESP_LOCK:
+        if _RESP_CACHE_GEN != gen:
+            return
+        _RESP_CACHE[key] = entry
+        while len(_RESP_CACHE) > RESPONSE_CACHE_SIZE:
+            _RESP_CACHE.popitem(last=False)
+
+# ====== 미리 렌더링한 팀 페이지 (PUBLISH_PAGES=1) ======
+# 게시본 1벌 = (데이터 세대, as-of)의 10개 팀 페이지. 쓰기/날짜 변경 뒤 백그라운드에서 다시 렌더링하고,
+# 그 사이 요청은 실시간 렌더링으로 응답한다. 여러 워커가 동시에 게시하지 않도록 SINGLE_FLIGHT로 합침.
+PAGES = PageStore(PUBLISH_DIR)
+PUBLISHER = RefreshQueue(1, name="publish")   # REFRESH와 분리('갱신 중' 표시에 안 잡히게)
+
+def _page_name(team):
+    return f"team{TEAM_ID[team]:02d}"
+
+def _publish_target():
+    """지금 게시해야 할 as-of(/hour에 asof 없이 들어온 요청과 같은 날짜)"""
+    return _asof_or_today(FORCE_ASOF or None)
+
+def _published_is_current():
+    m = PAGES.manifest()
+    return bool(m) and m.get("generation") == DATA_GENERATION and m.get("asof") == _publish_target()
+
+@METRICS.timed("hour_save_seconds", kind="publish")
+def publish_pages():
+    """_ALIAS의 모든 팀 페이지를 지금 데이터로 렌더링해 압축본과 함께 게시"""
+    gen, ref = DATA_GENERATION, _publish_target()
+    pages = {}
+    for team in _ALIAS:
+        with app.test_request_context("/hour", query_string={"myteam": team}):
+            ctx = compute_for_team(team, asof=FORCE_ASOF or None)
+            ctx["refreshing"] = False   # 갱신 중에는 게시본을 쓰지 않으므로 항상 '갱신 중' 없이
+            pages[_page_name(team)] = render_template("hour.html", **ctx).encode("utf-8")
+    return PAGES.publish({"generation": gen, "asof": ref, "updated_at": DATA_UPDATED_AT}, pages)
+
+def _publish_recheck():
+    sync_shared_cache()
+    return _published_is_current(), None
+
+def _publish_job():
+    time.sleep(PUBLISH_DEBOUNCE_SEC)
+    for _ in range(3):   # 렌더링하는 동안 세대가 또 바뀌었으면 다시
+        SINGLE_FLIGHT.do(("publish",), publish_pages, _publish_recheck)
+        if _published_is_current():
+            break
+
+def request_publish():
+    """게시본을 다시 만들도록 예약(이미 대기/진행 중이면 무시)"""
+    if PUBLISH_PAGES:
+        PUBLISHER.submit(("publish",), _publish_job)
+
+def _published_response(team):
+    """정식 파라미터(?myteam=정식 팀 이름, asof 없음 또는 게시 대상 날짜)면 게시본 바이트로 응답, 아니면 None"""
+    if (request.method != "GET" or team not in _ALIAS or request.args.get("myteam") != team
+            or set(request.args) - {"myteam", "asof"} or REFRESH.busy()):
+        return None
+    try:
+        target = _publish_target()
+        if _asof_or_today(request.args.get("asof") or None) != target:
+            return None
+    except ValueError:
+        return None
+    hit = PAGES.get(_page_name(team), [e for e in PAGES.encodings if request.accept_encodings[e]])
+    if hit is None or hit[3].get("generation") != DATA_GENERATION or hit[3].get("asof") != target:
+        METRICS.inc("hour_published_total", result="stale")
+        request_publish()
+        return None
+    body, encoding, etag, _ = hit
+    METRICS.inc("hour_published_total", result="hit", encoding=encoding)
+    resp = make_response(body)
+    resp.headers["Content-Type"] = "text/html; charset=utf-8"
+    if encoding != "identity":
+        resp.headers["Content-Encoding"] = encoding
+    resp.headers["Vary"] = "Accept-Encoding"
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["Server-Timing"] = METRICS.server_timing(total=time.perf_counter() - g.t0)
+    resp.set_etag(etag)
+    return resp.make_conditional(request)
 
 # ====== 라우트 ======
+@app.before_request
+def _sync_before_request():
+    g.t0 = time.perf_counter()
+    METRICS.track_request()
+    with METRICS.timer("hour_stage_seconds", stage="sync"):
+        sync_shared_cache()
+
+@app.after_request
+def _observe_request(resp):
+    if "t0" in g:
+        METRICS.observe("hour_http_request_seconds", time.perf_counter() - g.t0,
+                        endpoint=request.endpoint or "404", status=resp.status_code)
+    return resp
+
 @app.route("/", methods=["GET","POST"])
 @app.route("/hour", methods=["GET","POST"])
 def hour_index():
@@ -448,69 +1505,382 @@ def hour_index():
         # ⬇️ 확실하게 9/20 고정 동작을 원한다면, asof를 강제로 덮어씁니다.
         use_asof = FORCE_ASOF or asof
 
-        ctx = compute_for_team(team, asof=use_asof) if team else dict(
-            result=None, avg_time=None, css_class="", msg="",
-            selected_team=None, top30=top30, avg_ref=avg_ref, bottom70=bottom70
-        )
-        return render_template("hour.html", **ctx)
+        if PUBLISH_PAGES:
+            published = _published_response(team)
+            if published is not None:
+                return published
+
+        gen = DATA_GENERATION
+        key = _response_cache_key(team, use_asof)
+        hit = _response_cache_get(key, gen)
+        if hit is None:
+            ctx = compute_for_team(team, asof=use_asof) if team else dict(
+                result=None, avg_time=None, css_class="", msg="",
+                selected_team=None, **_threshold_ctx(), **_freshness()
+            )
+            with METRICS.timer("hour_stage_seconds", stage="render"):
+                body = render_template("hour.html", **ctx).encode("utf-8")
+            hit = (body, hashlib.sha1(body).hexdigest())
+            _response_cache_put(key, gen, hit)
+
+        body, etag = hit
+        resp = make_response(body)
+        resp.headers["Content-Type"] = "text/html; charset=utf-8"
+        resp.headers["Cache-Control"] = "no-cache"   # iframe 폴링은 매번 재검증 → 304
+        if PUBLISH_PAGES:
+            resp.headers["Vary"] = "Accept-Encoding"
+        resp.headers["Server-Timing"] = METRICS.server_timing(total=time.perf_counter() - g.t0)
+        resp.set_etag(etag)
+        return resp.make_conditional(request)
     except Exception as e:
         return f"오류가 발생했습니다: {type(e).__name__}: {str(e)}", 200
 
+@app.route("/api/hour")
+def api_hour():
+    """여러 팀 × as-of 범위를 한 번에 JSON으로
+    ?teams=LG,KT (생략/all이면 10개 팀) & from=YYYYMMDD & to=YYYYMMDD (또는 asof=YYYYMMDD)
+    /hour와 달리 FORCE_ASOF로 덮어쓰지 않는다(날짜를 생략했을 때의 기본값으로만 씀)
+    → 같은 팀이라도 /hour 화면과 값이 다를 수 있다"""
+    raw_teams = (request.args.get("teams") or "all").strip()
+    if raw_teams.lower() == "all":
+        teams = list(_ALIAS)
+    else:
+        teams = list(dict.fromkeys(canon_team(t) for t in raw_teams.split(",") if t.strip()))
+        unknown = [t for t in teams if t not in _ALIAS]
+        if unknown:
+            return jsonify({"ok": False, "error": f"unknown teams: {', '.join(unknown)}"}), 400
+    try:
+        one = request.args.get("asof")
+        start = _parse_yyyymmdd(request.args.get("from") or one or _asof_or_today(None))
+        end = _parse_yyyymmdd(request.args.get("to") or one or start)
+        asofs = _daterange_list(start, end)
+    except (ValueError, OverflowError) as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    if not asofs:
+        return jsonify({"ok": False, "error": "from > to"}), 400
+    if len(asofs) > API_MAX_DAYS:
+        return jsonify({"ok": False, "error": f"range too long (max {API_MAX_DAYS} days)"}), 400
+
+    results = batch_team_averages(teams, asofs)
+    return jsonify({
+        "ok": True, "generation": DATA_GENERATION, "updated_at": _freshness()["updated_at"],
+        "from": asofs[0], "to": asofs[-1], "teams": teams,
+        "thresholds": _thresholds(),
+        "results": results,
+    })
+
+@app.route("/api/stats")
+def api_stats():
+    """누적 통계 ?team=LG (생략하면 리그 전체 + 팀별 요약)
+    개수/평균/표준편차/최근 가중 평균(ewma)/30·50·70 분위수"""
+    raw = (request.args.get("team") or "").strip()
+    gen, s = DATA_GENERATION, SNAP
+    stats = s.stats
+    out = {"ok": True, "generation": gen, "halflife_days": stats.halflife_days,
+           "thresholds": _thresholds(), "league": stats.get("league").summary()}
+    if not raw:
+        out["teams"] = {TEAMS[t]: stats.get("team", t).summary()
+                        for t in range(len(TEAMS)) if stats.get("team", t).count}
+        return jsonify(out)
+    tid = parse_team(raw)
+    if tid is None:
+        return jsonify({"ok": False, "error": f"unknown team: {raw}"}), 400
+    out.update(team=TEAMS[tid], overall=stats.get("team", tid).summary(),
+               home=stats.get("home", tid).summary(), away=stats.get("away", tid).summary(),
+               matchups={TEAMS[o]: stats.get("matchup", tid, o).summary()
+                         for o in sorted(s.idx.get(tid, {})) if stats.get("matchup", tid, o).count})
+    return jsonify(out)
+
 # ====== 헬스/캐시 유틸 ======
 @app.route("/healthz")
 def healthz():
     return "ok", 200
 
+METRICS.describe("hour_cache_hit_ratio", "gauge", "Hit ratio of hour_cache_lookups_total per cache")
+METRICS.describe("hour_response_cache_hit_ratio", "gauge", "Hit ratio of hour_response_cache_total")
+METRICS.describe("hour_data_generation", "gauge", "Cache generation seen by the scraped worker")
+METRICS.describe("hour_refresh_pending", "gauge", "Background refresh jobs queued in the scraped worker")
+METRICS.describe("hour_journal_records", "gauge", "Journal records since the last compaction")
+METRICS.describe("hour_partitions_loaded", "gauge", "Cache partitions held in memory by the scraped worker")
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus 텍스트 포맷(모든 gunicorn 워커 합계)"""
+    gauges = {
+        "hour_cache_hit_ratio": METRICS.ratio("hour_cache_lookups_total"),
+        "hour_response_cache_hit_ratio": METRICS.ratio("hour_response_cache_total"),
+        "hour_data_generation": [({}, DATA_GENERATION)],
+        "hour_refresh_pending": [({}, REFRESH.pending())],
+        "hour_journal_records": [({}, JOURNAL.records)],
+        "hour_partitions_loaded": [({}, len(_PART_KEYS))],
+    }
+    return Response(METRICS.render(gauges), mimetype="text/plain; version=0.0.4")
+
 @app.route("/cache/status")
 def cache_status():
     return jsonify({
         "BASE_DIR": os.path.abspath(BASE_DIR),
         "DATA_DIR": os.path.abspath(DATA_DIR),
         "CACHE_DIR": os.path.abspath(CACHE_DIR),
-        "runtime_cache": _file_info(RUNTIME_CACHE_FILE),
-        "schedule_cache": _file_info(SCHEDULE_CACHE_FILE),
+        "partitions": _partition_status(),
+        "snapshot_format": SNAPSHOT_FORMAT,
+        "journal": dict(_file_info(JOURNAL_FILE), records=JOURNAL.records,
+                        compact_every=JOURNAL_COMPACT_EVERY),
         "seed_candidates": {
             "runtime": [ _file_info(p) for p in SEED_RUNTIME_CANDIDATES ],
             "schedule": [ _file_info(p) for p in SEED_SCHEDULE_CANDIDATES ],
+            "columnar": [ _file_info(p) for p in SEED_COLUMNAR_CANDIDATES ],
         },
+        "generation": DATA_GENERATION,
+        "updated_at": _freshness()["updated_at"],
+        "refresh": REFRESH.status(),
+        "single_flight": SINGLE_FLIGHT.status(),
+        "scheduler": SCHEDULER.status(),
+        "response_cache_entries": len(_RESP_CACHE),
+        "published": dict(PAGES.status(), enabled=PUBLISH_PAGES, current=_published_is_current(),
+                          queue=PUBLISHER.status()),
         "mem_sizes": {
-            "runtime_keys": len(RUNTIME_MEM or {}),
-            "schedule_days": len(SCHEDULE_MEM or {}),
+            "runtime_keys": len(SNAP.runtime),
+            "schedule_days": len(SNAP.schedule),
         },
+        "entry_states": _entry_state_counts(),
         "config": {
             "START_DATE": START_DATE,
             "HISTORY_DAYS": HISTORY_DAYS,
             "MAX_REVIEW_PER_REQUEST": MAX_REVIEW_PER_REQUEST,
             "USE_CACHE_ONLY": USE_CACHE_ONLY,
+            "NIGHTLY_BACKFILL_AT": NIGHTLY_BACKFILL_AT,
+            "PREFETCH_DAYS": PREFETCH_DAYS,
             "FORCE_ASOF": FORCE_ASOF,
+            "RESPONSE_CACHE_SIZE": RESPONSE_CACHE_SIZE,
+            "PROVISIONAL_TTL_SEC": PROVISIONAL_TTL_SEC,
+            "SCHEDULE_AHEAD_TTL_SEC": SCHEDULE_AHEAD_TTL_SEC,
+            "NEGATIVE_TTL_SEC": NEGATIVE_TTL_SEC,
+            "NEGATIVE_TTL_MAX_SEC": NEGATIVE_TTL_MAX_SEC,
+            "EMPTY_FINAL_AFTER_DAYS": EMPTY_FINAL_AFTER_DAYS,
         }
     })
 
+def _partition_status():
+    """파티션별 크기: 파일 바이트 + (로드돼 있으면) 런타임 키/스케줄 날짜 수"""
+    hot = set(_hot_parts())
+    with _MEM_LOCK:
+        items = {}
+        for p in sorted(set(_PART_ON_DISK) | set(_PART_KEYS)):
+            keys = _PART_KEYS.get(p)
+            items[p] = {"loaded": keys is not None, "file_bytes": _PART_ON_DISK.get(p),
+                        "runtime_keys": len(keys[0]) if keys else None,
+                        "schedule_days": len(keys[1]) if keys else None,
+                        "pinned": p in hot, "dirty": p in _PART_DIRTY}
+    return {"by": PARTITION_BY, "dir": os.path.abspath(PARTITION_DIR), "max_loaded": PARTITION_MAX_LOADED,
+            "loaded": sum(v["loaded"] for v in items.values()), "items": items}
+
+def _entry_state_counts():
+    """종류별 {final, provisional, negative, expired} 개수(expired: 만료돼 다음 조회 때 다시 수집)"""
+    now, s = time.time(), SNAP
+    out = {}
+    for kind, mem in (("runtime", s.runtime), ("schedule", s.schedule)):
+        states = s.states["rt" if kind == "runtime" else "sc"]
+        c = {"final": len([k for k in mem if k not in states]), "provisional": 0, "negative": 0, "expired": 0}
+        for st, exp, _ in states.values():
+            c[st if st == "final" or now < exp else "expired"] += 1
+        out[kind] = c
+    return out
+
 @app.route("/cache/clear", methods=["POST"])
 def cache_clear():
-    global RUNTIME_MEM, SCHEDULE_MEM
+    """모든 워커 공통: 스냅샷/저널을 지우고 씨드로 재시작(새 저널 → 다른 워커도 재로드)"""
+    try:
+        deleted = _clear_cache()
+    except Exception as e:
+        return jsonify({"ok": False, "error": str(e)}), 500
+    return jsonify({"ok": True, "deleted": deleted, "generation": DATA_GENERATION})
+
+def _clear_cache():
+    global DATA_GENERATION, CLEAR_GEN
     deleted = []
-    for p in [RUNTIME_CACHE_FILE, SCHEDULE_CACHE_FILE]:
-        if os.path.exists(p):
-            try:
+    with COMPACT_LOCK.exclusive(), _MEM_LOCK, STORE_LOCK.exclusive():
+        _sync_locked()
+        gen = DATA_GENERATION
+        for p in [RUNTIME_CACHE_FILE, SCHEDULE_CACHE_FILE, COLUMNAR_CACHE_FILE, JOURNAL_FILE, CACHE_META_FILE]:
+            if os.path.exists(p):
                 os.remove(p); deleted.append(os.path.basename(p))
-            except Exception as e:
-                return jsonify({"ok": False, "error": str(e)}), 500
-    _warm_cache_from_seed_if_empty()
-    return jsonify({"ok": True, "deleted": deleted})
+        deleted += [os.path.join("partitions", fn) for fn in PARTS.clear()]
+        JOURNAL.reset()
+        _load_cache_locked()
+        DATA_GENERATION = CLEAR_GEN = gen + 1
+        _save_meta(_meta_of(SNAP))
+    request_publish()
+    return deleted
+
+@app.route("/cache/refresh", methods=["POST"])
+def cache_refresh():
+    """수동 갱신: ?date=YYYYMMDD 날짜(기본 어제)의 스케줄+런타임을 백그라운드로 다시 받는다"""
+    if USE_CACHE_ONLY:
+        return jsonify({"ok": False, "error": "USE_CACHE_ONLY=1"}), 400
+    try:
+        date_str = _parse_yyyymmdd(request.args.get("date") or "") if request.args.get("date") else \
+            (datetime.today() - timedelta(days=1)).strftime("%Y%m%d")
+    except ValueError as e:
+        return jsonify({"ok": False, "error": str(e)}), 400
+    queued = REFRESH.submit(("day", date_str), backfill_day, date_str)
+    return jsonify({"ok": True, "date": date_str, "queued": queued})
+
+# ====== 씨드 Export / Import ======
+# export는 zip을 메모리에 다 만들지 않고 청크 단위로 흘려보낸다.
+# ?since=N  : 세대 N 이후(또는 N이 epoch 초면 그 시각 이후) 바뀐 항목만 (replica 동기화용)
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+class _ZipChunkWriter(io.RawIOBase):
+    """zipfile이 쓰는 바이트를 모아 두었다가 제너레이터가 꺼내 가는 비탐색(non-seekable) 스트림"""
+
+    def __init__(self):
+        self._chunks, self._pos, self.pending = [], 0, 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        self._pos += len(b); self.pending += len(b)
+        return len(b)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self):
+        out, self._chunks, self.pending = b"".join(self._chunks), [], 0
+        return out
+
+def _json_object_pieces(items):
+    """(키, 값) 목록을 JSON 객체 문자열 조각으로(한 항목씩)"""
+    yield "{"
+    for i, (k, v) in enumerate(items):
+        yield ("\n" if i == 0 else ",\n") + json.dumps(k, ensure_ascii=False) + ": " + json.dumps(v, ensure_ascii=False)
+    yield "\n}\n"
+
+def _export_selection(since):
+    """since(None=전체)에 맞는 (메타, 런타임 항목, 스케줄 항목). 항목 목록은 참조 복사만 한다.
+    스냅샷은 세대 번호보다 먼저 바뀌므로 세대를 먼저 읽는다(겹치는 항목은 다음 증분에 한 번 더 올 뿐)."""
+    if since is None or since <= 0 or (since < 1_000_000_000 and since < CLEAR_GEN):
+        ensure_partitions()   # 전체 export는 디스크의 모든 파티션이 필요
+    else:
+        field, stamps = 1 if since >= 1_000_000_000 else 0, SNAP.stamps
+        ensure_partitions(sorted({PARTS.part_of_key(k) for k, st in stamps["rt"].items() if st[field] > since}
+                                 | {PARTS.part_of_date(d) for d, st in stamps["sc"].items() if st[field] > since}))
+    gen = DATA_GENERATION
+    s = SNAP
+    meta = {"generation": gen, "updated_at": DATA_UPDATED_AT, "since": since, "mode": "full", "reset": False}
+    if since is None or since <= 0:
+        rt_keys, sc_keys = sorted(s.runtime), sorted(s.schedule)
+    elif since < 1_000_000_000 and since < CLEAR_GEN:
+        # 그 사이 /cache/clear가 있었음 → 받는 쪽은 비우고 전체를 다시 받아야 함
+        rt_keys, sc_keys = sorted(s.runtime), sorted(s.schedule)
+        meta["reset"] = True
+    else:
+        field = 1 if since >= 1_000_000_000 else 0   # epoch 초 vs 세대 번호
+        rt_keys = sorted(k for k, st in s.stamps["rt"].items() if st[field] > since and k in s.runtime)
+        sc_keys = sorted(d for d, st in s.stamps["sc"].items() if st[field] > since and d in s.schedule)
+        meta["mode"] = "delta"
+    rt_items = [(k, s.runtime[k]) for k in rt_keys]
+    sc_items = [(d, s.schedule[d]) for d in sc_keys]
+    meta["runtime_count"], meta["schedule_count"] = len(rt_items), len(sc_items)
+    return meta, rt_items, sc_items
+
+def _stream_export_zip(meta, rt_items, sc_items):
+    w = _ZipChunkWriter()
+    with zipfile.ZipFile(w, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, items in (("runtime_cache.json", rt_items), ("schedule_index.json", sc_items)):
+            with z.open(name, "w") as f:
+                for piece in _json_object_pieces(items):
+                    f.write(piece.encode("utf-8"))
+                    if w.pending >= EXPORT_CHUNK_BYTES:
+                        yield w.drain()
+        z.writestr("export_meta.json", json.dumps(meta, ensure_ascii=False))
+    yield w.drain()
 
-# ====== 씨드 Export (선택) ======
 @app.route("/cache/export")
 def cache_export():
-    mem = io.BytesIO()
-    with zipfile.ZipFile(mem, "w", zipfile.ZIP_DEFLATED) as z:
-        z.writestr("runtime_cache.json", json.dumps(get_runtime_cache(), ensure_ascii=False, indent=2))
-        z.writestr("schedule_index.json", json.dumps(get_schedule_cache(), ensure_ascii=False, indent=2))
-    mem.seek(0)
-    resp = make_response(mem.read())
-    resp.headers["Content-Type"] = "application/zip"
-    resp.headers["Content-Disposition"] = "attachment; filename=hour_cache_seed.zip"
+    since = request.args.get("since")
+    try:
+        since = int(since) if since else None
+    except ValueError:
+        return jsonify({"ok": False, "error": "since must be a generation number or epoch seconds"}), 400
+    meta, rt_items, sc_items = _export_selection(since)
+    resp = Response(_stream_export_zip(meta, rt_items, sc_items), mimetype="application/zip")
+    name = "hour_cache_seed.zip" if meta["mode"] == "full" else f"hour_cache_delta_{since}_{meta['generation']}.zip"
+    resp.headers["Content-Disposition"] = f"attachment; filename={name}"
+    resp.headers["X-Cache-Generation"] = str(meta["generation"])
     return resp
 
+# 가져오기 검증: 저널에 한 번 들어간 레코드는 모든 워커가 재생하므로 형식이 맞는 항목만 기록한다
+def _valid_game(g):
+    """g_id/g_dt는 비지 않은 문자열, home/away는 문자열"""
+    return (isinstance(g, dict) and all(isinstance(g.get(f), str) for f in ("g_id", "g_dt", "home", "away"))
+            and bool(g["g_id"]) and bool(g["g_dt"]))
+
+def _valid_schedule_entry(d, games):
+    return (isinstance(d, str) and len(d) == 8 and d.isdigit()
+            and isinstance(games, list) and all(_valid_game(g) for g in games))
+
+def _valid_runtime_entry(k, v):
+    rt = v.get("runtime_min") if isinstance(v, dict) else None
+    return isinstance(k, str) and bool(k) and isinstance(rt, int) and not isinstance(rt, bool) and 0 < rt < 1440
+
+def import_cache_records(runtime=None, schedule=None):
+    """씨드/덤프 형식 dict를 캐시에 병합. 형식이 틀린 항목과 값이 같은 항목은 건너뛰고 나머지는 한 번에 기록.
+    → (런타임 기록 수, 스케줄 기록 수, {"runtime": 건너뛴 수, "schedule": 건너뛴 수})"""
+    runtime, schedule = runtime or {}, schedule or {}
+    if not isinstance(runtime, dict) or not isinstance(schedule, dict):
+        raise ValueError("runtime_cache.json / schedule_index.json must be JSON objects")
+    sc_ok = {d: games for d, games in schedule.items() if _valid_schedule_entry(d, games)}
+    rt_ok = {k: v["runtime_min"] for k, v in runtime.items() if _valid_runtime_entry(k, v)}
+    skipped = {"runtime": len(runtime) - len(rt_ok), "schedule": len(schedule) - len(sc_ok)}
+
+    ensure_partitions(sorted({PARTS.part_of_date(d) for d in sc_ok} | {PARTS.part_of_key(k) for k in rt_ok}))
+    recs, s = [], SNAP
+    for d, games in sorted(sc_ok.items()):
+        if s.schedule.get(d) != (games := normalize_games(games)):
+            recs.append({"op": "sc", "d": d, "games": games})
+    for k, rt in sorted(rt_ok.items()):
+        if (s.runtime.get(k) or {}).get("runtime_min") != rt:
+            recs.append({"op": "rt", "k": k, "v": rt})
+    _journal_write_many(recs)
+    return sum(r["op"] == "rt" for r in recs), sum(r["op"] == "sc" for r in recs), skipped
+
+@app.route("/cache/import", methods=["POST"])
+def cache_import():
+    """/cache/export zip(전체/증분)을 받아 병합. 본문 그대로 또는 multipart 'file'."""
+    upload = request.files.get("file")
+    data = upload.read() if upload else request.get_data()
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as z:
+            names = set(z.namelist())
+            def load(name):
+                return json.loads(z.read(name)) if name in names else {}
+            runtime, schedule = load("runtime_cache.json"), load("schedule_index.json")
+            meta = load("export_meta.json")
+    except (zipfile.BadZipFile, ValueError) as e:
+        return jsonify({"ok": False, "error": f"bad archive: {e}"}), 400
+    if not all(isinstance(x, dict) for x in (runtime, schedule, meta)):
+        return jsonify({"ok": False, "error": "bad archive: runtime_cache.json, schedule_index.json and "
+                                              "export_meta.json must be JSON objects"}), 400
+    if meta.get("reset"):
+        _clear_cache()
+    n_rt, n_sc, skipped = import_cache_records(runtime, schedule)
+    return jsonify({"ok": True, "imported": {"runtime": n_rt, "schedule": n_sc}, "skipped": skipped,
+                    "reset": bool(meta.get("reset")), "source_generation": meta.get("generation"),
+                    "generation": DATA_GENERATION})
+
+# 크롤링이 허용된 경우에만 주기 작업 시작(여러 워커 중 리더 1개만 실제 실행)
+if not USE_CACHE_ONLY:
+    SCHEDULER.daily("nightly_backfill", NIGHTLY_BACKFILL_AT, nightly_backfill)
+    SCHEDULER.every("prefetch_schedules", PREFETCH_EVERY_SEC, prefetch_schedules, first_delay=10)
+    SCHEDULER.start()
+
+# 부팅 시 게시본이 지금 데이터와 다르면 다시 게시(워커 중 1개만 실제 렌더링)
+if PUBLISH_PAGES and not _published_is_current():
+    request_publish()
+
 if __name__ == "__main__":
     app.run(debug=True, port=5002, use_reloader=False)
@@ -0,0 +1,166 @@
+#hour_backfill.py
+# 기간 일괄 수집(새 시즌 씨드 채우기): 날짜별 스케줄 → 경기별 리뷰 런타임을 받아 캐시에 기록
+#
+#   python hour_backfill.py 20250322 20250930 --workers 4
+#   python hour_backfill.py 20250322 20250331 --base-url http://127.0.0.1:8765 --min-interval 0   # fixture 서버
+#
+#  - hour_back.get_games_for_date / open_review_and_get_runtime 그대로 사용(이미 final인 항목은 건너뜀)
+#  - 날짜 단위로 --workers개 동시 처리, 쓰기는 --batch개씩 묶어 저널에 기록
+#  - 체크포인트(JSON): 기록이 끝난 날짜만 done에 남긴다 → 중단 후 같은 명령을 다시 실행하면 이어서
+#    런타임을 못 받은 경기가 있는 날짜는 failed, 경기가 없는 날짜 중 쉬는 날로 확정된 것(스케줄 final)은
+#    done, 아직 확정 전이거나 스케줄 수집에 실패한 날짜는 empty에 남겨 다음 실행 때 다시 본다
+#    (negative 백오프 중이면 요청 없이 바로 넘어감)
+#    --final-after-days일 넘게 지난 경기인데 수집해도 런타임이 없으면(취소/서스펜디드) 더 기다리지 않고
+#    incomplete(누락 포함 완료)로 끝낸다 → 다시 실행해도 건너뜀(--retry-incomplete로 다시)
+#  - 진행 상황과 처리량(games/min, 이번 실행에서 실제로 받아 온 경기만)을 체크포인트마다 출력
+import os, sys, time, argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+# 주기 작업(야간 보충/프리페치)은 서버 몫 → 스케줄러 없이 import한 뒤 크롤링만 켠다
+os.environ["USE_CACHE_ONLY"] = "1"
+import hour_back as hb
+from hour_store import atomic_json_save
+
+def _parse_date(s):
+    return datetime.strptime(s.replace("-", ""), "%Y%m%d")
+
+def load_checkpoint(path, start, end):
+    """같은 구간의 체크포인트면 이어서, 없거나 다른 구간이면 새로"""
+    cp = hb._safe_json_load(path, None)
+    if not isinstance(cp, dict) or cp.get("start") != start or cp.get("end") != end:
+        return {"start": start, "end": end, "done": [], "failed": {}, "incomplete": {}, "empty": [], "games": {},
+                "elapsed_sec": 0.0}
+    return cp
+
+def backfill_date(date_str, force=False):
+    """날짜 1개: (경기 수, 런타임을 못 받은 경기 키 목록, 캐시가 아니라 새로 받아 온 런타임 수)"""
+    games = hb.get_games_for_date(None, date_str, force=force)
+    missing, fetched = [], 0
+    for g in games:
+        key = hb.make_runtime_key(g["g_id"], g["g_dt"])
+        cached = hb._is_fresh("rt", key)
+        if hb.open_review_and_get_runtime(None, g["g_id"], g["g_dt"]) is None:
+            missing.append(key)
+        elif not cached:
+            fetched += 1
+    return len(games), missing, fetched
+
+def _gave_up(keys):
+    """못 받은 경기가 전부 실제로 수집을 시도했다가 실패한 것인지(negative 기록이 있는지)"""
+    return all(st == "negative" and n >= 1 for st, _, n in (hb._entry_state("rt", k) for k in keys))
+
+def games_per_minute(games, t0):
+    minutes = (time.time() - t0) / 60
+    return games / minutes if minutes > 0 else 0.0
+
+def run(start, end, checkpoint, workers=4, batch=50, checkpoint_every=10, force=False,
+        final_after_days=2, retry_incomplete=False, log=print):
+    """[start, end] 구간을 수집. 체크포인트 dict 반환"""
+    cp = load_checkpoint(checkpoint, start, end)
+    incomplete = cp.setdefault("incomplete", {})
+    if retry_incomplete:
+        incomplete.clear()
+    done, empty = set(cp["done"]), set(cp.get("empty", ()))
+    dates = [d for d in hb._days_between(_parse_date(start), _parse_date(end)) if d not in done and d not in incomplete]
+    total = len(done) + len(incomplete) + len(dates)
+    log(f"backfill {start}~{end}: {len(dates)} dates to go ({len(done) + len(incomplete)} already done), "
+        f"workers={workers}")
+    # 이 날짜 이전 경기는 런타임이 나올 때가 지났다 → 수집해도 없으면 누락으로 확정
+    settled = (datetime.today() - timedelta(days=final_after_days)).strftime("%Y%m%d")
+
+    t0, base_elapsed = time.time(), cp["elapsed_sec"]
+    finished = {}   # 처리는 끝났지만 아직 체크포인트에 안 넣은 날짜 → backfill_date 결과
+    fetched = [0]   # 이번 실행에서 새로 받아 온 런타임 수(처리량 계산용, 캐시 히트 제외)
+
+    def save():
+        # 묶음 쓰기를 먼저 기록해야 체크포인트의 done이 항상 캐시보다 뒤에 있다(negative 상태도 이때 보임)
+        wb.flush()
+        for d, (n, missing, n_fetched) in finished.items():
+            cp["games"][d] = n   # 날짜별 경기 수(다시 처리한 날짜는 덮어씀)
+            fetched[0] += n_fetched
+            cp["failed"].pop(d, None); empty.discard(d)
+            if missing and d <= settled and _gave_up(missing):
+                incomplete[d] = len(missing)
+            elif missing:
+                cp["failed"][d] = len(missing)
+            elif not n and hb._entry_state("sc", d)[0] != "final":
+                empty.add(d)
+            else:
+                done.add(d)
+        finished.clear()
+        cp["done"], cp["empty"] = sorted(done), sorted(empty)
+        cp["elapsed_sec"] = round(base_elapsed + time.time() - t0, 1)
+        cp["updated_at"] = int(time.time())
+        atomic_json_save(checkpoint, cp, indent=None)
+        log(f"  {len(done) + len(incomplete)}/{total} dates, {sum(cp['games'].values())} games, "
+            f"{len(incomplete)} with permanently missing runtimes, {len(cp['failed'])} to retry, {len(empty)} empty, "
+            f"{games_per_minute(fetched[0], t0):.1f} games/min")
+
+    with hb.batched_writes(batch) as wb, ThreadPoolExecutor(max(1, workers), thread_name_prefix="backfill") as ex:
+        futures = {ex.submit(backfill_date, d, force): d for d in dates}
+        try:
+            for fut in as_completed(futures):
+                d = futures[fut]
+                try:
+                    finished[d] = fut.result()
+                except Exception as e:
+                    log(f"  {d}: {type(e).__name__}: {e}")
+                    finished[d] = (0, [d], 0)   # 날짜 통째로 실패 → failed에 남겨 다음에 다시
+                if len(finished) >= checkpoint_every:
+                    save()
+        except KeyboardInterrupt:
+            for f in futures:
+                f.cancel()
+            log("interrupted: saving checkpoint (run the same command again to resume)")
+            raise
+        finally:
+            save()
+    cp["run_fetched"], cp["run_sec"] = fetched[0], round(time.time() - t0, 1)
+    return cp
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="기간 스케줄/런타임 일괄 수집(중단 후 이어서 가능)")
+    ap.add_argument("start", help="시작 날짜 YYYYMMDD")
+    ap.add_argument("end", help="끝 날짜 YYYYMMDD(포함)")
+    ap.add_argument("--workers", type=int, default=4, help="동시에 처리할 날짜 수")
+    ap.add_argument("--batch", type=int, default=50, help="저널에 한 번에 기록할 레코드 수")
+    ap.add_argument("--checkpoint", help="체크포인트 파일(기본: CACHE_DIR/backfill_<start>_<end>.json)")
+    ap.add_argument("--checkpoint-every", type=int, default=10, help="이 날짜 수마다 기록 + 체크포인트 저장")
+    ap.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 처음부터")
+    ap.add_argument("--force", action="store_true", help="캐시에 있는 스케줄도 다시 받기")
+    ap.add_argument("--final-after-days", type=int, default=2,
+                    help="이 일수보다 지난 경기는 수집해도 런타임이 없으면 누락으로 확정(incomplete)")
+    ap.add_argument("--retry-incomplete", action="store_true", help="누락으로 확정한 날짜도 다시 수집")
+    ap.add_argument("--base-url", help="GameCenter 주소(로컬 fixture 서버 등). 주면 HTTP 전용 크롤러 사용")
+    ap.add_argument("--min-interval", type=float, help="같은 호스트 요청 간 최소 간격(초)")
+    args = ap.parse_args(argv)
+
+    start, end = (_parse_date(x).strftime("%Y%m%d") for x in (args.start, args.end))
+    if start > end:
+        ap.error("start must be <= end")
+    checkpoint = args.checkpoint or os.path.join(hb.CACHE_DIR, f"backfill_{start}_{end}.json")
+    if args.restart and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    if args.base_url or args.min_interval is not None:
+        from hour_crawler import Crawler, KBO_BASE_URL, CRAWL_MIN_INTERVAL, CRAWL_SELENIUM
+        hb._CRAWLER = Crawler(base_url=args.base_url or KBO_BASE_URL, workers=args.workers,
+                              min_interval=CRAWL_MIN_INTERVAL if args.min_interval is None else args.min_interval,
+                              use_selenium=CRAWL_SELENIUM and not args.base_url)
+    hb.USE_CACHE_ONLY = False
+
+    try:
+        cp = run(start, end, checkpoint, args.workers, args.batch, args.checkpoint_every, args.force,
+                 args.final_after_days, args.retry_incomplete)
+    except KeyboardInterrupt:
+        return 130
+    hb.PERSIST.join()   # 백그라운드 압축이 걸려 있으면 끝날 때까지
+    print(f"done: {len(cp['done'])} dates + {len(cp['incomplete'])} with permanently missing runtimes "
+          f"({len(cp['failed'])} to retry, {len(cp['empty'])} empty), {sum(cp['games'].values())} games; "
+          f"this run fetched {cp['run_fetched']} runtimes in {cp['run_sec']}s "
+          f"({cp['run_fetched'] / max(cp['run_sec'], 0.1) * 60:.1f} games/min), checkpoint {checkpoint}")
+    return 1 if cp["failed"] or not (cp["done"] or cp["incomplete"]) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
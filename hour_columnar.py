@@ -0,0 +1,232 @@
+#hour_columnar.py
+# 런타임/스케줄 캐시의 컬럼형 바이너리 포맷(.hrc) + JSON 변환기
+#
+#   python hour_columnar.py pack   --runtime runtime_cache.json --schedule schedule_index.json -o cache.hrc
+#   python hour_columnar.py unpack cache.hrc --out-dir data/seed/
+#
+# JSON은 경기마다 "home"/"away"/"g_id"/"g_dt" 문자열과 "{g_id}_{g_dt}" 키,
+# {"runtime_min": N} 래퍼가 반복된다. .hrc는 같은 내용을 배열 컬럼으로 저장한다.
+#   - 팀 이름: 헤더의 팀 테이블 인덱스(uint8)
+#   - 날짜: YYYYMMDD 정수(uint32)
+#   - 경기 ID: 고정 폭 ASCII(헤더의 gid_width)
+#   - 런타임: uint16(분)
+# 파일 구조(리틀 엔디언):
+#   MAGIC(8) | 헤더 길이(uint32) | 헤더 JSON | 8바이트 정렬된 컬럼들
+# 헤더의 sections에 컬럼별 (오프셋, 바이트 수)를 적어 두고, 읽을 때는 mmap 위의
+# memoryview.cast로 컬럼을 바로 훑어 JSON 파싱 없이 빠르게 디코드한다.
+# 디코드 결과는 워커마다 dict로 만들고 mmap은 닫는다 → 로드 뒤에 공유되는 것은 없고
+# 워커당 RSS는 JSON 로드와 같다(빨라지는 것은 디코드 시간뿐).
+# 규칙에 안 맞는 항목(키 형식이 다르거나 필드가 더 있는 경기 등)은 헤더의 raw_*에 JSON 그대로 둔다.
+import os, sys, json, mmap, struct, argparse, threading
+from array import array
+
+MAGIC = b"HRCOL1\0\0"
+_NO_TEAM = 255     # 팀 없음(None)
+_MAX_TEAMS = 255
+
+def _align(n, k=8):
+    return (n + k - 1) // k * k
+
+def _date_int(s):
+    return int(s) if isinstance(s, str) and len(s) == 8 and s.isdigit() else None
+
+def _split_runtime_key(key):
+    """'{g_id}_{g_dt}' → (g_id, g_dt 정수). 형식이 아니면 None"""
+    gid, sep, gdt = key.rpartition("_")
+    d = _date_int(gdt)
+    if not sep or d is None or not gid or not gid.isascii():
+        return None
+    return gid, d
+
+def _plain_game(g):
+    return (isinstance(g, dict) and set(g) == {"home", "away", "g_id", "g_dt"}
+            and isinstance(g["g_id"], str) and g["g_id"].isascii() and _date_int(g["g_dt"]) is not None
+            and all(isinstance(g[k], (str, type(None))) for k in ("home", "away")))
+
+def encode(runtime, schedule):
+    """(런타임 dict, 스케줄 dict) → .hrc 바이트"""
+    teams, team_ix = [], {}
+    def team_id(name):
+        if name is None:
+            return _NO_TEAM
+        if name not in team_ix:
+            if len(teams) >= _MAX_TEAMS:
+                raise ValueError("too many distinct team names for uint8 ids")
+            team_ix[name] = len(teams); teams.append(name)
+        return team_ix[name]
+
+    raw_schedule, raw_runtime = {}, {}
+    sc_date, sc_start = array("I"), array("I", [0])
+    g_home, g_away, g_dt, g_ids = array("B"), array("B"), array("I"), []
+    for d in sorted(schedule):
+        games = schedule[d]
+        di = _date_int(d)
+        if di is None or not isinstance(games, list) or not all(_plain_game(g) for g in games):
+            raw_schedule[d] = games
+            continue
+        sc_date.append(di)
+        for g in games:
+            g_home.append(team_id(g["home"])); g_away.append(team_id(g["away"]))
+            g_dt.append(int(g["g_dt"])); g_ids.append(g["g_id"])
+        sc_start.append(len(g_ids))
+
+    rt_dt, rt_min, rt_ids = array("I"), array("H"), []
+    for k in sorted(runtime):
+        v = runtime[k]
+        parts = _split_runtime_key(k)
+        m = v.get("runtime_min") if isinstance(v, dict) and set(v) == {"runtime_min"} else None
+        if parts is None or not isinstance(m, int) or not 0 <= m <= 0xFFFF:
+            raw_runtime[k] = v
+            continue
+        rt_ids.append(parts[0]); rt_dt.append(parts[1]); rt_min.append(m)
+
+    width = max((len(x) for x in g_ids + rt_ids), default=0)
+    columns = [
+        ("sc_date", sc_date), ("sc_start", sc_start),
+        ("g_home", g_home), ("g_away", g_away), ("g_dt", g_dt),
+        ("g_id", b"".join(x.encode("ascii").ljust(width, b"\0") for x in g_ids)),
+        ("rt_dt", rt_dt), ("rt_min", rt_min),
+        ("rt_id", b"".join(x.encode("ascii").ljust(width, b"\0") for x in rt_ids)),
+    ]
+    blobs = [(name, _le_bytes(col) if isinstance(col, array) else col) for name, col in columns]
+
+    header = {"version": 1, "teams": teams, "gid_width": width,
+              "dates": len(sc_date), "games": len(g_ids), "runtimes": len(rt_ids),
+              "raw_schedule": raw_schedule, "raw_runtime": raw_runtime, "sections": {}}
+    # 헤더 길이가 오프셋에 영향을 주므로 길이가 안정될 때까지 2~3번 계산
+    hlen = 0
+    while True:
+        pos = _align(len(MAGIC) + 4 + hlen)
+        for name, blob in blobs:
+            header["sections"][name] = [pos, len(blob)]
+            pos = _align(pos + len(blob))
+        hbytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if len(hbytes) == hlen:
+            break
+        hlen = len(hbytes)
+
+    out = bytearray(MAGIC + struct.pack("<I", hlen) + hbytes)
+    for name, blob in blobs:
+        out.extend(b"\0" * (header["sections"][name][0] - len(out)))
+        out.extend(blob)
+    return bytes(out)
+
+def _le_bytes(col):
+    if sys.byteorder != "little":
+        col = array(col.typecode, col); col.byteswap()
+    return col.tobytes()
+
+def save(path, runtime, schedule):
+    """tmp에 쓰고 fsync 후 rename (atomic_json_save와 같은 방식)"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(encode(runtime, schedule))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class ColumnarCache:
+    """mmap으로 연 .hrc 파일. 컬럼은 memoryview로 바로 읽는다(파일 전체를 복사하지 않음)."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        buf = memoryview(self._mm)
+        if bytes(buf[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"not a columnar cache file: {path}")
+        (hlen,) = struct.unpack_from("<I", buf, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(bytes(buf[start:start + hlen]))
+        self.teams = self.header["teams"]
+        self.gid_width = self.header["gid_width"]
+        self._buf = buf
+
+    def _col(self, name, typecode=None):
+        off, n = self.header["sections"][name]
+        view = self._buf[off:off + n]
+        if typecode is None:
+            return view
+        if sys.byteorder != "little":
+            a = array(typecode, bytes(view)); a.byteswap()
+            return a
+        return view.cast(typecode)
+
+    def _ids(self, name):
+        w = self.gid_width
+        if not w:
+            return []
+        text = str(self._col(name), "ascii")   # 한 번에 디코드 후 고정 폭으로 자름
+        ids = [text[i:i + w] for i in range(0, len(text), w)]
+        return [x.rstrip("\0") for x in ids] if "\0" in text else ids
+
+    def runtime_dict(self):
+        """기존 runtime_cache.json과 같은 형태의 dict"""
+        keys = map("{}_{}".format, self._ids("rt_id"), self._col("rt_dt", "I"))
+        out = {k: {"runtime_min": m} for k, m in zip(keys, self._col("rt_min", "H"))}
+        out.update(self.header["raw_runtime"])
+        return out
+
+    def schedule_dict(self):
+        """기존 schedule_index.json과 같은 형태의 dict"""
+        team = self.teams + [None] * (256 - len(self.teams))   # _NO_TEAM(255) → None
+        gdt = self._col("g_dt", "I")
+        day = {d: str(d) for d in set(gdt)}                     # 날짜 문자열은 하루에 1개만 생성
+        games = [{"home": team[h], "away": team[a], "g_id": gid, "g_dt": day[dt]}
+                 for h, a, gid, dt in zip(self._col("g_home", "B"), self._col("g_away", "B"),
+                                          self._ids("g_id"), gdt)]
+        start = self._col("sc_start", "I")
+        out = {day.get(d) or str(d): games[start[j]:start[j + 1]] for j, d in enumerate(self._col("sc_date", "I"))}
+        out.update(self.header["raw_schedule"])
+        return dict(sorted(out.items()))
+
+    def close(self):
+        self._buf.release()
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def load(path):
+    """.hrc → (런타임 dict, 스케줄 dict)"""
+    with ColumnarCache(path) as c:
+        return c.runtime_dict(), c.schedule_dict()
+
+def _load_json(path):
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="런타임/스케줄 캐시 JSON ↔ .hrc 변환")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("pack", help="JSON 두 파일 → .hrc")
+    p.add_argument("--runtime", help="runtime_cache.json")
+    p.add_argument("--schedule", help="schedule_index.json")
+    p.add_argument("-o", "--output", required=True)
+    u = sub.add_parser("unpack", help=".hrc → runtime_cache.json + schedule_index.json")
+    u.add_argument("input")
+    u.add_argument("--out-dir", default=".")
+    u.add_argument("--indent", type=int, default=2)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "pack":
+        runtime, schedule = _load_json(args.runtime), _load_json(args.schedule)
+        save(args.output, runtime, schedule)
+        print(f"{args.output}: {len(runtime)} runtimes, {len(schedule)} dates, {os.path.getsize(args.output)} bytes")
+    else:
+        runtime, schedule = load(args.input)
+        os.makedirs(args.out_dir, exist_ok=True)
+        for name, obj in (("runtime_cache.json", runtime), ("schedule_index.json", schedule)):
+            with open(os.path.join(args.out_dir, name), "w", encoding="utf-8") as f:
+                json.dump(obj, f, ensure_ascii=False, indent=args.indent)
+        print(f"{args.out_dir}: {len(runtime)} runtimes, {len(schedule)} dates")
+
+if __name__ == "__main__":
+    main()
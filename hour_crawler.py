@@ -0,0 +1,355 @@
+#hour_crawler.py
+# KBO GameCenter 크롤러
+#  - requests 빠른 경로(Session 재사용): JS 없이 읽히는 페이지는 Chrome 없이 처리
+#  - 재사용 드라이버 풀: Chrome을 요청마다 띄우지 않고 최대 DRIVER_POOL_SIZE개를 돌려 씀
+#  - 호스트별 속도 제한 + 스레드 풀 동시 수집
+#  - KBO_BASE_URL로 로컬 fixture 서버(hour_fixture_server.py)에 붙여 오프라인 테스트 가능
+import os, re, time, threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+
+from hour_metrics import METRICS
+
+# selenium은 Chrome 경로를 실제로 탈 때만 import (HTTP 빠른 경로/fixture 서버만 쓰면 로드 안 됨)
+def _selenium():
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    return webdriver, By, WebDriverWait, EC
+
+# ====== 설정 ======
+KBO_BASE_URL       = os.environ.get("KBO_BASE_URL", "https://www.koreabaseball.com").rstrip("/")
+CRAWL_WORKERS      = int(os.environ.get("CRAWL_WORKERS", "4"))        # 동시 수집 스레드 수
+DRIVER_POOL_SIZE   = int(os.environ.get("DRIVER_POOL_SIZE", "2"))     # 띄워 둘 Chrome 최대 개수
+CRAWL_MIN_INTERVAL = float(os.environ.get("CRAWL_MIN_INTERVAL", "0.2"))  # 같은 호스트 요청 간 최소 간격(초)
+CRAWL_WAIT_SEC     = float(os.environ.get("CRAWL_WAIT_SEC", "8"))     # Selenium 요소 대기 한도(초)
+CRAWL_HTTP         = os.environ.get("CRAWL_HTTP", "1") == "1"         # requests 빠른 경로 사용
+CRAWL_SELENIUM     = os.environ.get("CRAWL_SELENIUM", "1") == "1"     # 0이면 Chrome 없이 HTTP만(fixture 서버용)
+HTTP_TIMEOUT_SEC   = float(os.environ.get("HTTP_TIMEOUT_SEC", "10"))
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36"
+
+def schedule_url(date_str, base=KBO_BASE_URL):
+    return f"{base}/Schedule/GameCenter/Main.aspx?gameDate={date_str}"
+
+def review_url(game_id, game_date, base=KBO_BASE_URL):
+    return f"{base}/Schedule/GameCenter/Main.aspx?gameId={game_id}&gameDate={game_date}"
+
+def make_driver():
+    from selenium.webdriver.chrome.options import Options
+    webdriver = _selenium()[0]
+    options = Options()
+    options.binary_location = os.environ.get("CHROME_BIN", "/usr/bin/google-chrome")
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1280,1200")
+    options.add_argument("--lang=ko-KR")
+    options.add_argument(f"--user-agent={USER_AGENT}")
+    options.page_load_strategy = "eager"
+    return webdriver.Chrome(options=options)
+
+# ====== 파싱 ======
+def _extract_match_info_from_card(li):
+    home_nm = li.get("home_nm"); away_nm = li.get("away_nm")
+    g_id = li.get("g_id"); g_dt = li.get("g_dt")
+
+    if not (home_nm and away_nm):
+        home_alt = li.select_one(".team.home .emb img")
+        away_alt = li.select_one(".team.away .emb img")
+        if away_alt and not away_nm: away_nm = (away_alt.get("alt") or "").strip() or None
+        if home_alt and not home_nm: home_nm = (home_alt.get("alt") or "").strip() or None
+
+    if not (g_id and g_dt):
+        a = li.select_one("a[href*='GameCenter/Main.aspx'][href*='gameId='][href*='gameDate=']")
+        if a and a.has_attr("href"):
+            href = a["href"]
+            gm = re.search(r"gameId=([A-Z0-9]+)", href)
+            dm = re.search(r"gameDate=(\d{8})", href)
+            if gm: g_id = g_id or gm.group(1)
+            if dm: g_dt = g_dt or dm.group(1)
+
+    return {"home": home_nm, "away": away_nm, "g_id": g_id, "g_dt": g_dt}
+
+@METRICS.timed("hour_crawl_stage_seconds", stage="parse", page="schedule_html")
+def parse_schedule_cards(html):
+    """경기 카드(li.game-cont) 목록. 카드가 하나도 없으면 빈 리스트."""
+    soup = BeautifulSoup(html, "html.parser")
+    cards = soup.select("li.game-cont") or soup.select("li[class*='game-cont']")
+    out = []
+    for li in cards:
+        info = _extract_match_info_from_card(li)
+        if all([info.get("home"), info.get("away"), info.get("g_id"), info.get("g_dt")]):
+            out.append(info)
+    return out
+
+@METRICS.timed("hour_crawl_stage_seconds", stage="parse", page="schedule_json")
+def parse_schedule_json(data):
+    """GetKboGameList 응답 → 경기 목록. 형식이 다르면 None."""
+    games = data.get("game") if isinstance(data, dict) else None
+    if not isinstance(games, list):
+        return None
+    out = []
+    for g in games:
+        info = {"home": g.get("HOME_NM"), "away": g.get("AWAY_NM"),
+                "g_id": g.get("G_ID"), "g_dt": g.get("G_DT")}
+        if all(info.values()):
+            out.append(info)
+    return out
+
+@METRICS.timed("hour_crawl_stage_seconds", stage="parse", page="review_html")
+def parse_runtime_html(html):
+    """리뷰 탭의 경기시간(span#txtRunTime, 'H:MM') → 분. 없으면 None."""
+    box = BeautifulSoup(html, "html.parser").select_one("div.record-etc")
+    span = box.select_one("span#txtRunTime") if box else None
+    if not span:
+        return None
+    m = re.search(r"(\d{1,2})\s*[:：]\s*(\d{2})", span.get_text(strip=True))
+    if not m:
+        return None
+    return int(m.group(1)) * 60 + int(m.group(2))
+
+# ====== 호스트별 속도 제한 ======
+class HostRateLimiter:
+    """같은 호스트로 나가는 요청 사이에 최소 간격을 둔다(스레드 안전)"""
+
+    def __init__(self, min_interval=CRAWL_MIN_INTERVAL):
+        self.min_interval = min_interval
+        self._next = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self._next.get(host, 0.0))
+            self._next[host] = at + self.min_interval
+        if at > now:
+            time.sleep(at - now)
+
+# ====== 드라이버 풀 ======
+class DriverPool:
+    """최대 size개의 Chrome을 띄워 두고 빌려 쓰는 풀. 예외가 난 드라이버는 버린다."""
+
+    def __init__(self, size=DRIVER_POOL_SIZE, factory=make_driver):
+        self.factory = factory
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def driver(self):
+        self._slots.acquire()
+        try:
+            with self._lock:
+                d = self._idle.pop() if self._idle else None
+            if d is None:
+                with METRICS.timer("hour_crawl_stage_seconds", stage="driver_start"):
+                    d = self.factory()
+            try:
+                yield d
+            except Exception:
+                _quit(d); d = None
+                raise
+            finally:
+                if d is not None:
+                    with self._lock:
+                        self._idle.append(d)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for d in idle:
+            _quit(d)
+
+def _quit(driver):
+    try: driver.quit()
+    except Exception: pass
+
+# ====== 크롤러 ======
+def _count(kind, path, result):
+    outcome = "fail" if result is None else ("empty" if result == [] else "ok")
+    METRICS.inc("hour_crawl_total", kind=kind, path=path, result=outcome)
+
+class Crawler:
+    def __init__(self, base_url=KBO_BASE_URL, workers=CRAWL_WORKERS, pool_size=DRIVER_POOL_SIZE,
+                 min_interval=CRAWL_MIN_INTERVAL, use_http=CRAWL_HTTP, use_selenium=CRAWL_SELENIUM,
+                 driver_factory=make_driver):
+        self.base_url = base_url.rstrip("/")
+        self.workers = max(1, workers)
+        self.use_http = use_http
+        self.use_selenium = use_selenium
+        self.limiter = HostRateLimiter(min_interval)
+        self.pool = DriverPool(pool_size, driver_factory)
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # 빠른 경로별 학습 상태: None=미정, True=동작함, False=JS 필요로 보고 건너뜀
+        self._http_ok = {}
+        self._http_miss = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    # --- 동시 실행 ---
+    def map(self, fn, items):
+        """fn을 items에 동시 적용(입력 순서대로 결과). 항목 1개면 현재 스레드에서 실행."""
+        items = list(items)
+        if len(items) <= 1 or self.workers == 1:
+            return [fn(x) for x in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="crawl")
+        return list(self._executor.map(fn, items))
+
+    # --- requests 빠른 경로 ---
+    def _http_enabled(self, kind):
+        return self.use_http and self._http_ok.get(kind) is not False
+
+    def _http_result(self, kind, ok):
+        if ok:
+            self._http_ok[kind] = True
+        elif self._http_ok.get(kind) is None:
+            self._http_miss[kind] = self._http_miss.get(kind, 0) + 1
+            if self._http_miss[kind] >= 3:
+                self._http_ok[kind] = False
+
+    def _http(self, method, url, **kw):
+        self.limiter.wait(url)
+        try:
+            with METRICS.timer("hour_crawl_stage_seconds", stage="page_load", path="http"):
+                r = self.session.request(method, url, timeout=HTTP_TIMEOUT_SEC, **kw)
+        except requests.RequestException:
+            return None
+        return r if r.ok else None
+
+    def _http_schedule(self, date_str):
+        if self._http_enabled("schedule_json"):
+            r = self._http("POST", f"{self.base_url}/ws/Main.asmx/GetKboGameList",
+                           data={"leId": "1", "srId": "0,1,3,4,5,7,9", "date": date_str})
+            try:
+                games = parse_schedule_json(r.json()) if r is not None else None
+            except ValueError:
+                games = None
+            self._http_result("schedule_json", games is not None)
+            if games is not None:
+                return games
+        if self._http_enabled("schedule_html"):
+            r = self._http("GET", schedule_url(date_str, self.base_url))
+            if r is not None:
+                games = parse_schedule_cards(r.text)
+                # 카드가 없으면 '경기 없는 날'인지 'JS가 채우는 페이지'인지 구분 불가
+                # → 이 경로가 이미 동작한 적 있거나 Selenium을 안 쓸 때만 빈 목록을 믿는다
+                if games or self._http_ok.get("schedule_html") or not self.use_selenium:
+                    if games:
+                        self._http_result("schedule_html", True)
+                    return games
+            self._http_result("schedule_html", False)
+        return None
+
+    def _http_runtime(self, game_id, game_date):
+        if not self._http_enabled("review_html"):
+            return None
+        r = self._http("GET", review_url(game_id, game_date, self.base_url) + "&section=REVIEW")
+        rt = parse_runtime_html(r.text) if r is not None else None
+        self._http_result("review_html", rt is not None)
+        return rt
+
+    # --- Selenium 경로 ---
+    @contextmanager
+    def _driver(self, driver=None):
+        if driver is not None:
+            yield driver
+        else:
+            with self.pool.driver() as d:
+                yield d
+
+    def _load(self, driver, url):
+        self.limiter.wait(url)
+        with METRICS.timer("hour_crawl_stage_seconds", stage="page_load", path="selenium"):
+            driver.get(url)
+
+    def _selenium_schedule(self, driver, date_str):
+        _, By, WebDriverWait, EC = _selenium()
+        wait = WebDriverWait(driver, CRAWL_WAIT_SEC)
+        url = schedule_url(date_str, self.base_url)
+        self._load(driver, url)
+        try:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div#contents")))
+        except Exception:
+            return None
+        try:   # 경기 카드는 비동기로 채워짐(경기 없는 날은 끝까지 안 나옴)
+            WebDriverWait(driver, min(2.0, CRAWL_WAIT_SEC)).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "li.game-cont, li[class*='game-cont']")))
+        except Exception:
+            pass
+        return parse_schedule_cards(driver.page_source)
+
+    def _selenium_runtime(self, driver, game_id, game_date):
+        _, By, WebDriverWait, EC = _selenium()
+        wait = WebDriverWait(driver, CRAWL_WAIT_SEC)
+        base = review_url(game_id, game_date, self.base_url)
+        self._load(driver, base)
+        try:
+            tab = wait.until(EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), '리뷰')]")))
+            tab.click()
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.record-etc")))
+        except Exception:
+            self._load(driver, base + "&section=REVIEW")
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div.record-etc")))
+            except Exception:
+                pass
+        try:   # 고정 sleep 대신 경기시간 텍스트가 채워질 때까지만 대기
+            WebDriverWait(driver, min(2.0, CRAWL_WAIT_SEC)).until(
+                lambda d: d.find_element(By.CSS_SELECTOR, "span#txtRunTime").text.strip())
+        except Exception:
+            pass
+        return parse_runtime_html(driver.page_source)
+
+    # --- 공개 API ---
+    def fetch_schedule(self, date_str, driver=None):
+        """날짜의 경기 목록. 페이지를 못 읽었으면 None."""
+        games = self._http_schedule(date_str)
+        if games is not None or not self.use_selenium:
+            _count("schedule", "http", games)
+            return games
+        try:
+            with self._driver(driver) as d:
+                games = self._selenium_schedule(d, date_str)
+        except Exception:
+            games = None
+        _count("schedule", "selenium", games)
+        return games
+
+    def fetch_runtime(self, game_id, game_date, driver=None):
+        """경기 소요시간(분). 못 찾으면 None."""
+        rt = self._http_runtime(game_id, game_date)
+        if rt is not None or not self.use_selenium:
+            _count("runtime", "http", rt)
+            return rt
+        try:
+            with self._driver(driver) as d:
+                rt = self._selenium_runtime(d, game_id, game_date)
+        except Exception:
+            rt = None
+        _count("runtime", "selenium", rt)
+        return rt
+
+    def close(self):
+        with self._lock:
+            ex, self._executor = self._executor, None
+        if ex is not None:
+            ex.shutdown(wait=True)
+        self.pool.close()
+        self.session.close()
@@ -0,0 +1,113 @@
+#hour_fixture_server.py
+# 로컬 GameCenter fixture 서버 (크롤러 오프라인 테스트용)
+#
+#   python hour_fixture_server.py --root fixtures/ --port 8765
+#   KBO_BASE_URL=http://127.0.0.1:8765 USE_CACHE_ONLY=0 CRAWL_SELENIUM=0 python hour_back.py
+#
+# /Schedule/GameCenter/Main.aspx?gameDate=YYYYMMDD          → <root>/schedule/YYYYMMDD.html
+# /Schedule/GameCenter/Main.aspx?gameId=..&gameDate=..      → <root>/review/<gameId>.html
+# 저장된 HTML이 없으면 --seed-dir의 schedule_index.json / runtime_cache.json으로
+# KBO 마크업(li.game-cont, span#txtRunTime)을 흉내 낸 페이지를 만들어 준다.
+import os, json, argparse, threading
+from html import escape
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def render_schedule_html(games):
+    cards = "\n".join(
+        f'<li class="game-cont" g_id="{escape(g["g_id"])}" g_dt="{escape(g["g_dt"])}" '
+        f'home_nm="{escape(g["home"])}" away_nm="{escape(g["away"])}">'
+        f'<a href="/Schedule/GameCenter/Main.aspx?gameId={escape(g["g_id"])}&amp;gameDate={escape(g["g_dt"])}">'
+        f'{escape(g["away"])} vs {escape(g["home"])}</a></li>'
+        for g in games
+    )
+    return f'<html><body><div id="contents"><ul class="game-list-n">{cards}</ul></div></body></html>'
+
+def render_review_html(runtime_min):
+    h, m = divmod(int(runtime_min), 60)
+    return ('<html><body><div id="contents"><a href="#">리뷰</a>'
+            f'<div class="record-etc"><span id="txtRunTime">{h}:{m:02d}</span></div>'
+            '</div></body></html>')
+
+class FixtureStore:
+    def __init__(self, root=None, seed_dir=None):
+        self.root = root
+        self.schedule, self.runtime = {}, {}
+        if seed_dir:
+            for name, attr in (("schedule_index.json", "schedule"), ("runtime_cache.json", "runtime")):
+                p = os.path.join(seed_dir, name)
+                if os.path.exists(p):
+                    with open(p, "r", encoding="utf-8") as f:
+                        setattr(self, attr, json.load(f))
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def _saved(self, *parts):
+        if not self.root:
+            return None
+        p = os.path.join(self.root, *parts)
+        if os.path.exists(p):
+            with open(p, "r", encoding="utf-8") as f:
+                return f.read()
+        return None
+
+    def page(self, qs):
+        with self._lock:
+            self.hits += 1
+        game_id, game_date = qs.get("gameId", [None])[0], qs.get("gameDate", [None])[0]
+        if game_id and game_date:
+            html = self._saved("review", f"{game_id}.html")
+            if html is None:
+                hit = self.runtime.get(f"{game_id}_{game_date}")
+                html = render_review_html(hit["runtime_min"]) if hit else None
+            return html
+        if game_date:
+            html = self._saved("schedule", f"{game_date}.html")
+            if html is None:
+                html = render_schedule_html(self.schedule.get(game_date, []))
+            return html
+        return None
+
+def make_server(host="127.0.0.1", port=8765, root=None, seed_dir=None):
+    store = FixtureStore(root, seed_dir)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            u = urlsplit(self.path)
+            html = store.page(parse_qs(u.query)) if u.path.endswith("/GameCenter/Main.aspx") else None
+            if html is None:
+                self.send_error(404)
+                return
+            body = html.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer((host, port), Handler)
+    srv.store = store
+    return srv
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="KBO GameCenter fixture 서버")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--root", help="저장된 HTML 디렉터리(schedule/, review/)")
+    ap.add_argument("--seed-dir", default=os.path.join(BASE_DIR, "data", "seed"),
+                    help="저장된 HTML이 없을 때 페이지를 만들 JSON 씨드 디렉터리")
+    args = ap.parse_args(argv)
+    srv = make_server(args.host, args.port, args.root, args.seed_dir)
+    print(f"fixture server on http://{args.host}:{srv.server_address[1]}")
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#hour_jobs.py
+# 백그라운드 갱신: 요청 경로에서 크롤링을 빼내기 위한 작업 큐 + 주기 스케줄러
+#  - RefreshQueue: 키로 중복 제거되는 작업 큐. 요청은 넣기만 하고 바로 응답한다.
+#  - Scheduler: 매일 정해진 시각/일정 간격으로 도는 작업. 여러 gunicorn 워커 중
+#    CACHE_DIR의 리더 잠금을 잡은 1개 프로세스에서만 실행된다.
+import os, time, queue, threading, traceback
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:   # Windows 로컬 개발용: 항상 리더
+    fcntl = None
+
+class RefreshQueue:
+    def __init__(self, workers=1, name="refresh"):
+        self.workers = max(1, workers)
+        self.name = name
+        self._q = queue.Queue()
+        self._keys = set()        # 대기 중이거나 실행 중인 작업 키
+        self._lock = threading.Lock()
+        self._threads = []
+        self.done = 0
+        self.failed = 0
+        self.last_error = None
+
+    def submit(self, key, fn, *args):
+        """같은 키가 이미 대기/실행 중이면 넣지 않고 False"""
+        with self._lock:
+            if key in self._keys:
+                return False
+            self._keys.add(key)
+            self._ensure_started()
+        self._q.put((key, fn, args))
+        return True
+
+    def pending(self):
+        with self._lock:
+            return len(self._keys)
+
+    def busy(self):
+        return self.pending() > 0
+
+    def _ensure_started(self):
+        while len(self._threads) < self.workers:
+            t = threading.Thread(target=self._run, name=f"{self.name}-{len(self._threads)}", daemon=True)
+            self._threads.append(t)
+            t.start()
+
+    def _run(self):
+        while True:
+            key, fn, args = self._q.get()
+            try:
+                fn(*args)
+                self.done += 1
+            except Exception as e:
+                self.failed += 1
+                self.last_error = f"{key}: {type(e).__name__}: {e}"
+                traceback.print_exc()
+            finally:
+                with self._lock:
+                    self._keys.discard(key)
+                self._q.task_done()
+
+    def join(self):
+        """큐가 빌 때까지 대기(CLI/테스트용)"""
+        self._q.join()
+
+    def status(self):
+        return {"pending": self.pending(), "done": self.done, "failed": self.failed,
+                "workers": self.workers, "last_error": self.last_error}
+
+class Scheduler:
+    """주기 작업 실행기. 리더 잠금을 잡은 워커에서만 작업을 돌린다."""
+
+    def __init__(self, lock_path, tick_sec=30):
+        self.lock_path = lock_path
+        self.tick_sec = tick_sec
+        self._tasks = []          # [이름, 다음 실행 시각(epoch), 다음 시각 계산 함수, fn]
+        self._leader_fd = None
+        self._thread = None
+        self.last_runs = {}
+
+    def every(self, name, seconds, fn, first_delay=0):
+        self._tasks.append([name, time.time() + first_delay, lambda now: now + seconds, fn])
+
+    def daily(self, name, hhmm, fn):
+        h, m = (int(x) for x in hhmm.split(":"))
+        def next_at(now):
+            t = datetime.fromtimestamp(now).replace(hour=h, minute=m, second=0, microsecond=0)
+            if t.timestamp() <= now:
+                t += timedelta(days=1)
+            return t.timestamp()
+        self._tasks.append([name, next_at(time.time()), next_at, fn])
+
+    def is_leader(self):
+        if self._leader_fd is not None:
+            return True
+        if fcntl is None:
+            self._leader_fd = -1
+            return True
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._leader_fd = fd      # 프로세스가 살아 있는 동안 유지(죽으면 OS가 해제)
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def _loop(self):
+        while True:
+            if self.is_leader():
+                now = time.time()
+                for task in self._tasks:
+                    name, at, next_at, fn = task
+                    if at <= now:
+                        task[1] = next_at(now)
+                        try:
+                            fn()
+                            self.last_runs[name] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        except Exception:
+                            traceback.print_exc()
+            time.sleep(self.tick_sec)
+
+    def status(self):
+        return {
+            "leader": self._leader_fd is not None,
+            "tasks": {t[0]: datetime.fromtimestamp(t[1]).strftime("%Y-%m-%d %H:%M:%S") for t in self._tasks},
+            "last_runs": dict(self.last_runs),
+        }
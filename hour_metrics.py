@@ -0,0 +1,209 @@
+#hour_metrics.py
+# 단계별 타이머/카운터 + Prometheus 텍스트 포맷(/metrics)
+#  - 각 워커는 메모리에 누적하고, METRICS_FLUSH_SEC마다 METRICS_DIR/<pid>.json으로 내보낸다
+#  - /metrics는 디렉터리의 모든 워커 파일을 합쳐서 보여준다(gunicorn 워커 전체 합계)
+#  - 요청 스레드에서 잰 단계 시간은 Server-Timing 헤더용으로 따로 모아 둔다
+import os, json, time, tempfile, threading, functools
+from contextlib import contextmanager
+
+from hour_store import atomic_json_save
+
+# 같은 gunicorn 마스터 아래 워커끼리만 공유(재시작하면 새 디렉터리)
+METRICS_DIR       = os.environ.get("METRICS_DIR", os.path.join(tempfile.gettempdir(), f"hour-metrics-{os.getppid()}"))
+METRICS_FLUSH_SEC = float(os.environ.get("METRICS_FLUSH_SEC", "5"))
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _fmt_labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ""
+    esc = lambda v: v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+def _fmt_num(x):
+    if x == float("inf"):
+        return "+Inf"
+    return repr(float(x)) if isinstance(x, float) else str(x)
+
+class Metrics:
+    def __init__(self, metrics_dir=METRICS_DIR, flush_sec=METRICS_FLUSH_SEC, buckets=DEFAULT_BUCKETS):
+        self.dir = metrics_dir
+        self.flush_sec = flush_sec
+        self.buckets = tuple(buckets)
+        self._help = {}        # 이름 → (타입, 설명)
+        self._counters = {}    # (이름, 라벨) → 값
+        self._hists = {}       # (이름, 라벨) → [버킷별 개수..., 합, 개수]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._flusher = None
+
+    def describe(self, name, kind, help_text):
+        self._help[name] = (kind, help_text)
+
+    # --- 기록 ---
+    def inc(self, name, n=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+        self._ensure_flusher()
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _label_key(labels))
+        i = next((i for i, b in enumerate(self.buckets) if seconds <= b), len(self.buckets))
+        with self._lock:
+            h = self._hists.get(key)
+            if h is None:
+                h = self._hists[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            h[i] += 1
+            h[-2] += seconds
+            h[-1] += 1
+        self._ensure_flusher()
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """블록 실행 시간을 히스토그램에 기록. 요청 추적 중이면 Server-Timing에도 남긴다(stage 라벨 이름으로)."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            self.observe(name, dt, **labels)
+            timings = getattr(self._local, "timings", None)
+            if timings is not None:
+                stage = labels.get("stage", name)
+                timings[stage] = timings.get(stage, 0.0) + dt
+
+    def timed(self, name, **labels):
+        """함수 전체를 timer로 감싸는 데코레이터"""
+        def deco(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return deco
+
+    # --- Server-Timing ---
+    def track_request(self):
+        self._local.timings = {}
+
+    def server_timing(self, **extra):
+        """지금 요청에서 잰 단계 시간 → 'compute;dur=1.2, collect;dur=0.3' (ms)"""
+        timings = dict(getattr(self._local, "timings", None) or {})
+        timings.update(extra)
+        self._local.timings = None
+        return ", ".join(f"{k};dur={v * 1000:.1f}" for k, v in timings.items())
+
+    # --- 워커 간 합계 ---
+    def _path(self):
+        return os.path.join(self.dir, f"{os.getpid()}.json")
+
+    def _snapshot(self):
+        with self._lock:
+            return {
+                "counters": [[n, l, v] for (n, l), v in self._counters.items()],
+                "hists": [[n, l, list(h)] for (n, l), h in self._hists.items()],
+            }
+
+    def flush(self):
+        os.makedirs(self.dir, exist_ok=True)
+        atomic_json_save(self._path(), self._snapshot(), indent=None)
+
+    def _ensure_flusher(self):
+        if self._flusher is None and self.flush_sec > 0:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_sec)
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+    def collect(self):
+        """모든 워커 파일을 합친 (카운터, 히스토그램). 이 워커 값은 파일을 거치지 않고 최신으로."""
+        counters, hists = {}, {}
+        snaps = [self._snapshot()]
+        mine = os.path.basename(self._path())
+        if os.path.isdir(self.dir):
+            for fn in os.listdir(self.dir):
+                if fn.endswith(".json") and fn != mine:
+                    try:
+                        with open(os.path.join(self.dir, fn), "r", encoding="utf-8") as f:
+                            snaps.append(json.load(f))
+                    except (OSError, ValueError):
+                        continue
+        for snap in snaps:
+            for n, l, v in snap.get("counters", []):
+                key = (n, tuple(map(tuple, l)))
+                counters[key] = counters.get(key, 0) + v
+            for n, l, h in snap.get("hists", []):
+                key = (n, tuple(map(tuple, l)))
+                acc = hists.get(key)
+                if acc is None or len(acc) != len(h):
+                    hists[key] = list(h)
+                else:
+                    hists[key] = [a + b for a, b in zip(acc, h)]
+        return counters, hists
+
+    def render(self, gauges=None):
+        """Prometheus 텍스트 포맷. gauges: {이름: [(라벨 dict, 값)]} (스크레이프 시점에 계산한 값)"""
+        counters, hists = self.collect()
+        lines, seen = [], set()
+        def head(name, kind):
+            if name not in seen:
+                seen.add(name)
+                help_text = self._help.get(name, (kind, name))[1]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+        for (n, l), v in sorted(counters.items()):
+            head(n, "counter")
+            lines.append(f"{n}{_fmt_labels(l)} {_fmt_num(v)}")
+        for (n, l), h in sorted(hists.items()):
+            head(n, "histogram")
+            acc = 0
+            for b, c in zip(self.buckets + (float("inf"),), h[:-2]):
+                acc += c
+                lines.append(f"{n}_bucket{_fmt_labels(l, [('le', _fmt_num(float(b)))])} {acc}")
+            lines.append(f"{n}_sum{_fmt_labels(l)} {_fmt_num(float(h[-2]))}")
+            lines.append(f"{n}_count{_fmt_labels(l)} {h[-1]}")
+        for n, samples in sorted((gauges or {}).items()):
+            head(n, "gauge")
+            for labels, v in samples:
+                lines.append(f"{n}{_fmt_labels(_label_key(labels))} {_fmt_num(v)}")
+        return "\n".join(lines) + "\n"
+
+    def ratio(self, name, hit="hit", miss="miss", label="result"):
+        """hit/miss 카운터(합계) → 적중률 게이지 샘플"""
+        counters, _ = self.collect()
+        by = {}
+        for (n, l), v in counters.items():
+            if n != name:
+                continue
+            d = dict(l)
+            res = d.pop(label, None)
+            slot = by.setdefault(_label_key(d), [0, 0])
+            if res == hit:
+                slot[0] += v
+            elif res == miss:
+                slot[1] += v
+        return [(dict(k), h / (h + m)) for k, (h, m) in sorted(by.items()) if h + m]
+
+METRICS = Metrics()
+
+METRICS.describe("hour_stage_seconds", "histogram", "Time spent per request stage")
+METRICS.describe("hour_crawl_stage_seconds", "histogram", "Crawler time per stage (driver start, page load, parse)")
+METRICS.describe("hour_crawl_total", "counter", "Crawl attempts by page kind, path and result")
+METRICS.describe("hour_cache_lookups_total", "counter", "Runtime/schedule cache lookups by result")
+METRICS.describe("hour_save_seconds", "histogram", "Snapshot/meta save duration")
+METRICS.describe("hour_http_request_seconds", "histogram", "HTTP request latency by endpoint")
+METRICS.describe("hour_response_cache_total", "counter", "/hour rendered-response cache lookups")
+METRICS.describe("hour_published_total", "counter", "/hour requests answered from pre-rendered pages (or found them stale)")
@@ -0,0 +1,104 @@
+#hour_partition.py
+# 시즌(또는 월) 단위로 나눈 캐시 스냅샷: <root>/<파티션>.hrc | <파티션>.json
+#  - 파티션 이름: 날짜 앞 4자리(season) 또는 6자리(month)
+#    런타임은 키('{g_id}_{g_dt}')의 g_dt, 스케줄은 날짜 기준. 날짜가 아닌 키는 "misc"
+#  - 파일 1개 = 그 파티션의 (런타임 dict, 스케줄 dict). 포맷은 SNAPSHOT_FORMAT과 같음
+#    (columnar: hour_columnar .hrc, json: {"runtime": ..., "schedule": ...})
+#  - 저장은 바뀐 파티션만, 로드는 필요한 파티션만(메모리 관리/LRU는 hour_back)
+import os, json
+
+import hour_columnar
+from hour_store import atomic_json_save
+
+MISC = "misc"
+_EXT = {"columnar": ".hrc", "json": ".json"}
+
+class PartitionStore:
+    def __init__(self, root, by="season", fmt="columnar"):
+        if by not in ("season", "month"):
+            raise ValueError(f"PARTITION_BY must be season or month: {by}")
+        self.root = root
+        self.by = by
+        self.fmt = fmt if fmt in _EXT else "columnar"
+        self.width = 4 if by == "season" else 6
+        os.makedirs(root, exist_ok=True)
+
+    # --- 이름 ---
+    def part_of_date(self, date_str):
+        p = str(date_str)[:self.width]
+        return p if len(p) == self.width and p.isdigit() else MISC
+
+    def part_of_key(self, runtime_key):
+        return self.part_of_date(runtime_key.rpartition("_")[2])
+
+    def parts_between(self, start, end):
+        """[start, end] 날짜 구간(YYYYMMDD)에 걸친 파티션 이름(오래된 순)"""
+        lo, hi = self.part_of_date(start), self.part_of_date(end)
+        if MISC in (lo, hi) or lo > hi:
+            return []
+        if self.by == "season":
+            return [str(y) for y in range(int(lo), int(hi) + 1)]
+        out, (y, m) = [], (int(lo[:4]), int(lo[4:]))
+        while f"{y:04d}{m:02d}" <= hi:
+            out.append(f"{y:04d}{m:02d}")
+            y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+        return out
+
+    def path(self, part, fmt=None):
+        return os.path.join(self.root, part + _EXT[fmt or self.fmt])
+
+    # --- 디스크 ---
+    def on_disk(self):
+        """{파티션: 파일 크기}. 두 포맷이 다 있으면 설정된 포맷 쪽"""
+        out = {}
+        for fn in os.listdir(self.root):
+            part, ext = os.path.splitext(fn)
+            if ext in _EXT.values() and not fn.endswith(".tmp"):
+                if part not in out or ext == _EXT[self.fmt]:
+                    out[part] = os.path.getsize(os.path.join(self.root, fn))
+        return out
+
+    def load(self, part):
+        """(런타임 dict, 스케줄 dict). 설정된 포맷 → 다른 포맷 순, 없거나 깨졌으면 빈 dict"""
+        for fmt in (self.fmt, *(f for f in _EXT if f != self.fmt)):
+            p = self.path(part, fmt)
+            if not os.path.exists(p):
+                continue
+            try:
+                if fmt == "columnar":
+                    return hour_columnar.load(p)
+                with open(p, "r", encoding="utf-8") as f:
+                    obj = json.load(f)
+                return obj.get("runtime", {}), obj.get("schedule", {})
+            except Exception:
+                continue
+        return {}, {}
+
+    def save(self, part, runtime, schedule):
+        """설정된 포맷으로 원자적 저장 후 다른 포맷의 옛 파일 삭제. 둘 다 비었으면 파일을 지운다."""
+        stale = [self.path(part, f) for f in _EXT if f != self.fmt]
+        if not runtime and not schedule:
+            stale.append(self.path(part))
+        elif self.fmt == "columnar":
+            hour_columnar.save(self.path(part), runtime, schedule)
+        else:
+            atomic_json_save(self.path(part), {"runtime": runtime, "schedule": schedule}, indent=None)
+        for p in stale:
+            if os.path.exists(p):
+                os.remove(p)
+
+    def split(self, runtime, schedule):
+        """전체 dict → {파티션: (런타임 dict, 스케줄 dict)}"""
+        out = {}
+        for k, v in runtime.items():
+            out.setdefault(self.part_of_key(k), ({}, {}))[0][k] = v
+        for d, games in schedule.items():
+            out.setdefault(self.part_of_date(d), ({}, {}))[1][d] = games
+        return out
+
+    def clear(self):
+        deleted = []
+        for fn in os.listdir(self.root):
+            if os.path.splitext(fn)[1] in _EXT.values():
+                os.remove(os.path.join(self.root, fn)); deleted.append(fn)
+        return deleted
@@ -0,0 +1,104 @@
+#hour_publish.py
+# 미리 렌더링한 페이지 저장소: 본문 + gzip/brotli 압축본을 디스크에 두고 바이트 그대로 응답
+#  - <root>/<버전>/<이름>.html, <이름>.html.gz, <이름>.html.br(brotli 모듈이 있을 때만)
+#  - <root>/manifest.json: 현재 버전, 메타(세대/as-of 등), 페이지별 ETag/인코딩
+#    버전 디렉터리를 다 쓴 뒤 manifest를 원자적으로 교체 → 읽는 쪽은 항상 완성된 한 벌을 본다
+#  - 읽기: manifest가 바뀌었을 때만 다시 읽고 바이트는 메모리에 둔다(워커마다 1벌, 팀 수 × 인코딩 수)
+import os, json, gzip, shutil, hashlib, threading, time
+
+from hour_store import atomic_json_save
+
+try:
+    import brotli
+except ImportError:   # 선택 의존성: 없으면 gzip만 만든다
+    brotli = None
+
+_SUFFIX = {"identity": "", "gzip": ".gz", "br": ".br"}
+
+class PageStore:
+    def __init__(self, root, gzip_level=9, brotli_quality=11):
+        self.root = root
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._lock = threading.Lock()
+        self._loaded = (None, None, {})   # (manifest mtime, manifest, {(이름, 인코딩): 바이트})
+        os.makedirs(root, exist_ok=True)
+
+    @property
+    def encodings(self):
+        return ("br", "gzip") if brotli is not None else ("gzip",)
+
+    def _manifest_path(self):
+        return os.path.join(self.root, "manifest.json")
+
+    # --- 쓰기 ---
+    def publish(self, meta, pages):
+        """pages {이름: HTML 바이트}를 새 버전으로 쓰고 manifest 교체. 이전 버전 1개만 남긴다."""
+        version = f"v{meta.get('generation', 0)}-{os.getpid()}-{int(time.time() * 1000)}"
+        tmp_dir = os.path.join(self.root, f".{version}.tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        index = {}
+        for name, body in pages.items():
+            variants = {"identity": body, "gzip": gzip.compress(body, self.gzip_level, mtime=0)}
+            if brotli is not None:
+                variants["br"] = brotli.compress(body, quality=self.brotli_quality)
+            for enc, data in variants.items():
+                with open(os.path.join(tmp_dir, name + ".html" + _SUFFIX[enc]), "wb") as f:
+                    f.write(data)
+            index[name] = {"etag": hashlib.sha1(body).hexdigest(), "encodings": sorted(variants),
+                           "bytes": {enc: len(data) for enc, data in variants.items()}}
+        os.replace(tmp_dir, os.path.join(self.root, version))
+        prev = (self.manifest() or {}).get("version")
+        atomic_json_save(self._manifest_path(), dict(meta, version=version, pages=index), indent=None)
+        for fn in os.listdir(self.root):
+            if fn.startswith("v") and fn not in (version, prev):
+                shutil.rmtree(os.path.join(self.root, fn), ignore_errors=True)
+        return version
+
+    # --- 읽기 ---
+    def _load(self):
+        """manifest가 바뀌었으면 새 버전 바이트를 읽어 둔다 → (manifest, 바이트 dict)"""
+        try:
+            mtime = os.stat(self._manifest_path()).st_mtime_ns
+        except OSError:
+            return None, {}
+        loaded = self._loaded
+        if loaded[0] == mtime:
+            return loaded[1], loaded[2]
+        with self._lock:
+            if self._loaded[0] != mtime:
+                try:
+                    with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    base = os.path.join(self.root, manifest["version"])
+                    blobs = {}
+                    for name, info in manifest["pages"].items():
+                        for enc in info["encodings"]:
+                            with open(os.path.join(base, name + ".html" + _SUFFIX[enc]), "rb") as f:
+                                blobs[(name, enc)] = f.read()
+                except (OSError, ValueError, KeyError):
+                    return None, {}   # 교체 중이면 다음 요청에서 다시
+                self._loaded = (mtime, manifest, blobs)
+            return self._loaded[1], self._loaded[2]
+
+    def manifest(self):
+        return self._load()[0]
+
+    def get(self, name, accepted):
+        """accepted: 받을 수 있는 인코딩(선호 순). → (바이트, 인코딩, ETag, manifest) 또는 None"""
+        manifest, blobs = self._load()
+        info = (manifest or {}).get("pages", {}).get(name)
+        if info is None:
+            return None
+        for enc in (*accepted, "identity"):
+            data = blobs.get((name, enc))
+            if data is not None:
+                etag = info["etag"] if enc == "identity" else f"{info['etag']}-{enc}"
+                return data, enc, etag, manifest
+        return None
+
+    def status(self):
+        manifest = self.manifest() or {}
+        return {"root": os.path.abspath(self.root), "encodings": list(self.encodings),
+                "version": manifest.get("version"), "generation": manifest.get("generation"),
+                "asof": manifest.get("asof"), "pages": len(manifest.get("pages", {}))}
@@ -0,0 +1,141 @@
+#hour_stats.py
+# 경기시간 누적 통계: 런타임이 캐시에 들어오거나 빠질 때마다 갱신(재계산 없음)
+#  - 개수/합/제곱합 → 평균, 표준편차
+#  - 분 단위 히스토그램 → 분위수(경기시간은 정수 분이라 근사 없이 정확, 삭제도 지원)
+#  - 시간 감쇠 가중 평균(EWMA): 경기 날짜 기준 반감기 halflife_days.
+#    가중치 2^(경과일/반감기)를 합/가중합으로 들고 있어 순서와 무관하게 더하고 뺄 수 있다.
+# 범위: 리그 전체 / 팀 / 매치업(팀, 상대) / 홈 / 원정
+# copy.copy(engine)은 쓰기용 사본: 범위 dict만 복사하고 RunningStats는 처음 바꿀 때 복사(원본은 그대로)
+import math
+from copy import copy
+from datetime import date
+
+_EPOCH = date(2000, 1, 1).toordinal()   # 가중치 기준일
+_MAX_EXP = 1000                         # 2^지수가 float 범위를 넘지 않도록(반감기 30일이면 2080년대까지)
+
+class RunningStats:
+    __slots__ = ("count", "sum", "sumsq", "hist", "w", "wx")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0
+        self.sumsq = 0
+        self.hist = {}     # 분 → 경기 수
+        self.w = 0.0       # Σ 감쇠 가중치
+        self.wx = 0.0      # Σ 가중치 × 런타임
+
+    def __copy__(self):
+        new = RunningStats.__new__(RunningStats)
+        new.count, new.sum, new.sumsq, new.w, new.wx = self.count, self.sum, self.sumsq, self.w, self.wx
+        new.hist = dict(self.hist)
+        return new
+
+    def add(self, x, weight, n=1):
+        """n번 추가(n<0이면 제거)"""
+        self.count += n
+        self.sum += n * x
+        self.sumsq += n * x * x
+        c = self.hist.get(x, 0) + n
+        if c:
+            self.hist[x] = c
+        else:
+            self.hist.pop(x, None)
+        self.w += n * weight
+        self.wx += n * weight * x
+
+    def mean(self):
+        return self.sum / self.count if self.count else None
+
+    def std(self):
+        if self.count < 2:
+            return None
+        var = (self.sumsq - self.sum * self.sum / self.count) / (self.count - 1)
+        return math.sqrt(max(var, 0.0))
+
+    def ewma(self):
+        return self.wx / self.w if self.count and self.w > 0 else None
+
+    def quantile(self, p):
+        """선형 보간 분위수(numpy 기본값과 같은 정의)"""
+        if not self.count:
+            return None
+        r = p * (self.count - 1)
+        lo, hi = math.floor(r), math.ceil(r)
+        v_lo = v_hi = None
+        seen = 0
+        for x in sorted(self.hist):
+            seen += self.hist[x]
+            if v_lo is None and seen > lo:
+                v_lo = x
+            if seen > hi:
+                v_hi = x
+                break
+        return v_lo + (v_hi - v_lo) * (r - lo)
+
+    def summary(self, quantiles=(0.3, 0.5, 0.7)):
+        r1 = lambda v: round(v, 1) if v is not None else None
+        out = {"count": self.count, "mean": r1(self.mean()), "std": r1(self.std()), "ewma": r1(self.ewma())}
+        for p in quantiles:
+            out[f"p{round(p * 100)}"] = r1(self.quantile(p))
+        return out
+
+class StatsEngine:
+    def __init__(self, halflife_days=30):
+        self.halflife_days = halflife_days
+        self.scopes = {}    # ("league",) / ("team", id) / ("matchup", id, 상대) / ("home", id) / ("away", id)
+        self._targets = {}  # (홈, 원정) → 갱신할 RunningStats 목록
+        self._weights = {}  # 날짜 → 감쇠 가중치
+        self._owned = None  # copy-on-write 사본이면 이미 복사한 범위 키 set(원본 엔진은 None)
+
+    def __copy__(self):
+        new = StatsEngine.__new__(StatsEngine)
+        new.halflife_days = self.halflife_days
+        new.scopes = dict(self.scopes)
+        new._targets = {}
+        new._weights = self._weights   # 날짜별 값이 바뀌지 않으므로 공유
+        new._owned = set()
+        return new
+
+    def _weight(self, date_str):
+        w = self._weights.get(date_str)
+        if w is None:
+            try:
+                days = date(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:8])).toordinal() - _EPOCH
+            except (TypeError, ValueError):
+                days = 0
+            w = self._weights[date_str] = 2.0 ** min(days / self.halflife_days, _MAX_EXP)
+        return w
+
+    def _scope(self, key):
+        st = self.scopes.get(key)
+        if st is None:
+            st = self.scopes[key] = RunningStats()
+        elif self._owned is not None and key not in self._owned:
+            st = self.scopes[key] = copy(st)
+        else:
+            return st
+        if self._owned is not None:
+            self._owned.add(key)
+        return st
+
+    def _targets_for(self, home, away):
+        t = self._targets.get((home, away))
+        if t is None:
+            keys = [("league",)]
+            for me, opp, side in ((home, away, "home"), (away, home, "away")):
+                if me is None:
+                    continue
+                keys += [("team", me), (side, me)]
+                if opp is not None and opp != me:
+                    keys.append(("matchup", me, opp))
+            t = self._targets[(home, away)] = [self._scope(k) for k in keys]
+        return t
+
+    def add_game(self, home, away, date_str, runtime_min, n=1):
+        """경기 1건(등장 n번, n<0이면 제거)을 해당 범위 전부에 반영. home/away는 팀 ID(None 가능)"""
+        x, w = int(runtime_min), self._weight(date_str)
+        for st in self._targets_for(home, away):
+            st.add(x, w, n)
+
+    def get(self, *key):
+        return self.scopes.get(key) or RunningStats()
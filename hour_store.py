@@ -0,0 +1,228 @@
+#hour_store.py
+# 런타임/스케줄 캐시 저장 엔진: append-only 저널 + 주기적 스냅샷 압축
+#  - 쓰기: 레코드 1줄(JSON) append → O(레코드)
+#  - 부팅: 스냅샷(JSON) 로드 후 저널 재생(replay), 끝이 잘린 줄은 버림
+#  - 압축: 스냅샷을 원자적으로 저장한 뒤, 스냅샷에 들어간 앞부분을 버린 저널로 교체
+#  - 워커 간 공유: 모든 gunicorn 워커가 같은 저널을 읽는다.
+#    각 워커는 (inode, offset)을 기억해 두고 요청마다 stat 1회로 변화를 확인,
+#    늘어난 부분만 읽어 반영한다. inode가 바뀌면(압축/초기화) 스냅샷부터 다시 로드.
+import os, json, threading, zlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:   # Windows 로컬 개발용: 잠금 없이 동작
+    fcntl = None
+
+def atomic_json_save(path, obj, indent=2):
+    """tmp에 쓰고 fsync 후 rename (중간에 죽어도 이전 파일 유지)"""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class StoreLock:
+    """CACHE_DIR 안의 잠금 파일(flock) — 워커 프로세스/스레드 간 쓰기 직렬화
+
+    with lock.exclusive():   # 쓰기/압축/재로드
+    with lock.shared():      # 일관된 읽기
+    매번 새 fd를 열기 때문에 같은 프로세스의 스레드끼리도 서로 배제된다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    @contextmanager
+    def _held(self, mode):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(fd, mode)
+            yield
+        finally:
+            os.close(fd)   # close 시 flock 해제
+
+    def exclusive(self):
+        return self._held(fcntl.LOCK_EX if fcntl else None)
+
+    def shared(self):
+        return self._held(fcntl.LOCK_SH if fcntl else None)
+
+class SingleFlight:
+    """같은 키의 동시 요청을 1번의 실행으로 합친다
+
+    - 프로세스 안: 먼저 온 스레드만 fn을 실행, 나머지는 그 결과를 받는다
+    - 프로세스 간: lock_dir/<버킷>.lock(flock)으로 직렬화. 잠금을 얻은 뒤 recheck()로
+      다른 워커가 방금 채운 캐시를 확인하고, 있으면 fn 없이 그 값을 쓴다.
+    잠금 파일은 키 해시로 buckets개만 쓴다(키마다 파일이 쌓이지 않도록).
+    """
+
+    def __init__(self, lock_dir, buckets=64):
+        self.lock_dir = lock_dir
+        self.buckets = buckets
+        os.makedirs(lock_dir, exist_ok=True)
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0     # 실제로 fn을 실행한 횟수
+        self.coalesced = 0    # 다른 스레드/워커의 결과를 받아 쓴 횟수
+
+    def _file_lock(self, key):
+        b = zlib.crc32(repr(key).encode("utf-8")) % self.buckets
+        return StoreLock(os.path.join(self.lock_dir, f"{b:02d}.lock")).exclusive()
+
+    def do(self, key, fn, recheck=None):
+        """recheck() → (True, 값)이면 캐시 히트로 보고 fn을 건너뛴다"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"event": threading.Event(), "result": None, "error": None}
+        if not leader:
+            call["event"].wait()
+            self.coalesced += 1
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"]
+        try:
+            with self._file_lock(key):
+                hit, value = recheck() if recheck else (False, None)
+                if hit:
+                    self.coalesced += 1
+                    call["result"] = value
+                else:
+                    self.executed += 1
+                    call["result"] = fn()
+            return call["result"]
+        except BaseException as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call["event"].set()
+
+    def status(self):
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+class Journal:
+    """줄 단위 JSON 레코드 저널
+
+    레코드 예)
+      {"g": 12, "op": "rt", "k": "20250328SKWO0_20250328", "v": 163}
+      {"g": 13, "op": "sc", "d": "20250322", "games": [{"home": ..., "away": ..., "g_id": ..., "g_dt": ...}]}
+      {"g": 13, "op": "st", "kind": "sc", "k": "20250323", "st": "negative", "exp": 1742700000, "n": 2}
+    g: 세대(generation) 번호. 값이 바뀌는 쓰기마다 1씩 증가, 압축 후에도 이어진다.
+       상태만 바꾸는 st 레코드는 직전 세대 번호를 그대로 쓴다.
+    """
+
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self.records = 0   # 현재 저널 파일의 레코드 수
+        self.offset = 0    # 이 프로세스가 읽어 반영한 위치(byte)
+        self.ino = None    # 읽고 있는 저널 파일의 inode
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_ino, st.st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def _read_lines(self, f):
+        out, used = [], 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                break          # 아직 쓰는 중이거나 크래시로 잘린 줄
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                break
+            used += len(line)
+        return out, used
+
+    def replay(self, truncate_torn=True):
+        """저장된 레코드를 처음부터 돌려준다. 잘린 꼬리는 잘라낸다(배타 잠금 하에서만 truncate)."""
+        if truncate_torn and not os.path.exists(self.path):
+            open(self.path, "ab").close()   # 빈 저널을 미리 만들어 inode 고정
+        self.ino, _ = self._stat()
+        self.offset = self.records = 0
+        if self.ino is None:
+            return []
+        with open(self.path, "rb") as f:
+            out, used = self._read_lines(f)
+            if truncate_torn and used != os.fstat(f.fileno()).st_size:
+                with open(self.path, "r+b") as w:
+                    w.truncate(used)
+        self.offset, self.records = used, len(out)
+        return out
+
+    def changed(self):
+        """다른 워커가 쓴 내용이 있는지(stat 1회)"""
+        ino, size = self._stat()
+        return ino != self.ino or size != self.offset
+
+    def read_new(self):
+        """마지막으로 읽은 위치 이후의 레코드. 파일이 교체됐으면 None(→ 스냅샷부터 재로드)."""
+        ino, size = self._stat()
+        if ino != self.ino or size < self.offset:
+            return None
+        if size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_ino != self.ino:
+                return None
+            f.seek(self.offset)
+            out, used = self._read_lines(f)
+        self.offset += used
+        self.records += len(out)
+        return out
+
+    def truncate_torn(self):
+        """(배타 잠금 하) 따라잡은 위치 뒤에 남은 잘린 줄을 제거 → 다음 append가 깨끗하게 이어짐"""
+        ino, size = self._stat()
+        if ino == self.ino and size > self.offset:
+            with open(self.path, "r+b") as f:
+                f.truncate(self.offset)
+
+    def append_many(self, recs):
+        """배타 잠금 + read_new로 따라잡은 상태에서: 여러 레코드를 write 1번 + fsync 1번으로"""
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in recs).encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self.ino = os.fstat(f.fileno()).st_ino
+        self.offset += len(data)
+        self.records += len(recs)
+
+    def drop_before(self, offset):
+        """(배타 잠금 + read_new로 따라잡은 상태에서) offset 앞의 레코드를 버린 새 저널로 교체
+        (새 inode → 다른 워커는 스냅샷부터 재로드). 남은 레코드 목록 반환."""
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            tail = f.read(self.offset - offset)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(tail)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.ino, _ = self._stat()
+        recs = [json.loads(line) for line in tail.splitlines()]
+        self.offset, self.records = len(tail), len(recs)
+        return recs
+
+    def reset(self):
+        """빈 저널로 교체(새 inode → 다른 워커는 스냅샷부터 재로드). 스냅샷 저장 뒤에만 호출."""
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.ino, _ = self._stat()
+        self.offset = self.records = 0
@@ -0,0 +1,48 @@
+#tests/conftest.py
+# 공통 fixture
+#  - hour_back은 import 때 환경변수로 설정을 읽고 캐시를 올린다 → 테스트마다(또는 워커마다) 새 프로세스
+#  - worker(code, **env): 새 파이썬 프로세스에서 `import hour_back as hb` 뒤 code 실행,
+#    code 안에서 emit(obj)로 남긴 마지막 JSON을 돌려준다. 같은 테스트의 워커들은 CACHE_DIR을 공유
+#    (= 같은 서버의 gunicorn 워커들)
+#  - synth_seed(...): bench/synth.py 합성 씨드를 만들어 디렉터리 경로 반환
+import os, sys, json, subprocess, textwrap
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, "bench"))
+import synth
+
+PRELUDE = """\
+import os, sys, json
+sys.path.insert(0, os.path.join(os.getcwd(), "bench"))
+import hour_back as hb
+def emit(obj):
+    print("@@" + json.dumps(obj, ensure_ascii=False))
+"""
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    d = tmp_path / "cache"
+    d.mkdir()
+    return str(d)
+
+@pytest.fixture
+def worker(cache_dir):
+    def run(code, **env):
+        full_env = dict(os.environ, CACHE_DIR=cache_dir, USE_CACHE_ONLY="1", JOURNAL_FSYNC="0",
+                        PUBLISH_PAGES="0", FORCE_ASOF="20250920")
+        full_env.update((k, str(v)) for k, v in env.items())
+        r = subprocess.run([sys.executable, "-c", PRELUDE + textwrap.dedent(code)], cwd=REPO_DIR,
+                           env=full_env, capture_output=True, text=True, timeout=120)
+        assert r.returncode == 0, r.stderr
+        out = [line[2:] for line in r.stdout.splitlines() if line.startswith("@@")]
+        return json.loads(out[-1]) if out else None
+    return run
+
+@pytest.fixture
+def synth_seed(tmp_path):
+    def make(seasons=1, games_per_season=60, name="seed"):
+        d = str(tmp_path / name)
+        synth.write_seed(d, seasons, games_per_season)
+        return d
+    return make
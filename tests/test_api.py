@@ -0,0 +1,31 @@
+#tests/test_api.py
+# /api/hour: 팀 × as-of 범위 일괄 집계가 /hour의 compute_for_team과 같은 값, 잘못된 인자는 400
+
+def test_api_hour_matches_compute_for_team(worker, synth_seed):
+    seed = synth_seed(seasons=1, games_per_season=150)
+    r = worker("""
+        c = hb.app.test_client()
+        first = min(hb.SNAP.schedule)
+        body = c.get(f"/api/hour?teams=all&from={first}&to=20250531").get_json()
+        diff = []
+        for x in body["results"]:
+            ctx = hb.compute_for_team(x["team"], x["asof"])
+            if [x["avg_time"], x["css_class"], x["msg"]] != [ctx["avg_time"], ctx["css_class"], ctx["msg"]]:
+                diff.append([x, ctx["avg_time"]])
+        emit({"n": len(body["results"]), "diff": diff[:3], "ok": body["ok"],
+              "with_avg": sum(x["avg_time"] is not None for x in body["results"])})
+    """, DATA_DIR=seed, FORCE_ASOF="", START_DATE="2025-03-01")
+    assert r["ok"] and r["diff"] == []
+    assert r["n"] % 10 == 0 and r["with_avg"] > 100   # 경기 없는 날/첫 경기는 평균 없음
+
+def test_api_hour_rejects_bad_arguments(worker, synth_seed):
+    seed = synth_seed(seasons=1, games_per_season=30)
+    r = worker("""
+        c = hb.app.test_client()
+        emit({q: c.get("/api/hour?" + q).status_code
+              for q in ("teams=LG&from=00010101", "teams=LG&asof=20251301", "teams=LG&from=20250502&to=20250501",
+                        "teams=XX", "teams=LG&from=20200101&to=20251231", "teams=LG,KT&asof=20250501")})
+    """, DATA_DIR=seed, FORCE_ASOF="")
+    assert r == {"teams=LG&from=00010101": 400, "teams=LG&asof=20251301": 400,
+                 "teams=LG&from=20250502&to=20250501": 400, "teams=XX": 400,
+                 "teams=LG&from=20200101&to=20251231": 400, "teams=LG,KT&asof=20250501": 200}
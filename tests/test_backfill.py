@@ -0,0 +1,71 @@
+#tests/test_backfill.py
+# 기간 일괄 수집(hour_backfill): 로컬 fixture 서버를 상대로 중간에 끊고 다시 실행하면 체크포인트에서 이어 간다
+import os, json, threading
+from datetime import datetime, timedelta
+import hour_fixture_server as fx
+
+BACKFILL = """
+    import io, contextlib
+    import hour_backfill as bf
+    argv = [{start!r}, {end!r}, "--base-url", {url!r}, "--min-interval", "0", "--workers", "1",
+            "--checkpoint-every", "1", "--checkpoint", {checkpoint!r}]
+    backfill_date, calls = bf.backfill_date, [0]
+    def stop_after(n):
+        def wrapped(d, force=False):
+            calls[0] += 1
+            if calls[0] > n:
+                raise KeyboardInterrupt   # Ctrl+C처럼 중간에 끊김
+            return backfill_date(d, force)
+        bf.backfill_date = wrapped
+    {body}
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        code = bf.main(argv)
+    progress = [line for line in out.getvalue().splitlines() if "/" in line and "dates," in line]
+    with open({checkpoint!r}, encoding="utf-8") as f:
+        emit({{"code": code, "progress": progress[-1].split()[0], "cp": json.load(f)}})
+"""
+
+def _serve(seed):
+    srv = fx.make_server(port=0, seed_dir=seed)
+    requested, page = [], srv.store.page
+    def logged(qs):
+        requested.append(qs.get("gameDate", [None])[0])
+        return page(qs)
+    srv.store.page = logged
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, requested
+
+def test_resume_skips_completed_dates_and_settles_off_days(worker, synth_seed, tmp_path):
+    seed = synth_seed(seasons=1, games_per_season=30)
+    with open(os.path.join(seed, "schedule_index.json"), encoding="utf-8") as f:
+        schedule = json.load(f)
+    dates = sorted(schedule)
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    srv, requested = _serve(seed)
+    try:
+        args = dict(start=dates[0], end=dates[-1], url=f"http://127.0.0.1:{srv.server_address[1]}",
+                    checkpoint=str(tmp_path / "backfill.json"))
+        env = dict(DATA_DIR=str(empty), USE_CACHE_ONLY=0, CRAWL_HTTP=1)
+
+        first = worker(BACKFILL.format(body="stop_after(4)", **args), **env)
+        first_requests = list(requested)
+        del requested[:]
+        second = worker(BACKFILL.format(body="", **args), **env)
+    finally:
+        srv.shutdown()
+
+    first_day, last_day = (datetime.strptime(d, "%Y%m%d") for d in (dates[0], dates[-1]))
+    every_day = [(first_day + timedelta(days=i)).strftime("%Y%m%d") for i in range((last_day - first_day).days + 1)]
+    assert first["code"] == 130 and len(first["cp"]["done"]) == 4
+    assert set(first["cp"]["done"]) <= set(first_requests)
+    # 다시 실행: 끝난 날짜는 서버에 다시 묻지 않는다(스케줄도 리뷰도)
+    assert requested and not set(requested) & set(first["cp"]["done"])
+
+    # 쉬는 날(지난 날짜, 스케줄 final)도 done으로 세어 진행률이 N/N에 닿는다
+    cp = second["cp"]
+    assert second["code"] == 0
+    assert set(every_day) - set(schedule)
+    assert cp["done"] == every_day and cp["empty"] == [] and cp["failed"] == {}
+    assert second["progress"] == f"{len(every_day)}/{len(every_day)}"
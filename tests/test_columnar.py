@@ -0,0 +1,45 @@
+#tests/test_columnar.py
+# .hrc 컬럼형 포맷: JSON → .hrc → JSON이 그대로 돌아오고, 규칙에 안 맞는 항목도 잃지 않는다
+import os, json
+import pytest
+import hour_columnar
+
+def _load_seed(seed):
+    with open(os.path.join(seed, "runtime_cache.json"), encoding="utf-8") as f:
+        runtime = json.load(f)
+    with open(os.path.join(seed, "schedule_index.json"), encoding="utf-8") as f:
+        schedule = json.load(f)
+    return runtime, schedule
+
+def test_pack_load_round_trip(synth_seed, tmp_path):
+    runtime, schedule = _load_seed(synth_seed(seasons=2, games_per_season=120))
+    # 규칙 밖 항목: 키 형식이 다른 런타임, 필드가 더 있는 값, 팀 없는 경기, 필드가 더 있는 경기, 빈 날짜
+    runtime.update({"odd-key": {"runtime_min": 170}, "20250401LGKT0_20250401": {"runtime_min": 181, "note": "x"}})
+    schedule.update({
+        "20300101": [{"home": None, "away": "KT", "g_id": "20300101KTXX0", "g_dt": "20300101"},
+                     {"home": "LG", "away": "KT", "g_id": "20300101KTLG0", "g_dt": "20300101", "stadium": "잠실"}],
+        "20300102": [],
+    })
+    path = str(tmp_path / "cache.hrc")
+    hour_columnar.save(path, runtime, schedule)
+    got_rt, got_sc = hour_columnar.load(path)
+    assert got_rt == runtime
+    assert got_sc == schedule and list(got_sc) == sorted(schedule)
+    assert os.path.getsize(path) < len(json.dumps([runtime, schedule])) / 3
+
+def test_cli_pack_unpack(synth_seed, tmp_path):
+    seed = synth_seed(seasons=1, games_per_season=60)
+    hrc, out = str(tmp_path / "seed.hrc"), str(tmp_path / "out")
+    hour_columnar.main(["pack", "--runtime", os.path.join(seed, "runtime_cache.json"),
+                        "--schedule", os.path.join(seed, "schedule_index.json"), "-o", hrc])
+    hour_columnar.main(["unpack", hrc, "--out-dir", out])
+    assert _load_seed(out) == _load_seed(seed)
+
+def test_empty_and_foreign_files(tmp_path):
+    path = str(tmp_path / "empty.hrc")
+    hour_columnar.save(path, {}, {})
+    assert hour_columnar.load(path) == ({}, {})
+    other = tmp_path / "other.hrc"
+    other.write_bytes(b'{"not": "columnar"}')
+    with pytest.raises(ValueError):
+        hour_columnar.load(str(other))
@@ -0,0 +1,101 @@
+#tests/test_crawler.py
+# 크롤러 HTTP 경로: 로컬 fixture 서버(hour_fixture_server)를 상대로 스케줄/런타임을 받아 캐시에 기록
+import json, os, textwrap
+
+CRAWL = """
+    import threading
+    import hour_fixture_server as fx
+    from hour_crawler import Crawler
+    srv = fx.make_server(port=0, seed_dir=os.environ["FIXTURE_SEED"])
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    hb._CRAWLER = Crawler(base_url=f"http://127.0.0.1:{srv.server_address[1]}", workers=4,
+                          min_interval=0, use_selenium=False)
+    hb.USE_CACHE_ONLY = False
+"""
+
+def _crawling(body):
+    return textwrap.dedent(CRAWL) + textwrap.dedent(body)
+
+def test_crawl_against_fixture_server(worker, synth_seed, tmp_path):
+    seed = synth_seed(seasons=1, games_per_season=30)
+    with open(os.path.join(seed, "schedule_index.json"), encoding="utf-8") as f:
+        schedule = json.load(f)
+    with open(os.path.join(seed, "runtime_cache.json"), encoding="utf-8") as f:
+        runtime = json.load(f)
+    dates = sorted(schedule)
+    empty = tmp_path / "empty"   # 캐시 씨드 없음 → 전부 fixture 서버에서 받아야 함
+    empty.mkdir()
+
+    r = worker(_crawling(f"""
+        dates = {dates!r}
+        # 같은 날짜를 여러 스레드가 동시에 찾아도 요청은 날짜당 1번(single-flight)
+        got = hb._CRAWLER.map(lambda d: hb.get_games_for_date(None, d), dates + dates)
+        schedule_hits = srv.store.hits
+        rts = {{}}
+        for games in got[:len(dates)]:
+            for g in games:
+                key = hb.make_runtime_key(g["g_id"], g["g_dt"])
+                rts[key] = hb.open_review_and_get_runtime(None, g["g_id"], g["g_dt"])
+        fetched_hits = srv.store.hits
+        again = [hb.get_games_for_date(None, d) for d in dates]   # 캐시 히트: 요청 없음
+        hb.open_review_and_get_runtime(None, got[0][0]["g_id"], got[0][0]["g_dt"])
+        emit({{"schedule": dict(zip(dates, got[:len(dates)])), "dup_same": got[:len(dates)] == got[len(dates):],
+              "again_same": again == got[:len(dates)], "schedule_hits": schedule_hits,
+              "fetched_hits": fetched_hits, "final_hits": srv.store.hits, "runtime": rts}})
+    """), DATA_DIR=str(empty), FIXTURE_SEED=seed, USE_CACHE_ONLY=0, CRAWL_HTTP=1)
+
+    assert r["schedule"] == schedule
+    assert r["dup_same"] and r["again_same"]
+    assert r["schedule_hits"] == len(dates)
+    assert r["runtime"] == {k: v["runtime_min"] for k, v in runtime.items()}
+    assert r["fetched_hits"] == len(dates) + len(runtime)
+    assert r["final_hits"] == r["fetched_hits"]
+
+    # 받은 값은 저널에 남아 다음 워커(캐시 전용)에서도 보인다
+    r = worker("""
+        emit({"sc": len(hb.SNAP.schedule), "rt": len(hb.SNAP.runtime)})
+    """, DATA_DIR=str(empty))
+    assert r == {"sc": len(dates), "rt": len(runtime)}
+
+def test_missing_pages_back_off_without_new_generations(worker, synth_seed, tmp_path):
+    seed = synth_seed(seasons=1, games_per_season=30)
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    r = worker(_crawling("""
+        hb.get_games_for_date(None, "20300101")        # 경기 없는 날 → 빈 목록 + negative
+        gen1, hits1 = hb.DATA_GENERATION, srv.store.hits
+        hb.get_games_for_date(None, "20300101")        # 백오프 중 → 요청 없음
+        hits2 = srv.store.hits
+        hb.get_games_for_date(None, "20300101", force=True)   # 다시 받아도 그대로 빈 목록 → 상태만
+        emit({"gen1": gen1, "gen": hb.DATA_GENERATION, "hits": [hits1, hits2, srv.store.hits],
+              "state": hb._entry_state("sc", "20300101")[0::2],
+              "rt": hb.open_review_and_get_runtime(None, "20300101XXYY0", "20300101"),
+              "rt_state": hb._entry_state("rt", "20300101XXYY0_20300101")[0::2], "gen_rt": hb.DATA_GENERATION})
+    """), DATA_DIR=str(empty), FIXTURE_SEED=seed, USE_CACHE_ONLY=0, CRAWL_HTTP=1)
+    assert r["hits"] == [1, 1, 2]
+    assert r["gen"] == r["gen1"] == r["gen_rt"]
+    assert r["state"] == ["negative", 2]
+    assert r["rt"] is None and r["rt_state"] == ["negative", 1]
+
+def test_confirmed_empty_past_date_settles_as_final(worker, synth_seed, tmp_path):
+    # 지난 날짜의 "경기 없음"은 한 번 확인되면 final → 다시 수집하지 않고, 새 워커에서도 그대로
+    seed = synth_seed(seasons=1, games_per_season=30)
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    r = worker(_crawling("""
+        hb.get_games_for_date(None, "20200101")
+        hits1 = srv.store.hits
+        hb.get_games_for_date(None, "20200101")
+        emit({"hits": [hits1, srv.store.hits], "state": hb._entry_state("sc", "20200101")[0],
+              "counts": hb._entry_state_counts()["schedule"]})
+    """), DATA_DIR=str(empty), FIXTURE_SEED=seed, USE_CACHE_ONLY=0, CRAWL_HTTP=1)
+    assert r["hits"] == [1, 1]
+    assert r["state"] == "final"
+    assert r["counts"] == {"final": 1, "provisional": 0, "negative": 0, "expired": 0}
+
+    r = worker(_crawling("""
+        hb._compact_cache()
+        hb.get_games_for_date(None, "20200101")
+        emit({"hits": srv.store.hits, "fresh": hb._is_fresh("sc", "20200101")})
+    """), DATA_DIR=str(empty), FIXTURE_SEED=seed, USE_CACHE_ONLY=0, CRAWL_HTTP=1)
+    assert r == {"hits": 0, "fresh": True}
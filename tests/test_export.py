@@ -0,0 +1,96 @@
+#tests/test_export.py
+# 캐시 export/import: 전체 → 증분(since=) 순서로 받은 replica가 원본과 같아지고, 잘못된 zip은 400
+import io, json, zipfile, textwrap
+
+DIGEST = """
+    import hashlib
+    def digest():
+        hb.ensure_partitions()
+        s = hb.SNAP
+        return hashlib.sha1(json.dumps([dict(s.runtime), dict(s.schedule)], sort_keys=True).encode()).hexdigest()
+"""
+
+def _with_digest(body):
+    return textwrap.dedent(DIGEST) + textwrap.dedent(body)
+
+def _zip(**members):
+    b = io.BytesIO()
+    with zipfile.ZipFile(b, "w") as z:
+        for name, text in members.items():
+            z.writestr(name, text)
+    return b.getvalue()
+
+def test_export_import_round_trip_and_delta(worker, synth_seed, tmp_path):
+    seed = synth_seed(seasons=2, games_per_season=60)
+    full_zip, delta_zip = tmp_path / "full.zip", tmp_path / "delta.zip"
+    replica = dict(CACHE_DIR=str(tmp_path / "replica"), DATA_DIR=str(tmp_path / "nothing"))
+    (tmp_path / "replica").mkdir()
+    (tmp_path / "nothing").mkdir()
+
+    primary = worker(_with_digest(f"""
+        c = hb.app.test_client()
+        first = sorted(hb.SNAP.runtime)[0]
+        hb.set_runtime_cache(first, hb.SNAP.runtime[first]["runtime_min"] + 1)   # since=0은 전체 export
+        resp = c.get("/cache/export")
+        open({str(full_zip)!r}, "wb").write(resp.data)
+        gen = hb.DATA_GENERATION
+        key = sorted(hb.SNAP.runtime)[3]
+        hb.set_runtime_cache(key, hb.SNAP.runtime[key]["runtime_min"] + 7)
+        hb.set_schedule_cache_for_date("20300101", [{{"home": "LG", "away": "KT", "g_id": "20300101KTLG0",
+                                                      "g_dt": "20300101"}}])
+        hb.set_runtime_cache("20300101KTLG0_20300101", 188)
+        resp = c.get(f"/cache/export?since={{gen}}")
+        open({str(delta_zip)!r}, "wb").write(resp.data)
+        emit({{"digest": digest(), "key": key, "n": [len(hb.SNAP.runtime), len(hb.SNAP.schedule)]}})
+    """), DATA_DIR=seed)
+
+    with zipfile.ZipFile(delta_zip) as z:
+        meta = json.loads(z.read("export_meta.json"))
+        delta_rt = json.loads(z.read("runtime_cache.json"))
+        delta_sc = json.loads(z.read("schedule_index.json"))
+    assert meta["mode"] == "delta" and not meta["reset"]
+    assert sorted(delta_rt) == sorted([primary["key"], "20300101KTLG0_20300101"])
+    assert list(delta_sc) == ["20300101"]
+
+    r = worker(_with_digest(f"""
+        c = hb.app.test_client()
+        before = [len(hb.SNAP.runtime), len(hb.SNAP.schedule)]
+        full = c.post("/cache/import", data=open({str(full_zip)!r}, "rb").read()).get_json()
+        delta = c.post("/cache/import", data=open({str(delta_zip)!r}, "rb").read()).get_json()
+        again = c.post("/cache/import", data=open({str(delta_zip)!r}, "rb").read()).get_json()
+        emit({{"before": before, "full": full["imported"], "delta": delta["imported"], "again": again["imported"],
+              "digest": digest()}})
+    """), **replica)
+    assert r["before"] == [0, 0]
+    assert r["full"] == {"runtime": primary["n"][0] - 1, "schedule": primary["n"][1] - 1}
+    assert r["delta"] == {"runtime": 2, "schedule": 1}
+    assert r["again"] == {"runtime": 0, "schedule": 0}   # 같은 값은 다시 기록하지 않음
+    assert r["digest"] == primary["digest"]
+
+def test_import_rejects_malformed_archives(worker, tmp_path):
+    bad = {
+        "not_zip": b"this is not a zip",
+        "not_json": _zip(**{"runtime_cache.json": "{nope"}),
+        "list": _zip(**{"runtime_cache.json": "[1, 2]"}),
+        "meta_list": _zip(**{"export_meta.json": "[1]"}),
+    }
+    for name, data in bad.items():
+        (tmp_path / f"{name}.zip").write_bytes(data)
+    (tmp_path / "mixed.zip").write_bytes(_zip(**{
+        "runtime_cache.json": json.dumps({"20300101KTLG0_20300101": {"runtime_min": 190},
+                                          "20300102KTLG0_20300102": {"runtime_min": "190"}, "x": True}),
+        "schedule_index.json": json.dumps({"20300101": [{"home": "LG", "away": "KT", "g_id": "20300101KTLG0",
+                                                         "g_dt": "20300101"}], "2030-01-02": [], "20300103": [{}]}),
+    }))
+    r = worker(f"""
+        c = hb.app.test_client()
+        gen0 = hb.DATA_GENERATION
+        out = {{name: c.post("/cache/import", data=open(os.path.join({str(tmp_path)!r}, name + ".zip"), "rb").read())
+               .status_code for name in {sorted(bad)!r}}}
+        out["gen"] = hb.DATA_GENERATION - gen0
+        mixed = c.post("/cache/import", data=open(os.path.join({str(tmp_path)!r}, "mixed.zip"), "rb").read())
+        out["mixed"] = [mixed.status_code, mixed.get_json()["imported"], mixed.get_json()["skipped"]]
+        emit(out)
+    """)
+    assert r == {"list": 400, "meta_list": 400, "not_json": 400, "not_zip": 400, "gen": 0,
+                 "mixed": [200, {"runtime": 1, "schedule": 1}, {"runtime": 2, "schedule": 2}]}
@@ -0,0 +1,88 @@
+#tests/test_journal.py
+# 저널 공유: 크래시로 잘린 꼬리는 재생 때 버리고, 다른 워커가 쓴 레코드는 다음 요청에 보인다
+import os, json
+
+GAME = {"home": "LG", "away": "KT", "g_id": "20300101KTLG0", "g_dt": "20300101"}
+
+def _journal_lines(cache_dir):
+    with open(os.path.join(cache_dir, "cache_journal.jsonl"), "rb") as f:
+        return f.read().split(b"\n")
+
+def test_torn_tail_is_dropped_on_replay(worker, cache_dir):
+    worker(f"""
+        hb.set_schedule_cache_for_date("20300101", [{GAME!r}])
+        hb.set_runtime_cache("20300101KTLG0_20300101", 181)
+    """)
+    with open(os.path.join(cache_dir, "cache_journal.jsonl"), "ab") as f:
+        f.write(b'{"op":"rt","k":"20300102KTLG0_20300102","v":19')   # 쓰다가 죽은 줄
+
+    r = worker("""
+        emit({"gen": hb.DATA_GENERATION, "rt": hb.SNAP.runtime.get("20300101KTLG0_20300101"),
+              "torn": "20300102KTLG0_20300102" in hb.SNAP.runtime, "games": hb.SNAP.schedule.get("20300101")})
+        hb.set_runtime_cache("20300103KTLG0_20300103", 175)
+    """)
+    assert r["rt"] == {"runtime_min": 181} and r["torn"] is False
+    assert r["games"] == [GAME]
+    lines = _journal_lines(cache_dir)
+    assert lines[-1] == b"" and all(json.loads(line) for line in lines[:-1])   # 잘린 줄 없이 이어 씀
+
+    r = worker("""
+        emit({"gen": hb.DATA_GENERATION,
+              "rt": [hb.SNAP.runtime.get(k, {}).get("runtime_min")
+                     for k in ("20300101KTLG0_20300101", "20300103KTLG0_20300103")]})
+    """)
+    assert r["rt"] == [181, 175]
+    assert r["gen"] == 3
+
+def test_workers_pick_up_each_others_writes(worker):
+    # 살아 있는 워커 A가 읽는 동안 다른 워커 B가 쓰면, A는 다음 sync에서 증분만 읽어 반영한다
+    r = worker(f"""
+        import subprocess
+        gen0 = hb.DATA_GENERATION
+        subprocess.run([sys.executable, "-c",
+                        "import hour_back as hb; hb.set_schedule_cache_for_date('20300101', [{GAME!r}]); "
+                        "hb.set_runtime_cache('20300101KTLG0_20300101', 190)"], check=True)
+        seen_before = "20300101KTLG0_20300101" in hb.SNAP.runtime
+        gen = hb.sync_shared_cache()
+        emit({{"before": seen_before, "gen": gen - gen0, "rt": hb.SNAP.runtime.get("20300101KTLG0_20300101"),
+              "records": hb.JOURNAL.records}})
+    """)
+    assert r == {"before": False, "gen": 2, "rt": {"runtime_min": 190}, "records": 2}
+
+def test_failed_batch_is_not_journaled(worker, cache_dir):
+    # 메모리 반영에 실패한 묶음은 통째로 저널에 남지 않는다 → 다른 워커의 재생을 막지 않음
+    r = worker("""
+        gen0 = hb.DATA_GENERATION
+        try:
+            hb._journal_write_many([{"op": "rt", "k": "20300102KTLG0_20300102", "v": 170},
+                                    {"op": "sc", "d": "20300101", "games": [{"home": "LG"}]}])
+            failed = False
+        except KeyError:
+            failed = True
+        partial = "20300102KTLG0_20300102" in hb.SNAP.runtime
+        hb.set_runtime_cache("20300101KTLG0_20300101", 185)
+        emit({"failed": failed, "partial": partial, "gen": hb.DATA_GENERATION - gen0})
+    """)
+    assert r == {"failed": True, "partial": False, "gen": 1}
+    assert [json.loads(line)["op"] for line in _journal_lines(cache_dir)[:-1]] == ["rt"]
+    assert worker("emit(hb.SNAP.runtime.get('20300101KTLG0_20300101'))") == {"runtime_min": 185}
+
+def test_compaction_keeps_writes_made_while_it_serialises(worker, cache_dir):
+    # 파티션을 쓰는 동안은 잠금을 쥐지 않는다 → 그 사이의 쓰기가 막히지 않고, 압축 뒤 저널에 남는다
+    r = worker("""
+        hb.set_runtime_cache("20300101KTLG0_20300101", 181)
+        save = hb._save_snapshot
+        def save_and_write(s, parts):
+            save(s, parts)
+            hb.set_runtime_cache("20300102KTLG0_20300102", 182)   # 같은 스레드: 잠금을 쥐고 있으면 멈춤
+        hb._save_snapshot = save_and_write
+        done = hb._compact_cache()
+        emit({"done": done, "records": hb.JOURNAL.records, "dirty": sorted(hb._PART_DIRTY)})
+    """)
+    assert r == {"done": True, "records": 1, "dirty": ["2030"]}
+    assert [json.loads(line)["k"] for line in _journal_lines(cache_dir)[:-1]] == ["20300102KTLG0_20300102"]
+    r = worker("""
+        emit([hb.SNAP.runtime.get(k, {}).get("runtime_min")
+              for k in ("20300101KTLG0_20300101", "20300102KTLG0_20300102")])
+    """)
+    assert r == [181, 182]
@@ -0,0 +1,64 @@
+#tests/test_matchup_index.py
+# 매치업 인덱스: collect_history_avg_runtime의 구간합이 스케줄 전체를 훑는 예전 방식(선형 스캔)과 같은 값
+import textwrap
+
+LINEAR = """
+    from datetime import datetime, timedelta
+    hb.ensure_partitions()
+    def linear(team, rivals, start, asof):
+        # 인덱스 전의 계산: [start, 전날] 날짜의 경기를 전부 훑어 상대팀이 맞는 경기의 런타임 평균
+        y = (datetime.strptime(asof, "%Y%m%d") - timedelta(days=1)).strftime("%Y%m%d")
+        rts = []
+        for d in sorted(hb.SNAP.schedule):
+            if not start <= d <= y:
+                continue
+            for g in hb.SNAP.schedule[d]:
+                h, a = hb.canon_team(g["home"]), hb.canon_team(g["away"])
+                if team not in (h, a):
+                    continue
+                if rivals and (h if a == team else a) not in rivals:
+                    continue
+                hit = hb.SNAP.runtime.get(hb.make_runtime_key(g["g_id"], g["g_dt"]))
+                if hit:
+                    rts.append(hit["runtime_min"])
+        return [round(sum(rts) / len(rts), 1), sorted(rts)] if rts else [None, []]
+    def indexed(team, rivals, start, asof):
+        avg, rts = hb.collect_history_avg_runtime(team, rivals, start_date=start, asof=asof)
+        return [avg, sorted(rts)]
+    def mismatches(asofs, start="20240301"):
+        teams = sorted(hb._ALIAS)
+        cases = [(t, rivals, a) for t in teams for rivals in (None, {teams[(teams.index(t) + 1) % len(teams)]})
+                 for a in asofs]
+        return [[t, sorted(r or ()), a] for t, r, a in cases if linear(t, r, start, a) != indexed(t, r, start, a)]
+"""
+
+def _with_linear(body):
+    return textwrap.dedent(LINEAR) + textwrap.dedent(body)
+
+def test_index_matches_linear_scan(worker, synth_seed):
+    seed = synth_seed(seasons=2, games_per_season=150)
+    r = worker(_with_linear("""
+        asofs = ["20240415", "20240601", "20250401", "20250520", "20251001"]
+        emit({"seed": mismatches(asofs),
+              "games": sum(len(indexed(t, None, "20240301", "20251001")[1]) for t in hb._ALIAS)})
+    """), DATA_DIR=seed, FORCE_ASOF="", START_DATE="2024-03-01")
+    assert r["seed"] == []
+    assert r["games"] == 2 * 300   # 경기마다 두 팀
+
+def test_index_follows_incremental_writes(worker, synth_seed):
+    # 쓰기 순서(런타임 먼저/스케줄 먼저), 같은 날짜 덮어쓰기(경기 빠짐)까지 인덱스가 따라간다
+    seed = synth_seed(seasons=2, games_per_season=150)
+    r = worker(_with_linear("""
+        dates = sorted(hb.SNAP.schedule)
+        d0, d1 = dates[5], dates[-10]
+        g0 = hb.SNAP.schedule[d0]
+        with hb.batched_writes(20):
+            hb.set_schedule_cache_for_date(d0, g0[1:])                       # 경기 하나 빠짐
+            hb.set_runtime_cache("20250930LGKT0_20250930", 201)             # 스케줄보다 런타임이 먼저
+            hb.set_schedule_cache_for_date("20250930", [{"home": "KT", "away": "LG", "g_id": "20250930LGKT0",
+                                                         "g_dt": "20250930"}])
+            for g in hb.SNAP.schedule[d1]:
+                hb.set_runtime_cache(hb.make_runtime_key(g["g_id"], g["g_dt"]), 150)   # 값 바꾸기
+        emit(mismatches(["20240415", d0, "20250601", "20251001"]))
+    """), DATA_DIR=seed, FORCE_ASOF="", START_DATE="2024-03-01")
+    assert r == []
@@ -0,0 +1,69 @@
+#tests/test_partitions.py
+# 시즌 파티션: 핫 구간만 올려 두고, 예산(PARTITION_MAX_LOADED)을 넘으면 오래 안 쓴 것부터 내리고 다시 올린다
+import textwrap
+
+AVG_2021 = """
+    asofs = [f"2021{m:02d}{d:02d}" for m in (4, 5) for d in range(1, 29, 3)]
+    def avg_2021():
+        return [[x["avg_time"], x["count"]]
+                for x in hb.batch_team_averages(["LG", "KT"], asofs, start_date="2021-03-01")]
+"""
+
+def _with_avg(body):
+    return textwrap.dedent(AVG_2021) + textwrap.dedent(body)
+
+def _env(seed):
+    return dict(DATA_DIR=seed, START_DATE="2025-03-01", PARTITION_MAX_LOADED=3, JOURNAL_COMPACT_EVERY=500)
+
+def test_lru_eviction_and_reload(worker, synth_seed):
+    seed = synth_seed(seasons=6, games_per_season=300)
+    full = worker(_with_avg("""
+        hb.ensure_partitions()
+        emit(avg_2021())
+    """), **dict(_env(seed), PARTITION_MAX_LOADED=99))
+
+    r = worker(_with_avg("""
+        out = {"boot": sorted(hb._PART_KEYS)}
+        first = avg_2021()
+        out["after_2021"] = sorted(hb._PART_KEYS)
+        s_held = hb.SNAP
+        for p in ("2022", "2023"):
+            hb.ensure_partitions([p])
+        out["after_lru"] = sorted(hb._PART_KEYS)
+        out["runtime"] = len(hb.SNAP.runtime)
+        out["held_has_2021"] = any(k.startswith("2021") for k in s_held.runtime)
+        out["has_2021"] = any(k.startswith("2021") for k in hb.SNAP.runtime)
+        out["reload"] = avg_2021() == first
+        out["after_reload"] = sorted(hb._PART_KEYS)
+        out["first"] = first
+        emit(out)
+    """), **_env(seed))
+    assert r["boot"] == ["2025"]
+    assert r["after_2021"] == ["2021", "2025"]
+    # 예산 3개: 가장 오래 안 쓴 2021을 내림(핫 구간 2025는 고정)
+    assert r["after_lru"] == ["2022", "2023", "2025"]
+    assert r["runtime"] == 900
+    assert r["held_has_2021"] and not r["has_2021"]   # 잡고 있던 스냅샷은 그대로
+    assert r["reload"] and r["after_reload"] == ["2021", "2023", "2025"]
+    assert r["first"] == full and any(count for _, count in full)
+
+def test_dirty_partition_stays_loaded_until_compaction(worker, synth_seed):
+    seed = synth_seed(seasons=6, games_per_season=300)
+    r = worker("""
+        hb.set_runtime_cache("20200401LGKT0_20200401", 199)   # 콜드 파티션에 쓰기 → 로드 + dirty
+        for p in ("2021", "2022", "2023"):
+            hb.ensure_partitions([p])
+        pinned = sorted(hb._PART_KEYS)
+        hb._compact_cache()
+        hb.ensure_partitions(["2024"])
+        emit({"pinned": pinned, "after": sorted(hb._PART_KEYS), "dirty": sorted(hb._PART_DIRTY)})
+    """, **_env(seed))
+    assert "2020" in r["pinned"] and r["dirty"] == []
+    assert "2020" not in r["after"] and len(r["after"]) == 3
+
+    # 압축으로 파티션 파일에 들어간 값은 새 워커가 내렸다 올려도 그대로
+    r = worker("""
+        hb.ensure_partitions(["2020"])
+        emit(hb.SNAP.runtime.get("20200401LGKT0_20200401"))
+    """, **_env(seed))
+    assert r == {"runtime_min": 199}
@@ -0,0 +1,39 @@
+#tests/test_publish.py
+# 팀별 게시 페이지: 미리 렌더링해 압축해 둔 바이트가 실시간 렌더링과 같고, 세대가 바뀌면 다시 게시
+
+def test_published_pages_match_live_render(worker, synth_seed):
+    seed = synth_seed(seasons=1, games_per_season=150)
+    r = worker("""
+        import gzip
+        hb.PUBLISHER.join()
+        c = hb.app.test_client()
+        def live(team):
+            hb.PUBLISH_PAGES = False
+            try:
+                return c.get("/hour", query_string={"myteam": team}).data
+            finally:
+                hb.PUBLISH_PAGES = True
+        def published(team, enc="gzip"):
+            resp = c.get("/hour", query_string={"myteam": team}, headers={"Accept-Encoding": enc})
+            data = gzip.decompress(resp.data) if resp.headers.get("Content-Encoding") == "gzip" else resp.data
+            return resp.headers.get("Content-Encoding"), data
+        out = {"gzip": {}, "identity": {}}
+        for team in hb._ALIAS:
+            body = live(team)
+            enc, data = published(team)
+            out["gzip"][team] = [enc, data == body]
+            enc, data = published(team, "identity")
+            out["identity"][team] = [enc, data == body]
+        out["alias"] = published("lg")[0]   # 정식 이름이 아니면 실시간 렌더링
+        gen0 = hb.PAGES.status()["generation"]
+        hb.set_runtime_cache("20300101XXYY0_20300101", 180)
+        out["stale"] = published("LG")[0]   # 세대가 바뀐 게시본은 쓰지 않는다
+        hb.PUBLISHER.join()
+        enc, data = published("LG")
+        out["republished"] = [enc, data == live("LG"), hb.PAGES.status()["generation"] - gen0]
+        emit(out)
+    """, DATA_DIR=seed, PUBLISH_PAGES=1, PUBLISH_DEBOUNCE_SEC=0)
+    assert all(v == ["gzip", True] for v in r["gzip"].values()), r["gzip"]
+    assert all(v == [None, True] for v in r["identity"].values()), r["identity"]
+    assert r["alias"] is None and r["stale"] is None
+    assert r["republished"] == ["gzip", True, 1]
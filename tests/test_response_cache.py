@@ -0,0 +1,48 @@
+#tests/test_response_cache.py
+# /hour 응답 캐시 + ETag: 같은 세대면 다시 계산하지 않고 304, 쓰기로 세대가 바뀌면 다시 계산
+
+def test_etag_304_and_generation_bump(worker, synth_seed):
+    seed = synth_seed(seasons=1, games_per_season=150)
+    r = worker("""
+        s = hb.SNAP
+        lg = [(d, g) for d in sorted(s.schedule) for g in s.schedule[d] if "LG" in (g["home"], g["away"])]
+        asof, today = lg[-1]
+        rival = today["away"] if today["home"] == "LG" else today["home"]
+        past = next(g for d, g in lg[:-1] if rival in (g["home"], g["away"]))
+        hb.FORCE_ASOF = asof
+        computed = []
+        compute = hb.compute_for_team
+        hb.compute_for_team = lambda team, asof=None: computed.append(team) or compute(team, asof)
+        c = hb.app.test_client()
+        def get(team, etag=None):
+            resp = c.get(f"/hour?myteam={team}", headers={"If-None-Match": etag} if etag else {})
+            return resp.status_code, resp.headers.get("ETag"), len(resp.data)
+
+        out = {"first": get("LG")}
+        etag = out["first"][1]
+        out["again"] = get("LG", etag)
+        out["other_team"] = get("KT", etag)[0]
+        out["computed"] = list(computed)
+
+        # 다른 팀 페이지에만 영향 없는 쓰기: 세대는 바뀌어 다시 계산하지만 본문이 같으니 ETag도 같다 → 304
+        gen0 = hb.DATA_GENERATION
+        hb.set_runtime_cache("20300101XXYY0_20300101", 180)
+        out["unrelated"] = get("LG", etag)[0]
+        # LG의 오늘 상대와의 지난 경기 런타임이 바뀌면 새 본문 + 새 ETag
+        key = hb.make_runtime_key(past["g_id"], past["g_dt"])
+        hb.set_runtime_cache(key, hb.SNAP.runtime[key]["runtime_min"] + 90)
+        out["changed"] = get("LG", etag)
+        out["changed_again"] = get("LG", out["changed"][1])[0]
+        out["gen"] = hb.DATA_GENERATION - gen0
+        out["computed_after"] = computed[len(out["computed"]):]
+        emit(out)
+    """, DATA_DIR=seed)
+    status, etag, size = r["first"]
+    assert status == 200 and etag and size > 0
+    assert r["again"] == [304, etag, 0]
+    assert r["other_team"] == 200
+    assert r["computed"] == ["LG", "KT"]   # 304은 캐시에서: 다시 계산/렌더링하지 않음
+    assert r["unrelated"] == 304
+    assert r["changed"][0] == 200 and r["changed"][1] != etag
+    assert r["changed_again"] == 304
+    assert r["gen"] == 2 and r["computed_after"] == ["LG", "LG"]
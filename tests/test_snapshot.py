@@ -0,0 +1,71 @@
+#tests/test_snapshot.py
+# 불변 스냅샷: 읽는 쪽은 잠금 없이 SNAP을 한 번 잡고, 쓰기는 새 스냅샷으로 교체만 한다
+
+def test_readers_never_see_a_half_applied_batch(worker):
+    # 쓰기 스레드가 같은 키 묶음을 라운드마다 한 값으로 바꾸는 동안(묶음 1개 = 스냅샷 교체 1번)
+    # 읽기 스레드가 잡은 스냅샷은 항상 한 라운드의 값만 갖고, 들고 있는 동안 바뀌지 않는다
+    r = worker("""
+        import threading, time
+        keys = sorted(hb.SNAP.runtime)[:40]
+        def write_round(v):
+            with hb.batched_writes(len(keys)):
+                for k in keys:
+                    hb.set_runtime_cache(k, v)
+        write_round(150)
+
+        errors, reads, stop = [], [0], threading.Event()
+        def reader():
+            while not stop.is_set():
+                s = hb.SNAP
+                seen = {s.runtime[k]["runtime_min"] for k in keys}
+                series_ok = all(len(sr.prefix) == len(sr.runtimes) + 1 and sr.prefix[-1] == sum(sr.runtimes)
+                                for m in s.idx.values() for sr in m.values())
+                time.sleep(0)
+                again = {s.runtime[k]["runtime_min"] for k in keys}
+                if len(seen) != 1 or seen != again or not series_ok:
+                    errors.append([sorted(seen), sorted(again), series_ok])
+                reads[0] += 1
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for i in range(1, 80):
+            write_round(150 + i)
+        stop.set()
+        for t in threads:
+            t.join()
+        hb.PERSIST.join()
+        emit({"errors": errors[:3], "reads": reads[0], "final": hb.SNAP.runtime[keys[0]]["runtime_min"]})
+    """, JOURNAL_COMPACT_EVERY=500)
+    assert r["errors"] == []
+    assert r["reads"] > 0
+    assert r["final"] == 229
+
+def test_old_snapshot_is_unchanged_by_later_writes(worker):
+    r = worker("""
+        s0 = hb.SNAP
+        key = sorted(s0.runtime)[0]
+        before = (dict(s0.runtime), len(s0.schedule), list(s0.dates), s0.stats.get("league").count)
+        hb.set_runtime_cache(key, 999)
+        hb.set_schedule_cache_for_date("20300101", [{"home": "LG", "away": "KT", "g_id": "20300101KTLG0",
+                                                     "g_dt": "20300101"}])
+        hb.set_runtime_cache("20300101KTLG0_20300101", 200)
+        after = (dict(s0.runtime), len(s0.schedule), list(s0.dates), s0.stats.get("league").count)
+        emit({"same": before == after, "new": hb.SNAP.runtime[key]["runtime_min"],
+              "new_date": "20300101" in hb.SNAP.schedule, "old_date": "20300101" in s0.schedule})
+    """)
+    assert r == {"same": True, "new": 999, "new_date": True, "old_date": False}
+
+def test_write_copies_only_the_touched_bucket(worker):
+    # 쓰기 1건은 바뀐 키의 묶음만 새로 만들고 나머지 묶음은 이전 스냅샷과 공유한다
+    r = worker("""
+        s0 = hb.SNAP
+        key = sorted(s0.runtime)[0]
+        hb.set_runtime_cache(key, s0.runtime[key]["runtime_min"] + 1)
+        s1 = hb.SNAP
+        fresh = {name: sum(a is not b for a, b in zip(getattr(s0, name)._b, getattr(s1, name)._b))
+                 for name in ("runtime", "schedule", "games", "idx_rt")}
+        emit({"fresh": fresh, "len": [len(s0.runtime), len(s1.runtime)],
+              "values": [s0.runtime[key]["runtime_min"] + 1 == s1.runtime[key]["runtime_min"]]})
+    """)
+    assert r["fresh"] == {"runtime": 1, "schedule": 0, "games": 0, "idx_rt": 1}
+    assert r["len"][0] == r["len"][1] and r["values"] == [True]
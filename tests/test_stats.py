@@ -0,0 +1,46 @@
+#tests/test_stats.py
+# 누적 통계: 히스토그램 분위수/평균/표준편차가 statistics로 전부 다시 계산한 값과 같다(추가·삭제 모두)
+import random, statistics
+import pytest
+from hour_stats import RunningStats
+
+def _check(st, xs):
+    assert st.count == len(xs)
+    cuts = statistics.quantiles(xs, n=10, method="inclusive")   # 0.1 ~ 0.9, numpy 기본(선형 보간)과 같은 정의
+    for i, q in enumerate(cuts, start=1):
+        assert st.quantile(i / 10) == pytest.approx(q)
+    assert st.quantile(0) == min(xs) and st.quantile(1) == max(xs)
+    assert st.mean() == pytest.approx(statistics.mean(xs))
+    assert st.std() == pytest.approx(statistics.stdev(xs))
+
+def test_histogram_quantiles_match_statistics():
+    rng = random.Random(3)
+    xs = [round(rng.gauss(183, 18)) for _ in range(2001)]
+    st = RunningStats()
+    for x in xs:
+        st.add(x, 1.0)
+    _check(st, xs)
+    for x in xs[:700]:   # 빼도 다시 계산한 것과 같다
+        st.add(x, 1.0, -1)
+    _check(st, xs[700:])
+    assert RunningStats().quantile(0.3) is None
+
+def test_league_thresholds_match_statistics(worker, synth_seed):
+    seed = synth_seed(seasons=2, games_per_season=240)
+    r = worker("""
+        hb.ensure_partitions()
+        s = hb.SNAP
+        xs = [s.runtime[k]["runtime_min"] for d in s.schedule for g in s.schedule[d]
+              if (k := hb.make_runtime_key(g["g_id"], g["g_dt"])) in s.runtime]
+        lg = hb.TEAM_ID["LG"]
+        lg_xs = [s.runtime[k]["runtime_min"] for d in s.schedule for g in s.schedule[d]
+                 if "LG" in (g["home"], g["away"]) and (k := hb.make_runtime_key(g["g_id"], g["g_dt"])) in s.runtime]
+        emit({"xs": xs, "lg_xs": lg_xs, "th": hb._thresholds(),
+              "lg": [s.stats.get("team", lg).quantile(p) for p in (0.3, 0.7)]})
+    """, DATA_DIR=seed, START_DATE="2024-03-01", LIVE_THRESHOLDS_MIN_GAMES=100)
+    cuts = statistics.quantiles(r["xs"], n=10, method="inclusive")
+    assert r["th"]["source"] == "live" and r["th"]["games"] == len(r["xs"]) == 480
+    assert r["th"]["top30"] == round(cuts[2], 1) and r["th"]["bottom70"] == round(cuts[6], 1)
+    assert r["th"]["avg_ref"] == round(statistics.mean(r["xs"]), 1)
+    lg_cuts = statistics.quantiles(r["lg_xs"], n=10, method="inclusive")
+    assert r["lg"] == pytest.approx([lg_cuts[2], lg_cuts[6]])